@@ -0,0 +1,194 @@
+import numpy as np # 그룹별 합계/개수 계산을 위한 numpy 라이브러리 임포트
+import pandas as pd # 집계 결과 표 생성을 위한 pandas 라이브러리 임포트
+
+# 설정
+BINCOUNT_FUNCS = {"size", "count", "sum", "mean"} # np.bincount 한 번으로 계산하는 집계 함수
+GROUPBY_FUNCS = {"min", "max", "median"} # 그룹 키별 groupby 한 번에 모아서 계산하는 집계 함수
+MERGEABLE_FUNCS = {"size", "count", "sum", "mean", "min", "max"} # 조각별 결과를 합쳐 계산할 수 있는 집계 함수 (PartialAggregate)
+
+
+class Aggregation:
+    """
+    보고서가 필요로 하는 집계 하나의 선언 (그룹 기준과 출력 열 이름별 (대상 열, 집계 함수)).
+
+    pandas의 named aggregation과 같은 형식으로 선언하며, 실제 계산은 aggregate()가
+    같은 그룹 기준을 쓰는 모든 선언을 모아 한 번에 수행한다.
+
+    예:
+        Aggregation('Publisher', **{'Book Count': ('Publisher', 'size'), 'Price': ('Price', 'mean')})
+
+    Args:
+        by (str): 그룹 기준 열 이름 (None이면 전체를 하나의 그룹으로 집계).
+        **metrics: 출력 열 이름 -> (대상 열, 집계 함수). 집계 함수는 size, count, sum, mean, min, max, median.
+    """
+
+    def __init__(self, by=None, **metrics):
+        for name, (column, func) in metrics.items():
+            if func not in BINCOUNT_FUNCS | GROUPBY_FUNCS:
+                raise ValueError(f"지원하지 않는 집계 함수입니다: {name}={func}")
+        self.by = by
+        self.metrics = metrics
+
+    def __repr__(self):
+        return f"Aggregation({self.by!r}, {self.metrics!r})"
+
+
+def _group_codes(key, sort=True):
+    """그룹 키를 정수 코드와 그룹 값 목록으로 변환하는 함수 (결측 키의 코드는 -1)"""
+    codes, uniques = pd.factorize(key, sort=sort)
+    return codes, pd.Index(uniques, name=key.name)
+
+
+def _bincount_metric(codes, groups, values, func):
+    """np.bincount로 그룹별 size/count/sum/mean을 계산하는 함수"""
+    valid = codes >= 0
+    if func == "size":
+        return np.bincount(codes[valid], minlength=groups)
+    if values.dtype.kind in "biuf":
+        numbers = values.to_numpy(dtype="float64", na_value=np.nan)
+        valid &= ~np.isnan(numbers)
+    else:
+        numbers = None
+        valid &= values.notna().to_numpy()
+    count = np.bincount(codes[valid], minlength=groups)
+    if func == "count":
+        return count
+    total = np.bincount(codes[valid], weights=numbers[valid], minlength=groups)
+    if func == "sum":
+        return total
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def aggregate(df, aggregations, derived=None):
+    """
+    여러 집계 선언을 그룹 기준별로 묶어 최소한의 연산으로 계산하는 함수.
+
+    그룹 기준마다 키를 한 번만 factorize하고, 같은 (대상 열, 집계 함수)는 여러 선언에서 요청해도 한 번만 계산한다.
+    size/count/sum/mean은 np.bincount로, min/max/median은 그룹 기준별 groupby 한 번으로 계산한다.
+    입력 DataFrame은 변경하지 않는다.
+
+    Args:
+        df (pd.DataFrame): 집계할 데이터.
+        aggregations (dict): 결과 이름 -> Aggregation.
+        derived (dict): df에 없는 파생 그룹 기준 이름 -> df를 받아 키 Series를 반환하는 함수 (예: 가격대).
+            반환한 Series의 인덱스가 df의 인덱스와 다르면 행 인덱스 -> 그룹 값의 다대다 연결 표로 보고,
+            한 행을 연결된 그룹마다 집계한다 (예: 공저 도서를 저자마다 집계).
+
+    Returns:
+        dict: 결과 이름 -> 그룹 값을 인덱스로 하는 DataFrame (그룹 값 오름차순, 결측 키 제외).
+    """
+    derived = derived or {}
+    by_key = {}
+    for name, spec in aggregations.items():
+        by_key.setdefault(spec.by, []).append(name)
+
+    results = {}
+    for by, names in by_key.items():
+        needed = {metric for name in names for metric in aggregations[name].metrics.values()}
+        frame = df
+        if by is None:
+            codes, index = np.zeros(len(df), dtype=np.intp), pd.RangeIndex(1)
+        else:
+            key = derived[by](df) if by in derived else df[by]
+            if not key.index.equals(df.index): # 다대다 연결 표: 연결된 행을 그룹 값마다 가져와 집계
+                frame = df[sorted({column for column, _ in needed})].iloc[df.index.get_indexer(key.index)]
+                key = key.reset_index(drop=True)
+            codes, index = _group_codes(key.rename(by))
+
+        computed = {}
+        for column, func in needed:
+            if func in BINCOUNT_FUNCS:
+                computed[column, func] = _bincount_metric(codes, len(index), frame[column], func)
+        slow = sorted(metric for metric in needed if metric[1] in GROUPBY_FUNCS)
+        if slow:
+            columns = sorted({column for column, _ in slow})
+            grouped = frame[columns].groupby(codes).agg({column: sorted({f for c, f in slow if c == column}) for column in columns})
+            grouped = grouped[grouped.index >= 0].reindex(range(len(index))) # 결측 키(-1) 제외, 모든 그룹 포함
+            for column, func in slow:
+                computed[column, func] = grouped[column, func].to_numpy()
+
+        for name in names:
+            metrics = aggregations[name].metrics
+            results[name] = pd.DataFrame({out: computed[metric] for out, metric in metrics.items()}, index=index)
+    return results
+
+
+def _components(func):
+    """조각별로 유지해야 하는 부분 집계 함수 목록 (평균은 합계와 개수로 나누어 유지)"""
+    return ("sum", "count") if func == "mean" else (func,)
+
+
+def _combine(left, right):
+    """같은 형식의 부분 집계 표 두 개를 그룹 값 기준으로 합치는 함수"""
+    index = left.index.union(right.index)
+    left, right = left.reindex(index), right.reindex(index)
+    combined = {}
+    for column in left.columns:
+        func = column.rsplit("|", 1)[1]
+        if func == "min":
+            combined[column] = np.fmin(left[column], right[column])
+        elif func == "max":
+            combined[column] = np.fmax(left[column], right[column])
+        else:
+            combined[column] = left[column].fillna(0) + right[column].fillna(0)
+    return pd.DataFrame(combined, index=index)
+
+
+class PartialAggregate:
+    """
+    데이터를 조각(chunk)으로 나누어 읽을 때 집계 선언을 조각마다 계산하고 합쳐 나가는 집계기.
+
+    평균은 합계와 개수로, 나머지는 같은 함수의 부분 결과로 유지하므로 메모리 사용량은 그룹 수에만 비례한다.
+    중앙값처럼 부분 결과를 합칠 수 없는 집계 함수는 사용할 수 없다.
+
+    Args:
+        aggregations (dict): 결과 이름 -> Aggregation (집계 함수는 MERGEABLE_FUNCS 중 하나).
+        derived (dict): 파생 그룹 기준 (aggregate() 참고).
+
+    Raises:
+        ValueError: 조각별로 나누어 계산할 수 없는 집계 함수가 포함된 경우.
+    """
+
+    def __init__(self, aggregations, derived=None):
+        self.aggregations = aggregations
+        self.derived = derived
+        self._parts = {}
+        for name, spec in aggregations.items():
+            metrics = {}
+            for out, (column, func) in spec.metrics.items():
+                if func not in MERGEABLE_FUNCS:
+                    raise ValueError(f"조각별로 나누어 계산할 수 없는 집계 함수입니다: {name}.{out}={func}")
+                metrics.update({f"{column}|{part}": (column, part) for part in _components(func)})
+            self._parts[name] = Aggregation(spec.by, **metrics)
+        self.tables = {}
+
+    def update(self, df):
+        """데이터 조각 하나의 부분 집계를 계산하여 누적 결과에 합치는 함수"""
+        for name, table in aggregate(df, self._parts, self.derived).items():
+            if isinstance(table.index, pd.CategoricalIndex): # 조각마다 범주 목록이 다르므로 값 기준으로 합치도록 변환
+                table.index = table.index.astype(object)
+            self.tables[name] = _combine(self.tables[name], table) if name in self.tables else table
+        return self
+
+    def result(self):
+        """
+        누적된 부분 집계로 최종 결과를 계산하는 함수.
+
+        Returns:
+            dict: 결과 이름 -> aggregate()와 같은 형식의 DataFrame.
+        """
+        results = {}
+        for name, spec in self.aggregations.items():
+            table = self.tables.get(name, pd.DataFrame(columns=list(self._parts[name].metrics)))
+            columns = {}
+            for out, (column, func) in spec.metrics.items():
+                if func == "mean":
+                    count = table[f"{column}|count"]
+                    columns[out] = (table[f"{column}|sum"] / count).where(count > 0)
+                elif func in ("size", "count"):
+                    columns[out] = table[f"{column}|{func}"].fillna(0).astype("int64")
+                else:
+                    columns[out] = table[f"{column}|{func}"]
+            results[name] = pd.DataFrame(columns, index=table.index)
+        return results
@@ -0,0 +1,98 @@
+import argparse # 명령행 인자 처리를 위한 argparse 라이브러리 임포트
+import re # 기존 행 단위 전처리 재현을 위한 re 라이브러리 임포트
+import time # 처리 시간 측정을 위한 time 라이브러리 임포트
+import numpy as np # 합성 데이터 생성을 위한 numpy 라이브러리 임포트
+import pandas as pd # 데이터 처리를 위한 pandas 라이브러리 임포트
+from loguru import logger # 로그 기록을 위한 loguru 라이브러리 임포트
+from preprocess import preprocess, rating_range # 벡터화 전처리 함수 임포트
+
+# 설정
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000] # 기본 측정 행 수
+LEGACY_MAX_ROWS = 1_000_000 # 기존 행 단위 방식은 이 행 수까지만 측정 (그 이상은 시간이 너무 오래 걸림)
+
+
+def make_frame(rows, seed=0):
+    """
+    수집 결과와 같은 형식(문자열 값)의 합성 도서 데이터를 만드는 함수.
+
+    Args:
+        rows (int): 생성할 행 수.
+        seed (int): 난수 시드.
+
+    Returns:
+        pd.DataFrame: 'Price', 'Review Count', 'Rating', 'Publish Date' 열을 가진 DataFrame.
+    """
+    rng = np.random.default_rng(seed)
+    price = rng.integers(5, 60, rows) * 1000
+    reviews = rng.integers(0, 5000, rows)
+    return pd.DataFrame({
+        "Price": pd.Series(price).map("{:,}".format), # 쉼표가 들어간 가격 문자열
+        "Review Count": reviews.astype(str),
+        "Rating": np.round(rng.uniform(0, 10, rows), 1).astype(str),
+        "Publish Date": [f"{y}년 {m:02d}월" for y, m in zip(rng.integers(1990, 2026, rows), rng.integers(1, 13, rows))],
+    })
+
+
+def legacy_preprocess(df):
+    """기존 generate_eda_v3.py의 행 단위 전처리(apply + 정규식)를 그대로 재현한 함수 (비교 기준)"""
+    df = df.copy()
+
+    def clean_currency(x):
+        if isinstance(x, str):
+            return float(re.sub(r'[^\d.]', '', x))
+        return float(x)
+
+    def parse_date(x):
+        match = re.search(r'(\d{4})년\s*(\d{1,2})월', str(x))
+        if match:
+            return int(match.group(1)), int(match.group(2))
+        return None, None
+
+    df['Price'] = df['Price'].apply(clean_currency)
+    df['Review Count'] = df['Review Count'].apply(clean_currency)
+    df['Rating'] = pd.to_numeric(df['Rating'], errors='coerce')
+    df['Year'], df['Month'] = zip(*df['Publish Date'].apply(parse_date))
+    df['Year'] = df['Year'].fillna(0).astype(int)
+    df['Month'] = df['Month'].fillna(0).astype(int)
+    df['Rating Range'] = df['Rating'].apply(lambda x: int(x) if pd.notnull(x) else 0)
+    return df
+
+
+def vectorized_preprocess(df):
+    """preprocess 모듈의 벡터화 전처리 (비교 대상)"""
+    df = preprocess(df)
+    df['Rating Range'] = rating_range(df['Rating'])
+    return df
+
+
+def measure(fn, df):
+    """함수 실행 시간(초)과 결과를 반환하는 함수"""
+    start = time.perf_counter()
+    result = fn(df)
+    return time.perf_counter() - start, result
+
+
+def main():
+    """행 수별로 기존 방식과 벡터화 방식의 전처리 시간을 측정하고 결과가 같은지 확인하는 메인 함수"""
+    parser = argparse.ArgumentParser(description="EDA 전처리(행 단위 vs 벡터화) 성능 측정")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="측정할 행 수 목록")
+    args = parser.parse_args()
+
+    results = []
+    for rows in args.rows:
+        df = make_frame(rows)
+        fast, expected = measure(vectorized_preprocess, df)
+        row = {"rows": rows, "vectorized_s": round(fast, 3), "legacy_s": None, "speedup": None}
+        if rows <= LEGACY_MAX_ROWS:
+            slow, legacy = measure(legacy_preprocess, df)
+            columns = ["Price", "Review Count", "Rating", "Year", "Month", "Rating Range"]
+            pd.testing.assert_frame_equal(expected[columns], legacy[columns], check_dtype=False)
+            row.update(legacy_s=round(slow, 3), speedup=round(slow / fast, 1))
+        logger.info(f"{rows:,}행: 벡터화 {row['vectorized_s']}초, 기존 {row['legacy_s']}초")
+        results.append(row)
+
+    print(pd.DataFrame(results).to_markdown(index=False))
+
+
+if __name__ == "__main__":
+    main()
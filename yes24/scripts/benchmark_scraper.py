@@ -0,0 +1,238 @@
+import argparse # 명령행 인자 처리를 위한 argparse 라이브러리 임포트
+import json # 측정 결과 저장 및 하위 프로세스 결과 전달을 위한 json 라이브러리 임포트
+import os # 파일 경로 조작을 위한 os 라이브러리 임포트
+import platform # 측정 환경 기록을 위한 platform 라이브러리 임포트
+import subprocess # 시나리오별 독립 프로세스 실행 및 버전 확인을 위한 subprocess 라이브러리 임포트
+import sys # 하위 프로세스 실행 및 종료 코드 반환을 위한 sys 라이브러리 임포트
+import tempfile # 시나리오별 임시 작업 폴더 생성을 위한 tempfile 라이브러리 임포트
+import time # 처리 시간 측정을 위한 time 라이브러리 임포트
+import pandas as pd # 결과 표 출력을 위한 pandas 라이브러리 임포트
+from loguru import logger # 로그 기록을 위한 loguru 라이브러리 임포트
+
+# 설정
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__)) # 수집 스크립트 폴더 (하위 프로세스의 모듈 검색 경로)
+FIXTURE_FILE = os.path.join(SCRIPTS_DIR, "..", "data", "fixtures", "category_page.html") # 합성 페이지 원본 HTML
+DETAIL_FIXTURE_FILE = os.path.join(SCRIPTS_DIR, "..", "data", "fixtures", "detail_page.html") # 상세 페이지 원본 HTML
+REPORT_DIR = "yes24/reports/benchmarks" # 측정 결과 JSON을 저장할 폴더
+PARSE_SIZES = [120, 1200] # 파싱 성능을 측정할 페이지당 도서 수 (기본 페이지 크기와 대형 합성 페이지)
+PAGES = 20 # get_page_data/main 시나리오에서 요청할 페이지 수
+MIN_SECONDS = 1.0 # 파싱 측정의 최소 반복 시간(초)
+RATE = 100.0 # main 시나리오의 초당 요청 수 (로컬 서버이므로 수집 정책의 속도 제한 대신 사용)
+ERROR_RATE = 0.05 # 429/503 응답 주입 확률
+SLOW_RATE = 0.05 # 느린 응답 주입 확률
+SLOW_SECONDS = 0.2 # 느린 응답의 추가 지연 시간(초)
+TOLERANCE = 0.10 # 기준 결과 대비 이 비율 이상 나빠지면 성능 저하로 판단
+METRICS = { # 비교할 지표 -> 값이 클수록 좋은지 여부
+    "pages_per_s": True,
+    "items_per_s": True,
+    "parse_ms_per_page": False,
+    "peak_rss_mb": False,
+}
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 메모리 사용량(MB)을 반환하는 함수 (resource 모듈이 없는 Windows에서는 None)"""
+    try:
+        import resource # 유닉스 계열에서만 제공
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1) # macOS는 바이트, 리눅스는 KB 단위
+
+
+def start_server(config, page_size=None):
+    """설정에 맞는 재생 서버를 시작하는 함수"""
+    from replay_server import ReplayServer
+
+    return ReplayServer(config.get("recordings"), FIXTURE_FILE, total_pages=config["pages"], page_size=page_size,
+                        error_rate=config["error_rate"], slow_rate=config["slow_rate"], slow_seconds=config["slow_seconds"],
+                        retry_after=0, seed=config["seed"], detail_fixture=DETAIL_FIXTURE_FILE).start()
+
+
+def bench_parse(config, size):
+    """합성 페이지 하나를 반복 파싱하여 페이지당 파싱 시간을 측정하는 시나리오 (scraper.parse_html)"""
+    import scraper
+    from replay_server import load_items, synthetic_page
+
+    html = synthetic_page(load_items(FIXTURE_FILE), 1, size)
+    items = len(scraper.parse_html(html)) # 첫 호출은 백엔드 선택과 임포트 비용이 포함되므로 제외
+    runs, start = 0, time.perf_counter()
+    while runs < 3 or time.perf_counter() - start < config["min_seconds"]:
+        scraper.parse_html(html)
+        runs += 1
+    elapsed = time.perf_counter() - start
+    return {"pages": runs, "items": items * runs, "seconds": elapsed, "pages_per_s": runs / elapsed,
+            "items_per_s": items * runs / elapsed, "parse_ms_per_page": elapsed / runs * 1000, "retries": 0}
+
+
+def bench_get_page_data(config, size):
+    """재생 서버에서 페이지를 차례로 가져와 파싱하는 시나리오 (scraper.get_page_data + parse_html)"""
+    import scraper
+
+    scraper.response_cache = None # 조건부 요청 없이 매번 본문을 받음
+    with start_server(config, size) as server:
+        scraper.BASE_URL = server.url
+        items, parse_seconds, start = 0, 0.0, time.perf_counter()
+        for page in range(1, config["pages"] + 1):
+            html = scraper.get_page_data(page)
+            parse_start = time.perf_counter()
+            items += len(scraper.parse_html(html)) if html else 0
+            parse_seconds += time.perf_counter() - parse_start
+        elapsed = time.perf_counter() - start
+        stats = dict(server.stats)
+    pages = config["pages"]
+    return {"pages": pages, "items": items, "seconds": elapsed, "pages_per_s": pages / elapsed, "items_per_s": items / elapsed,
+            "parse_ms_per_page": parse_seconds / pages * 1000, "retries": scraper.client.retries, "server": stats}
+
+
+def bench_main(config, size):
+    """작업 명세 두 개(카테고리 2개)를 재생 서버에서 끝까지 수집하는 시나리오 (scraper.main)"""
+    import scraper
+    from dataset import read_books
+    from metrics import METRICS
+
+    manifest = os.path.abspath("crawl_manifest.json")
+    with open(manifest, "w", encoding="utf-8") as f:
+        json.dump([{"dispNo": disp_no, "pageEnd": config["pages"] // 2, "priority": i} for i, disp_no in enumerate(["001001003032", "001001003022"])], f)
+    scraper.RATE_LIMIT = config["rate"]
+    scraper.RATE_BURST = max(1, config["rate"] / 10)
+    scraper.ADAPTIVE_THROTTLE = config.get("adaptive", False) # 자동 속도 조절 시 RATE를 상한으로 사용
+    scraper.THROTTLE_MAX_RATE = config["rate"]
+    with start_server(config, size) as server:
+        scraper.BASE_URL = server.url
+        start = time.perf_counter()
+        scraper.main(["--manifest", manifest, "--parse-workers", str(config.get("parse_workers", 0))])
+        elapsed = time.perf_counter() - start
+        stats = dict(server.stats)
+    pages = stats["ok"] + stats["not_modified"]
+    items = len(read_books(os.path.join(scraper.OUTPUT_DIR, scraper.DATASET_NAME), columns=["Goods No"]))
+    parse = next((summary for summary in METRICS.summary() if summary[0] == "parse"), ("parse", 0, 0.0, 0.0)) # 파싱 프로세스에서 측정한 시간 포함
+    return {"pages": pages, "items": items, "seconds": elapsed, "pages_per_s": pages / elapsed, "items_per_s": items / elapsed,
+            "parse_ms_per_page": parse[3], "retries": scraper.client.retries, "server": stats}
+
+
+SCENARIOS = {
+    "parse": bench_parse,
+    "get_page_data": bench_get_page_data,
+    "main": bench_main,
+}
+
+
+def run_scenario(name, size, config):
+    """
+    시나리오 하나를 별도 프로세스와 임시 작업 폴더에서 실행하고 결과를 반환하는 함수.
+
+    시나리오마다 새 프로세스를 쓰므로 최대 메모리 사용량(peak_rss_mb)이 다른 시나리오의 영향을 받지 않고,
+    스크래퍼의 출력/캐시/로그 파일은 임시 폴더에만 기록된다.
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SCRIPTS_DIR, os.environ.get("PYTHONPATH")])))
+        command = [sys.executable, os.path.abspath(__file__), "--child", name, str(size), json.dumps(config)]
+        result = subprocess.run(command, cwd=workdir, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{name}[{size}] 시나리오 실행 실패:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def child(name, size, config):
+    """하위 프로세스에서 시나리오를 실행하고 결과를 JSON 한 줄로 출력하는 함수"""
+    logger.remove() # 측정 중 화면 로그 출력 비용 제외
+    result = SCENARIOS[name](config, size)
+    result["peak_rss_mb"] = peak_rss_mb()
+    print(json.dumps({key: round(value, 3) if isinstance(value, float) else value for key, value in result.items()}))
+
+
+def code_version():
+    """측정한 코드의 버전 (git 커밋, 커밋되지 않은 변경이 있으면 -dirty)"""
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """
+    측정 결과를 기준 결과와 비교하는 함수.
+
+    Args:
+        results (dict): 시나리오 이름 -> 지표 딕셔너리.
+        baseline (dict): 이전에 저장한 결과 JSON의 'results'.
+        tolerance (float): 성능 저하로 판단할 변화 비율.
+
+    Returns:
+        tuple: (비교 표 DataFrame, 성능 저하 항목 목록).
+    """
+    rows, regressions = [], []
+    for scenario, metrics in results.items():
+        for metric, higher_is_better in METRICS.items():
+            old, new = (baseline.get(scenario) or {}).get(metric), metrics.get(metric)
+            if old is None or new is None or old == 0:
+                continue
+            change = (new - old) / old
+            regressed = -change > tolerance if higher_is_better else change > tolerance
+            rows.append({"scenario": scenario, "metric": metric, "baseline": old, "current": new, "change": f"{change:+.1%}", "regression": regressed})
+            if regressed:
+                regressions.append(f"{scenario}.{metric}")
+    return pd.DataFrame(rows), regressions
+
+
+def main():
+    """시나리오별 성능을 측정하여 JSON으로 저장하고, 기준 결과가 주어지면 성능 저하 여부를 확인하는 메인 함수"""
+    parser = argparse.ArgumentParser(description="스크래퍼 처리량 벤치마크 (로컬 재생 서버 사용)")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS), help="실행할 시나리오")
+    parser.add_argument("--parse-sizes", type=int, nargs="+", default=PARSE_SIZES, help="파싱 성능을 측정할 페이지당 도서 수")
+    parser.add_argument("--pages", type=int, default=PAGES, help="get_page_data/main 시나리오에서 요청할 페이지 수")
+    parser.add_argument("--error-rate", type=float, default=ERROR_RATE, help="429/503 응답 주입 확률")
+    parser.add_argument("--slow-rate", type=float, default=SLOW_RATE, help="느린 응답 주입 확률")
+    parser.add_argument("--parse-workers", type=int, default=0, help="main 시나리오의 HTML 파싱 프로세스 수 (0이면 메인 스레드에서 파싱)")
+    parser.add_argument("--adaptive", action="store_true", help="main 시나리오에서 자동 속도 조절 사용 (RATE를 상한으로 사용)")
+    parser.add_argument("--recordings", default=None, help="재생할 녹화 응답 폴더 (없으면 합성 페이지)")
+    parser.add_argument("--seed", type=int, default=0, help="오류/지연 주입 난수 시드")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: yes24/reports/benchmarks/scraper_<버전>.json)")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON (성능 저하가 있으면 종료 코드 1)")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="성능 저하로 판단할 변화 비율")
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS) # 하위 프로세스용 (시나리오, 페이지 크기, 설정 JSON)
+    args = parser.parse_args()
+
+    if args.child:
+        name, size, config = args.child
+        child(name, int(size), json.loads(config))
+        return
+
+    config = {"pages": args.pages, "error_rate": args.error_rate, "slow_rate": args.slow_rate, "slow_seconds": SLOW_SECONDS,
+              "rate": RATE, "min_seconds": MIN_SECONDS, "seed": args.seed, "parse_workers": args.parse_workers,
+              "adaptive": args.adaptive,
+              "recordings": os.path.abspath(args.recordings) if args.recordings else None}
+    runs = [(name, size) for name in args.scenarios for size in (args.parse_sizes if name == "parse" else [120])]
+    results = {}
+    for name, size in runs:
+        key = f"{name}[{size}]"
+        logger.info(f"{key} 측정 중...")
+        results[key] = run_scenario(name, size, config)
+        logger.info(f"{key}: {results[key]['pages_per_s']:.1f}페이지/초, {results[key]['items_per_s']:.0f}건/초, "
+                    f"파싱 {results[key]['parse_ms_per_page']:.2f}ms/페이지, 재시도 {results[key]['retries']}회, 최대 메모리 {results[key]['peak_rss_mb']}MB")
+
+    version = code_version()
+    report = {"version": version, "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "python": platform.python_version(),
+              "platform": platform.platform(), "config": config, "results": results}
+    output = args.output or os.path.join(REPORT_DIR, f"scraper_{version}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    columns = ["pages_per_s", "items_per_s", "parse_ms_per_page", "retries", "peak_rss_mb"]
+    print(pd.DataFrame(results).T[columns].to_markdown(floatfmt=".2f"))
+    logger.info(f"측정 결과 저장: {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        table, regressions = compare(results, baseline["results"], args.tolerance)
+        print(f"\n기준 결과: {args.baseline} ({baseline.get('version')})")
+        print(table.to_markdown(index=False, floatfmt=".2f") if len(table) else "비교할 지표가 없습니다.")
+        if regressions:
+            logger.error(f"성능 저하 ({args.tolerance:.0%} 초과): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import gzip # 응답 본문 압축 저장을 위한 gzip 라이브러리 임포트
+import hashlib # 캐시 키와 내용 해시 생성을 위한 hashlib 라이브러리 임포트
+import json # 메타데이터 및 레코드 직렬화를 위한 json 라이브러리 임포트
+import os # 캐시 파일 경로 조작을 위한 os 라이브러리 임포트
+import sqlite3 # 도서별 레코드 저장소를 위한 sqlite3 라이브러리 임포트
+import time # 저장 시각 기록을 위한 time 라이브러리 임포트
+
+
+def request_key(url, params):
+    """요청 URL과 매개변수로 캐시 키(sha1)를 만드는 함수 (매개변수 순서와 무관)"""
+    payload = json.dumps([url, sorted((str(k), str(v)) for k, v in (params or {}).items())], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def content_hash(record):
+    """도서 레코드의 내용 해시를 계산하는 함수 (필드 순서와 무관)"""
+    return hashlib.sha1(json.dumps(record, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    요청 매개변수를 키로 응답 본문과 검증 헤더(ETag, Last-Modified)를 보관하는 디스크 캐시.
+
+    다음 실행에서 조건부 요청(If-None-Match, If-Modified-Since)을 보내 서버가 304로 응답하면
+    본문을 다시 내려받지 않고, 해당 페이지에 있던 상품 번호 목록으로 이전 결과를 재사용할 수 있다.
+
+    Args:
+        cache_dir (str): 캐시 파일을 저장할 폴더 경로.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, key):
+        """캐시 키에 해당하는 (메타데이터, 본문) 파일 경로를 반환하는 함수"""
+        base = os.path.join(self.cache_dir, key)
+        return base + ".json", base + ".html.gz"
+
+    def meta(self, key):
+        """저장된 메타데이터를 반환하는 함수 (없으면 None)"""
+        meta_path, body_path = self._paths(key)
+        if not (os.path.exists(meta_path) and os.path.exists(body_path)):
+            return None
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def conditional_headers(self, key):
+        """저장된 검증 헤더로 조건부 요청 헤더를 만드는 함수"""
+        meta = self.meta(key) or {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load(self, key):
+        """저장된 응답 본문을 반환하는 함수"""
+        with gzip.open(self._paths(key)[1], "rt", encoding="utf-8") as f:
+            return f.read()
+
+    def store(self, key, body, headers):
+        """
+        응답 본문과 검증 헤더를 저장하는 함수.
+
+        Args:
+            key (str): 캐시 키.
+            body (str): 응답 본문.
+            headers (Mapping): 응답 헤더.
+        """
+        meta_path, body_path = self._paths(key)
+        with gzip.open(body_path + ".tmp", "wt", encoding="utf-8") as f:
+            f.write(body)
+        os.replace(body_path + ".tmp", body_path) # 쓰기 도중 중단되어도 이전 캐시가 깨지지 않도록 교체 방식으로 저장
+        meta = self.meta(key) or {}
+        meta.update({"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified"), "fetched_at": time.time()})
+        self._write_meta(meta_path, meta)
+
+    def set_goods(self, key, goods_nos):
+        """캐시된 페이지에 들어 있던 상품 번호 목록을 기록하는 함수 (304 응답 시 레코드 재사용에 사용)"""
+        meta_path = self._paths(key)[0]
+        meta = self.meta(key) or {}
+        meta["goods_nos"] = list(goods_nos)
+        self._write_meta(meta_path, meta)
+
+    def _write_meta(self, meta_path, meta):
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(meta_path + ".tmp", meta_path)
+
+
+class RecordStore:
+    """
+    상품 번호(goods_no)를 키로 도서 레코드와 내용 해시를 보관하는 SQLite 저장소.
+
+    수집한 레코드의 해시가 저장된 값과 같으면 쓰지 않으므로, 반복 실행 시 이 저장소의 쓰기 비용은
+    전체 카탈로그 크기가 아닌 새로 추가되거나 바뀐 도서 수에 비례한다.
+    (파티션 데이터셋은 이 저장소의 레코드로 수집한 파티션 전체를 다시 기록한다. sink.PartitionedWriter 참고)
+
+    Args:
+        path (str): SQLite 데이터베이스 파일 경로.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS books ("
+            "goods_no TEXT PRIMARY KEY, content_hash TEXT NOT NULL, record TEXT NOT NULL, "
+            "first_seen REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def upsert(self, records):
+        """
+        새로 추가되거나 내용이 바뀐 레코드만 저장하는 함수.
+
+        Args:
+            records (list): 'Goods No' 필드를 가진 도서 정보 딕셔너리 리스트.
+
+        Returns:
+            tuple: (새 도서 수, 변경된 도서 수, 변경 없는 도서 수).
+        """
+        goods_nos = [r["Goods No"] for r in records]
+        stored = self.hashes(goods_nos)
+        now = time.time()
+        new, changed = [], []
+        for record in records:
+            digest = content_hash(record)
+            old = stored.get(record["Goods No"])
+            if old == digest:
+                continue
+            (new if old is None else changed).append((record["Goods No"], digest, json.dumps(record, ensure_ascii=False), now, now))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO books VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(goods_no) DO UPDATE SET content_hash = excluded.content_hash, "
+                "record = excluded.record, updated_at = excluded.updated_at",
+                new + changed,
+            )
+        return len(new), len(changed), len(records) - len(new) - len(changed)
+
+    def hashes(self, goods_nos):
+        """상품 번호별 저장된 내용 해시를 반환하는 함수"""
+        result = {}
+        goods_nos = list(goods_nos)
+        for i in range(0, len(goods_nos), 500): # SQLite 매개변수 개수 제한을 넘지 않도록 나누어 조회
+            chunk = goods_nos[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT goods_no, content_hash FROM books WHERE goods_no IN ({','.join('?' * len(chunk))})", chunk
+            )
+            result.update(rows)
+        return result
+
+    def get(self, goods_nos):
+        """상품 번호 목록에 해당하는 레코드를 입력 순서대로 반환하는 함수 (저장되지 않은 번호는 제외)"""
+        found = {}
+        goods_nos = list(goods_nos)
+        for i in range(0, len(goods_nos), 500):
+            chunk = goods_nos[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT goods_no, record FROM books WHERE goods_no IN ({','.join('?' * len(chunk))})", chunk
+            )
+            found.update((goods_no, json.loads(record)) for goods_no, record in rows)
+        return [found[g] for g in goods_nos if g in found]
+
+    def close(self):
+        self.conn.close()
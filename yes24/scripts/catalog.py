@@ -0,0 +1,302 @@
+import argparse # 명령행 인자(load/query) 처리를 위한 argparse 라이브러리 임포트
+import json # 파티션별 파일 서명 직렬화를 위한 json 라이브러리 임포트
+import os # 파일 경로 조작을 위한 os 라이브러리 임포트
+import time # 적재/조회 시간 측정을 위한 time 라이브러리 임포트
+import pandas as pd # 조회 결과 표 생성을 위한 pandas 라이브러리 임포트
+from loguru import logger # 로그 기록을 위한 loguru 라이브러리 임포트
+from dataset import COLUMN_TYPES, BookBatch, books_path, dataset_files, partition_values # 도서 데이터 열 타입, 열 기반 버퍼, 데이터셋 파일 조회 함수 임포트
+from entities import AUTHOR_ROLE, split_authors # 저자 문자열 분리 함수 임포트 (저자별 집계용)
+
+# 설정
+CATALOG_DB = "yes24/data/processed/catalog.duckdb" # 수집 결과를 적재할 분석용 DuckDB 데이터베이스 경로
+PRICE_RANGE_WIDTH = 10000 # 가격대 구간 너비(원) (preprocess.price_range와 같은 값)
+
+# 데이터셋 열 이름 -> 데이터베이스 열 이름
+COLUMNS = {
+    "Goods No": "goods_no",
+    "Title": "title",
+    "Author": "author",
+    "Publisher": "publisher",
+    "Publish Date": "publish_date",
+    "Publish Month": "publish_month",
+    "Price": "price",
+    "Rating": "rating",
+    "Review Count": "review_count",
+    "Detail URL": "detail_url",
+    "List Price": "list_price",
+    "Discount Rate": "discount_rate",
+    "Sales Index": "sales_index",
+}
+
+SELECT_COLUMNS = ", ".join(f'"{name}"' for name in COLUMNS) # 조각 파일에서 데이터셋 열을 books 표의 열 순서로 읽는 SELECT 목록
+
+SQL_TYPES = { # dataset.COLUMN_TYPES의 타입 -> DuckDB 타입
+    "int64": "BIGINT",
+    "int32": "INTEGER",
+    "int8": "TINYINT",
+    "float32": "REAL",
+    "string": "VARCHAR",
+    "dictionary": "VARCHAR",
+    "date": "DATE",
+}
+
+# EDA의 그룹 기준 이름 -> SQL 식 (데이터셋 열 외에 preprocess/generate_eda_v3의 파생 기준과 같은 값)
+GROUP_KEYS = {
+    **{name: column for name, column in COLUMNS.items()},
+    "Year": "coalesce(year(publish_month), 0)",
+    "Month": "coalesce(month(publish_month), 0)",
+    "Price Range": f"floor(price / {PRICE_RANGE_WIDTH}) * {PRICE_RANGE_WIDTH}",
+    "Rating Range": "coalesce(trunc(rating), 0)::INTEGER",
+    "Author Name": "author_name", # 공저 도서는 저자마다 집계 (AUTHOR_NAMES로 authors 표의 이름 목록을 펼침)
+}
+
+SQL_FUNCS = { # 집계 함수 이름(aggregate.Aggregation) -> SQL 집계 식 형식
+    "size": "count(*)",
+    "count": "count({column})",
+    "sum": "sum({column})",
+    "mean": "avg({column})",
+    "min": "min({column})",
+    "max": "max({column})",
+    "median": "median({column})",
+}
+
+# 저자 문자열 -> 저자 이름 (공저 도서는 저자 수만큼의 행). 필터가 펼친 열로 밀려 들어가 중첩 루프가 되지 않도록 하위 질의로 펼침
+AUTHOR_NAMES = "(SELECT author, unnest(names) AS author_name FROM authors)"
+
+# 자주 쓰는 조회 (query 명령에 이름으로 지정)
+QUERIES = {
+    "top_publishers": "SELECT publisher, count(*) AS books, round(avg(price)) AS avg_price, round(avg(review_count), 1) AS avg_reviews "
+                      "FROM books WHERE publisher IS NOT NULL GROUP BY publisher ORDER BY books DESC LIMIT 20",
+    "price_bands": f"SELECT {GROUP_KEYS['Price Range']} AS price_band, count(*) AS books, round(avg(rating), 2) AS avg_rating, "
+                   "round(avg(review_count), 1) AS avg_reviews FROM books WHERE price IS NOT NULL GROUP BY price_band ORDER BY price_band",
+    "prolific_authors": "SELECT author_name, count(*) AS books, round(avg(rating), 2) AS avg_rating FROM books "
+                        f"JOIN {AUTHOR_NAMES} USING (author) "
+                        "GROUP BY author_name HAVING count(*) >= 5 ORDER BY books DESC, avg_rating DESC LIMIT 20",
+    "monthly": "SELECT publish_month, count(*) AS books, round(avg(price)) AS avg_price FROM books "
+               "WHERE publish_month IS NOT NULL GROUP BY publish_month ORDER BY publish_month",
+}
+
+
+class CatalogIndex:
+    """
+    수집 결과를 DuckDB에 적재하여 SQL로 조회하는 분석용 색인.
+
+    books 표는 데이터셋의 모든 행을 COLUMNS의 열 이름과 COLUMN_TYPES의 타입으로 보관하며(파티션 값 disp_no, sort_order 포함),
+    상품 번호, 출판사, 저자, 출판 연월에 색인을 둔다. 저자 문자열별로 분리한 저자 이름 목록은 authors 표에 한 번씩만 보관한다.
+
+    load()는 파티션(폴더)별 조각 파일의 이름/크기/수정 시각을 서명으로 기록하여, 서명이 바뀐 파티션만 지우고 다시 적재하고
+    사라진 파티션은 삭제한다. Parquet 조각 파일은 DuckDB가 직접 읽고, CSV/JSONL은 BookBatch로 타입을 변환하여 적재한다.
+
+    Args:
+        path (str): DuckDB 데이터베이스 파일 경로.
+        read_only (bool): 읽기 전용으로 열지 여부 (조회만 할 때, 여러 프로세스가 동시에 열 수 있음).
+    """
+
+    def __init__(self, path=CATALOG_DB, read_only=False):
+        import duckdb # 분석 색인은 duckdb가 설치된 경우에만 사용
+
+        if not read_only:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.conn = duckdb.connect(path, read_only=read_only)
+        if read_only:
+            return
+        columns = ", ".join(f"{column} {SQL_TYPES[COLUMN_TYPES[name]]}" for name, column in COLUMNS.items())
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS books ({columns}, disp_no VARCHAR, sort_order VARCHAR, source VARCHAR NOT NULL)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS authors (author VARCHAR PRIMARY KEY, names VARCHAR[] NOT NULL)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS sources (source VARCHAR PRIMARY KEY, signature VARCHAR NOT NULL, rows BIGINT NOT NULL, loaded_at TIMESTAMP NOT NULL)")
+        for column in ("goods_no", "publisher", "author", "publish_month"):
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS books_{column} ON books ({column})")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def _sources(path):
+        """데이터셋의 파티션(폴더)별 조각 파일 목록 (파일 하나면 그 파일 이름이 파티션)"""
+        if os.path.isfile(path):
+            return {os.path.basename(path): [path]}
+        sources = {}
+        for file in dataset_files(path):
+            sources.setdefault(os.path.relpath(os.path.dirname(file), path).replace(os.sep, "/"), []).append(file)
+        return sources
+
+    @staticmethod
+    def _signature(files):
+        """조각 파일의 이름, 크기, 수정 시각으로 만든 파티션 서명"""
+        return json.dumps([(os.path.basename(f), os.stat(f).st_size, os.stat(f).st_mtime_ns) for f in files])
+
+    def load(self, path=None):
+        """
+        데이터셋에서 바뀐 파티션만 다시 적재하는 함수 (증분 적재).
+
+        Args:
+            path (str): 데이터셋 폴더 또는 CSV 파일 경로 (None이면 dataset.books_path()).
+
+        Returns:
+            dict: 다시 적재한 파티션(loaded), 적재한 행(rows), 바뀌지 않은 파티션(unchanged), 삭제한 파티션(removed) 수.
+        """
+        path = path or books_path()
+        sources = self._sources(path)
+        known = dict(self.conn.execute("SELECT source, signature FROM sources").fetchall())
+        stats = {"loaded": 0, "rows": 0, "unchanged": 0, "removed": 0}
+        for source in sorted(set(known) - set(sources)):
+            self._delete(source)
+            stats["removed"] += 1
+        for source, files in sorted(sources.items()):
+            signature = self._signature(files)
+            if known.get(source) == signature:
+                stats["unchanged"] += 1
+                continue
+            self.conn.execute("BEGIN TRANSACTION")
+            try:
+                self._delete(source)
+                rows = self._insert(path, source, files)
+                self.conn.execute("INSERT INTO sources VALUES (?, ?, ?, now())", [source, signature, rows])
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            stats["loaded"] += 1
+            stats["rows"] += rows
+        if stats["loaded"]:
+            self._update_authors()
+        return stats
+
+    def _delete(self, source):
+        self.conn.execute("DELETE FROM books WHERE source = ?", [source])
+        self.conn.execute("DELETE FROM sources WHERE source = ?", [source])
+
+    def _insert(self, root, source, files):
+        """파티션 하나의 조각 파일을 books 표에 적재하고 적재한 행 수를 반환하는 함수"""
+        partitions = partition_values(root, files[0]) if os.path.isdir(root) else {}
+        extra = [partitions.get("disp_no"), partitions.get("order"), source]
+        before = self.conn.execute("SELECT count(*) FROM books").fetchone()[0]
+        if all(f.endswith(".parquet") for f in files): # DuckDB가 Parquet 파일을 직접 읽음 (열이 추가되기 전의 파일은 없는 열을 NULL로)
+            self.conn.execute(
+                f"INSERT INTO books SELECT {SELECT_COLUMNS}, ?, ?, ? FROM read_parquet(?, union_by_name = true, hive_partitioning = false)",
+                [*extra, files],
+            )
+        else:
+            for file in files:
+                batch = self._read_text(file) # noqa: F841 # DuckDB가 Arrow 테이블을 변수 이름으로 조회
+                self.conn.execute(f"INSERT INTO books SELECT {SELECT_COLUMNS}, ?, ?, ? FROM batch", extra)
+        return self.conn.execute("SELECT count(*) FROM books").fetchone()[0] - before
+
+    @staticmethod
+    def _read_text(file):
+        """CSV/JSONL 조각 파일(문자열 값)을 COLUMN_TYPES 타입의 Arrow 테이블로 읽는 함수"""
+        if file.endswith(".csv"):
+            frame = pd.read_csv(file, dtype=str, keep_default_na=False)
+        else:
+            frame = pd.read_json(file, lines=True, dtype=False)
+        records = frame.to_dict("records")
+        if "Goods No" not in frame.columns: # 상품 번호가 없는 기존 CSV는 상세 페이지 주소에서 추출
+            for record in records:
+                record["Goods No"] = str(record.get("Detail URL") or "").rstrip("/").rsplit("/", 1)[-1] or None
+        return BookBatch(records).to_table()
+
+    def _update_authors(self):
+        """새로 적재한 저자 문자열을 저자 이름 목록으로 분리하여 authors 표에 추가하는 함수"""
+        import pyarrow as pa
+
+        new = [row[0] for row in self.conn.execute(
+            "SELECT DISTINCT author FROM books WHERE author IS NOT NULL AND author NOT IN (SELECT author FROM authors)"
+        ).fetchall()]
+        if not new:
+            return
+        names = [[name for name, role in split_authors(author) if role == AUTHOR_ROLE] for author in new] # entities.author_table과 같은 기준
+        batch = pa.table({"author": new, "names": pa.array(names, pa.list_(pa.string()))}) # noqa: F841 # DuckDB가 Arrow 테이블을 변수 이름으로 조회
+        self.conn.execute("INSERT INTO authors SELECT author, names FROM batch")
+
+    def query(self, sql, params=None):
+        """
+        SQL을 실행하여 결과를 DataFrame으로 반환하는 함수.
+
+        Args:
+            sql (str): SQL 문 (books, authors, sources 표 사용).
+            params (list): SQL의 ? 자리에 넣을 값.
+
+        Returns:
+            pd.DataFrame: 조회 결과.
+        """
+        return self.conn.execute(sql, params or []).df()
+
+    def aggregate(self, aggregations):
+        """
+        aggregate.aggregate()와 같은 집계 선언을 SQL 집계로 계산하는 함수 (데이터를 DataFrame으로 읽지 않음).
+
+        그룹 기준과 대상 열은 데이터셋 열 이름 또는 GROUP_KEYS의 파생 기준(연도, 가격대, 평점 구간, 저자 이름) 이름을 사용한다.
+
+        Args:
+            aggregations (dict): 결과 이름 -> Aggregation.
+
+        Returns:
+            dict: 결과 이름 -> 그룹 값을 인덱스로 하는 DataFrame (그룹 값 오름차순, 결측 키 제외).
+        """
+        results = {}
+        for name, spec in aggregations.items():
+            metrics = []
+            for out, (column, func) in spec.metrics.items():
+                expression = SQL_FUNCS[func].format(column=GROUP_KEYS[column])
+                metrics.append(f'{expression} AS "{out}"')
+            source = "books"
+            if spec.by == "Author Name" or any(column == "Author Name" for column, _ in spec.metrics.values()):
+                source = f"books JOIN {AUTHOR_NAMES} USING (author)"
+            if spec.by is None:
+                frame = self.query(f"SELECT {', '.join(metrics)} FROM {source}")
+            else:
+                key = GROUP_KEYS[spec.by]
+                frame = self.query(
+                    f'SELECT {key} AS "{spec.by}", {", ".join(metrics)} FROM {source} WHERE {key} IS NOT NULL GROUP BY 1 ORDER BY 1'
+                ).set_index(spec.by)
+            for out, (_, func) in spec.metrics.items():
+                if func in ("size", "count"):
+                    frame[out] = frame[out].astype("int64")
+            results[name] = frame
+        return results
+
+    def summary(self):
+        """적재된 행, 파티션, 저자 문자열 수"""
+        books, sources = self.conn.execute("SELECT count(*), count(DISTINCT source) FROM books").fetchone()
+        return {"books": books, "sources": sources, "authors": self.conn.execute("SELECT count(*) FROM authors").fetchone()[0]}
+
+
+def main(argv=None):
+    """분석 색인을 적재하거나 SQL을 실행하는 명령행 함수"""
+    parser = argparse.ArgumentParser(description="YES24 도서 데이터 분석 색인 (DuckDB)")
+    parser.add_argument("--db", default=CATALOG_DB, help="분석 색인 데이터베이스 경로") # 데이터베이스 경로
+    commands = parser.add_subparsers(dest="command", required=True)
+    load = commands.add_parser("load", help="데이터셋에서 바뀐 파티션만 적재")
+    load.add_argument("--dataset", default=None, help="데이터셋 폴더 또는 CSV 파일 경로 (기본: 수집 데이터셋, 없으면 기존 CSV)") # 적재할 데이터
+    query = commands.add_parser("query", help="SQL 또는 이름이 지정된 조회 실행")
+    query.add_argument("sql", help=f"SQL 문 또는 조회 이름 ({', '.join(QUERIES)})") # 실행할 SQL
+    query.add_argument("--output", default=None, help="결과를 저장할 CSV 파일 경로 (없으면 화면에 출력)") # 결과 저장 경로
+    args = parser.parse_args(argv)
+
+    if args.command == "load":
+        with CatalogIndex(args.db) as catalog:
+            start = time.perf_counter()
+            stats = catalog.load(args.dataset)
+            logger.info(f"파티션 {stats['loaded']}개 적재({stats['rows']}행), 변경 없음 {stats['unchanged']}개, 삭제 {stats['removed']}개 "
+                        f"({time.perf_counter() - start:.2f}초): {catalog.summary()}")
+        return
+    with CatalogIndex(args.db, read_only=True) as catalog:
+        start = time.perf_counter()
+        frame = catalog.query(QUERIES.get(args.sql, args.sql))
+        elapsed = time.perf_counter() - start
+    if args.output:
+        frame.to_csv(args.output, index=False, encoding="utf-8-sig")
+    else:
+        print(frame.to_string(index=False))
+    logger.info(f"{len(frame)}행 ({elapsed * 1000:.0f}ms)")
+
+
+if __name__ == "__main__":
+    main()
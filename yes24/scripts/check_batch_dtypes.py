@@ -0,0 +1,66 @@
+import argparse # 명령행 인자 처리를 위한 argparse 라이브러리 임포트
+import os # 파일 경로 조작을 위한 os 라이브러리 임포트
+import sys # 종료 코드 반환을 위한 sys 라이브러리 임포트
+import tempfile # 실행별 임시 데이터셋 폴더 생성을 위한 tempfile 라이브러리 임포트
+from loguru import logger # 로그 기록을 위한 loguru 라이브러리 임포트
+from dataset import BookBatch, read_books # 열 기반 버퍼 및 데이터셋 읽기 함수 임포트
+from parsers import parse_listing # 픽스처 HTML 파싱 함수 임포트
+from sink import ParquetSink # Parquet 출력기 임포트
+
+# 설정
+FIXTURE_FILE = "yes24/data/fixtures/category_page_full.html" # 레코드를 만들 120개 항목 픽스처 HTML
+PARTITION = os.path.join("disp_no=001001003032", "order=SINDEX_ONLY") # 임시 데이터셋 안의 파티션 폴더
+ROWS_PER_FILE = 60 # 조각 파일마다 출판사/저자 사전이 달라지도록 작은 조각 파일로 기록
+COMMIT_ROWS = 30 # 조각 파일을 닫는 행 수
+PAGE_ROWS = 24 # 한 번에 기록하는 행 수 (페이지 하나)
+BLANK_FIELDS = ["Price", "Rating", "Review Count", "List Price", "Discount Rate", "Sales Index", "Publish Date", "Author"] # 결측값 행을 만들 때 비우는 필드
+
+
+def load_records(path):
+    """픽스처 HTML을 파싱하고, 숫자/출판일/저자가 비어 있는 행을 덧붙인 레코드 리스트를 반환하는 함수"""
+    with open(path, encoding="utf-8") as f:
+        records = parse_listing(f.read())
+    blank = dict(records[0], **{field: "" for field in BLANK_FIELDS}) # 결측값이 섞인 열의 타입도 비교
+    blank["Author"] = None
+    return records + [blank]
+
+
+def main():
+    """
+    BookBatch.to_frame()으로 변환한 DataFrame이 같은 레코드를 Parquet 조각 파일로 기록한 뒤
+    read_books()로 읽은 DataFrame과 열 타입과 값이 같은지 검사하는 메인 함수.
+    불일치가 하나라도 있으면 종료 코드 1을 반환함.
+    """
+    parser = argparse.ArgumentParser(description="BookBatch.to_frame()과 read_books()의 열 타입 일치 여부 검사")
+    parser.add_argument("--fixture", default=FIXTURE_FILE, help="레코드를 만들 카테고리 목록 HTML")
+    args = parser.parse_args()
+
+    records = load_records(args.fixture)
+    with tempfile.TemporaryDirectory() as root:
+        sink = ParquetSink(os.path.join(root, PARTITION), rows_per_file=ROWS_PER_FILE, commit_rows=COMMIT_ROWS)
+        for start in range(0, len(records), PAGE_ROWS):
+            sink.write(records[start:start + PAGE_ROWS])
+            sink.commit()
+        sink.close()
+        sink.cleanup()
+        logger.info(f"{len(records)}행을 조각 파일 {len(sink.parts)}개로 기록")
+        expected = read_books(root)
+    frame = BookBatch(records).to_frame()
+
+    failed = []
+    for column in frame.columns:
+        if frame[column].dtype != expected[column].dtype:
+            logger.error(f"'{column}' 타입 불일치: to_frame() {frame[column].dtype} != read_books() {expected[column].dtype}")
+            failed.append(column)
+        elif not frame[column].equals(expected[column]):
+            logger.error(f"'{column}' 값 불일치")
+            failed.append(column)
+    if failed:
+        logger.error(f"read_books()와 다른 열 {len(failed)}개: {failed}")
+        return 1
+    logger.info(f"{len(frame.columns)}개 열의 타입과 값이 read_books()와 일치 ({len(frame)}행)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import argparse # 명령행 인자 처리를 위한 argparse 라이브러리 임포트
+import glob # 픽스처 파일 목록 조회를 위한 glob 라이브러리 임포트
+import sys # 종료 코드 반환을 위한 sys 라이브러리 임포트
+import time # 백엔드별 파싱 시간 측정을 위한 time 라이브러리 임포트
+from loguru import logger # 로그 기록을 위한 loguru 라이브러리 임포트
+from parsers import available_backends, get_parser, parse_embedded # 파서 백엔드 조회 및 내장 JSON 추출 함수 임포트
+
+# 설정
+FIXTURE_GLOB = "yes24/data/fixtures/*.html" # 기본 비교 대상 HTML 픽스처 경로
+REFERENCE_BACKEND = "bs4" # 기준이 되는 백엔드 (기존 BeautifulSoup 구현과 동일한 결과)
+
+
+def check_file(path, backends):
+    """
+    하나의 HTML 파일을 모든 백엔드와 내장 JSON 추출 방식으로 파싱하여 기준 백엔드와 결과가 같은지 비교하는 함수.
+
+    Args:
+        path (str): 저장된 HTML 파일 경로.
+        backends (list): 비교할 백엔드 이름 목록.
+
+    Returns:
+        bool: 모든 백엔드의 결과가 기준 백엔드와 같으면 True.
+    """
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+
+    results = {}
+    for name in backends:
+        start = time.perf_counter()
+        results[name] = get_parser(name)(html)
+        logger.info(f"{path} [{name}] {len(results[name])}개 항목, {(time.perf_counter() - start) * 1000:.1f}ms")
+    start = time.perf_counter()
+    results["embedded"] = parse_embedded(html) # 내장 JSON 추출 방식도 DOM 결과와 같아야 함
+    logger.info(f"{path} [embedded] {len(results['embedded'])}개 항목, {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    ok = True
+    expected = results[REFERENCE_BACKEND]
+    for name, records in results.items():
+        if records == expected:
+            continue
+        ok = False
+        if len(records) != len(expected):
+            logger.error(f"{path} [{name}] 항목 수 불일치: {len(records)} != {len(expected)}")
+            continue
+        for i, (got, want) in enumerate(zip(records, expected)):
+            for key in want:
+                if got.get(key) != want[key]:
+                    logger.error(f"{path} [{name}] {i}번째 항목 '{key}' 불일치: {got.get(key)!r} != {want[key]!r}")
+    return ok
+
+
+def main():
+    """
+    저장된 HTML 픽스처에 대해 모든 파서 백엔드의 결과가 동일한지 검사하는 메인 함수.
+    불일치가 하나라도 있으면 종료 코드 1을 반환함.
+    """
+    parser = argparse.ArgumentParser(description="파서 백엔드 및 추출 방식 간 결과 일치 여부 검사")
+    parser.add_argument("paths", nargs="*", help="검사할 HTML 파일 (기본값: yes24/data/fixtures/*.html)")
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob(FIXTURE_GLOB))
+    backends = available_backends()
+    logger.info(f"비교 대상 백엔드: {backends}")
+    if REFERENCE_BACKEND not in backends:
+        logger.error(f"기준 백엔드 '{REFERENCE_BACKEND}'를 사용할 수 없습니다.")
+        return 1
+
+    failed = [path for path in paths if not check_file(path, backends)]
+    if failed:
+        logger.error(f"결과 불일치 파일 {len(failed)}개: {failed}")
+        return 1
+    logger.info(f"{len(paths)}개 파일에서 모든 백엔드 결과 일치")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import argparse # 명령행 인자 처리를 위한 argparse 라이브러리 임포트
+import difflib # 기준 리포트와의 차이 출력을 위한 difflib 라이브러리 임포트
+import os # 파일 경로 조작을 위한 os 라이브러리 임포트
+import re # 실행 시각처럼 매번 달라지는 줄을 제외하기 위한 re 라이브러리 임포트
+import shutil # 원본 CSV를 임시 작업 폴더로 복사하기 위한 shutil 라이브러리 임포트
+import subprocess # 리포트 스크립트를 별도 프로세스로 실행하기 위한 subprocess 라이브러리 임포트
+import sys # 하위 프로세스 실행 및 종료 코드 반환을 위한 sys 라이브러리 임포트
+import tempfile # 실행별 임시 작업 폴더 생성을 위한 tempfile 라이브러리 임포트
+from loguru import logger # 로그 기록을 위한 loguru 라이브러리 임포트
+
+# 설정
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__)) # 리포트 스크립트 폴더
+SOURCE_CSV = "yes24/data/raw/yes24_books.csv" # 기준 리포트를 만든 원본 CSV (임시 작업 폴더의 같은 경로로 복사)
+EXPECTED_DIR = "yes24/data/fixtures/reports" # 기존 리포트 스크립트가 SOURCE_CSV로 만든 기준 리포트 폴더
+REPORTS = { # 리포트 스크립트 -> 스크립트가 작성하는 리포트 경로 (기준 리포트는 EXPECTED_DIR 안의 같은 파일 이름)
+    "generate_eda_report.py": "yes24/agent_eda.md",
+    "generate_eda_report_v2.py": "yes24/agent_eda2.md",
+}
+IGNORE_LINE = re.compile(r"^\*\*생성 일자:\*\*") # 실행 시각이 기록되어 비교에서 제외할 줄
+
+
+def read_report(path):
+    """리포트 파일을 읽어 비교에서 제외할 줄을 뺀 줄 목록을 반환하는 함수"""
+    with open(path, encoding="utf-8") as f:
+        return [line for line in f.read().splitlines() if not IGNORE_LINE.match(line)]
+
+
+def check_report(script, report):
+    """
+    리포트 스크립트를 임시 작업 폴더에서 SOURCE_CSV로 실행하고, 작성된 리포트가 기준 리포트와 같은지 비교하는 함수.
+
+    Args:
+        script (str): 리포트 스크립트 파일 이름.
+        report (str): 스크립트가 작성하는 리포트의 상대 경로.
+
+    Returns:
+        bool: 리포트가 기준 리포트와 같으면 True.
+    """
+    expected = read_report(os.path.join(EXPECTED_DIR, os.path.basename(report)))
+    with tempfile.TemporaryDirectory() as workdir:
+        os.makedirs(os.path.join(workdir, os.path.dirname(SOURCE_CSV)))
+        shutil.copy(SOURCE_CSV, os.path.join(workdir, SOURCE_CSV)) # 데이터셋 폴더가 없으므로 스크립트는 CSV를 읽음
+        result = subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, script)], cwd=workdir, capture_output=True, text=True)
+        if result.returncode != 0 or not os.path.exists(os.path.join(workdir, report)):
+            logger.error(f"[{script}] 리포트 생성 실패:\n{result.stderr[-2000:]}")
+            return False
+        actual = read_report(os.path.join(workdir, report))
+    if actual == expected:
+        logger.info(f"[{script}] 기준 리포트와 일치 ({len(actual)}줄)")
+        return True
+    diff = difflib.unified_diff(expected, actual, "expected", "actual", lineterm="")
+    logger.error(f"[{script}] 기준 리포트와 불일치:\n" + "\n".join(diff))
+    return False
+
+
+def main():
+    """
+    EDA 리포트 스크립트의 출력이 기존 구현의 기준 리포트와 같은지 검사하는 메인 함수 (전처리/집계 변경 시 회귀 확인).
+    불일치가 하나라도 있으면 종료 코드 1을 반환함.
+    """
+    parser = argparse.ArgumentParser(description="EDA 리포트 출력과 기준 리포트의 일치 여부 검사")
+    parser.add_argument("scripts", nargs="*", help=f"검사할 리포트 스크립트 (기본값: 전체, {', '.join(sorted(REPORTS))})")
+    args = parser.parse_args()
+
+    scripts = args.scripts or sorted(REPORTS)
+    unknown = [script for script in scripts if script not in REPORTS]
+    if unknown:
+        parser.error(f"기준 리포트가 없는 스크립트: {unknown}")
+    failed = [script for script in scripts if not check_report(script, REPORTS[script])]
+    if failed:
+        logger.error(f"기준 리포트와 다른 스크립트 {len(failed)}개: {failed}")
+        return 1
+    logger.info(f"{len(scripts)}개 리포트 스크립트의 출력이 기준 리포트와 일치")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+import argparse # 명령행 인자 처리를 위한 argparse 라이브러리 임포트
+import json # 작업 명세 작성 및 체크포인트 확인을 위한 json 라이브러리 임포트
+import os # 파일 경로 조작을 위한 os 라이브러리 임포트
+import subprocess # 수집 프로세스 실행 및 강제 종료를 위한 subprocess 라이브러리 임포트
+import sys # 하위 프로세스 실행 및 종료 코드 반환을 위한 sys 라이브러리 임포트
+import tempfile # 실행별 임시 작업 폴더 생성을 위한 tempfile 라이브러리 임포트
+import time # 체크포인트 확인 간격을 위한 time 라이브러리 임포트
+from loguru import logger # 로그 기록을 위한 loguru 라이브러리 임포트
+
+# 설정
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__)) # 수집 스크립트 폴더 (하위 프로세스의 모듈 검색 경로)
+FIXTURE_FILE = os.path.join(SCRIPTS_DIR, "..", "data", "fixtures", "category_page.html") # 합성 페이지 원본 HTML
+DISP_NO = "001001003032" # 수집할 카테고리 (파티션 하나를 닫지 않은 채로 중단되도록 작업 1개)
+PAGES = 80 # 수집할 페이지 수
+RATE = 20.0 # 초당 요청 수 (중단 시점을 잡을 수 있도록 로컬 서버에서도 속도를 제한)
+KILL_AFTER = 20 # 체크포인트에 이 수 이상의 페이지가 확정되면 수집 프로세스를 강제 종료
+TIMEOUT = 120 # 수집 프로세스 하나를 기다릴 최대 시간(초)
+CHECKPOINT_FILE = "yes24/data/cache/checkpoint.json" # 작업 폴더 안의 체크포인트 경로 (scraper.CHECKPOINT_FILE, 스크래퍼는 로그 파일을 추가하므로 하위 프로세스에서만 임포트)
+
+
+def child(url, fmt, resume):
+    """하위 프로세스에서 재생 서버를 대상으로 스크래퍼를 실행하는 함수"""
+    import scraper
+
+    with open("crawl_manifest.json", "w", encoding="utf-8") as f:
+        json.dump([{"dispNo": DISP_NO, "pageEnd": PAGES}], f)
+    scraper.BASE_URL = url
+    scraper.RATE_LIMIT = RATE
+    scraper.RATE_BURST = 1
+    scraper.ADAPTIVE_THROTTLE = False # 고정 속도로 수집하여 실행마다 중단 시점이 비슷하도록 함
+    scraper.main(["--manifest", "crawl_manifest.json", "--format", fmt] + (["--resume"] if resume else []))
+
+
+def run_crawl(workdir, url, fmt, resume=False, kill_after=None):
+    """
+    작업 폴더에서 수집 프로세스를 실행하는 함수.
+
+    Args:
+        workdir (str): 스크래퍼의 출력/캐시/체크포인트를 기록할 작업 폴더.
+        url (str): 재생 서버의 목록 주소.
+        fmt (str): 출력 형식.
+        resume (bool): --resume으로 이어서 수집할지 여부.
+        kill_after (int): 체크포인트에 이 수 이상의 페이지가 확정되면 강제 종료 (None이면 끝까지 수집).
+
+    Returns:
+        int: 종료 시점에 체크포인트에 확정된 페이지 수.
+
+    Raises:
+        RuntimeError: 수집 프로세스가 실패했거나, 강제 종료하기 전에 수집이 끝난 경우.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SCRIPTS_DIR, os.environ.get("PYTHONPATH")])))
+    command = [sys.executable, os.path.abspath(__file__), "--child", url, "--format", fmt] + (["--resume"] if resume else [])
+    checkpoint_path = os.path.join(workdir, CHECKPOINT_FILE)
+    with open(os.path.join(workdir, "crawl.log"), "a", encoding="utf-8") as log:
+        process = subprocess.Popen(command, cwd=workdir, env=env, stdout=log, stderr=log)
+        deadline = time.time() + TIMEOUT
+        while process.poll() is None and time.time() < deadline:
+            checkpoint = read_checkpoint(checkpoint_path)
+            if kill_after is not None and len(checkpoint["completed"]) >= kill_after and not checkpoint["finished"]:
+                process.kill() # 정상 종료 처리 없이 중단 (전원 차단/강제 종료와 같은 상황)
+                process.wait()
+                return len(read_checkpoint(checkpoint_path)["completed"])
+            time.sleep(0.05)
+        if process.poll() is None:
+            process.kill()
+            raise RuntimeError(f"수집 프로세스가 {TIMEOUT}초 안에 끝나지 않았습니다: {workdir}")
+    if process.returncode != 0:
+        raise RuntimeError(f"수집 프로세스 실패 (종료 코드 {process.returncode}): {os.path.join(workdir, 'crawl.log')}")
+    if kill_after is not None:
+        raise RuntimeError("강제 종료하기 전에 수집이 끝났습니다 (RATE를 낮추거나 PAGES를 늘려야 함)")
+    return len(read_checkpoint(checkpoint_path)["completed"])
+
+
+def read_checkpoint(path):
+    """체크포인트 파일을 읽는 함수 (아직 없으면 빈 체크포인트)"""
+    if not os.path.exists(path):
+        return {"completed": [], "finished": False}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_output(workdir):
+    """작업 폴더의 데이터셋을 읽고 파티션별 조각 파일 수를 반환하는 함수"""
+    from dataset import DATASET_DIR, dataset_files, read_books
+
+    root = os.path.join(workdir, DATASET_DIR)
+    parts = {}
+    for path in dataset_files(root):
+        partition = os.path.relpath(os.path.dirname(path), root)
+        parts[partition] = parts.get(partition, 0) + 1
+    return read_books(root).reset_index(drop=True), parts
+
+
+def check(fmt):
+    """
+    한 번에 끝까지 수집한 결과와, 수집 도중 강제 종료한 뒤 --resume으로 이어서 수집한 결과가 같은지 비교하는 함수.
+
+    Returns:
+        bool: 두 결과가 같으면 True.
+    """
+    from replay_server import ReplayServer
+
+    with tempfile.TemporaryDirectory() as reference_dir, tempfile.TemporaryDirectory() as resumed_dir:
+        with ReplayServer(None, FIXTURE_FILE, total_pages=PAGES).start() as server:
+            run_crawl(reference_dir, server.url, fmt)
+            committed = run_crawl(resumed_dir, server.url, fmt, kill_after=KILL_AFTER)
+            logger.info(f"[{fmt}] 강제 종료 시점에 확정된 페이지: {committed}/{PAGES}개")
+            requests = server.stats["ok"] + server.stats["not_modified"]
+            run_crawl(resumed_dir, server.url, fmt, resume=True)
+            refetched = server.stats["ok"] + server.stats["not_modified"] - requests
+        logger.info(f"[{fmt}] 이어서 수집한 페이지: {refetched}개")
+        expected, expected_parts = read_output(reference_dir)
+        resumed, resumed_parts = read_output(resumed_dir)
+
+    logger.info(f"[{fmt}] 파티션별 조각 파일 수: 한 번에 수집 {expected_parts}, 이어서 수집 {resumed_parts}")
+    if committed == 0:
+        logger.error(f"[{fmt}] 강제 종료 시점에 확정된 페이지가 없습니다 (처음부터 다시 수집함)")
+        return False
+    if refetched > PAGES - committed:
+        logger.error(f"[{fmt}] 확정된 페이지를 다시 수집했습니다: {refetched}개")
+        return False
+    if not resumed.equals(expected):
+        logger.error(f"[{fmt}] 결과 불일치: {len(resumed)}행 != {len(expected)}행")
+        return False
+    logger.info(f"[{fmt}] 이어서 수집한 결과가 한 번에 수집한 결과와 같음 ({len(expected)}행)")
+    return True
+
+
+def main():
+    """
+    수집 도중 강제 종료된 경우에도 --resume으로 이어서 수집한 결과가 한 번에 수집한 결과와 같은지 검사하는 메인 함수.
+    불일치가 하나라도 있으면 종료 코드 1을 반환함.
+    """
+    parser = argparse.ArgumentParser(description="강제 종료 후 이어서 수집한 결과 검사 (로컬 재생 서버 사용)")
+    parser.add_argument("--formats", nargs="+", default=["parquet", "csv", "jsonl"], help="검사할 출력 형식")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS) # 하위 프로세스용 (재생 서버 주소)
+    parser.add_argument("--format", default="parquet", help=argparse.SUPPRESS)
+    parser.add_argument("--resume", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.format, args.resume)
+        return 0
+
+    failed = [fmt for fmt in args.formats if not check(fmt)]
+    if failed:
+        logger.error(f"이어서 수집한 결과가 다른 출력 형식: {failed}")
+        return 1
+    logger.info(f"{len(args.formats)}개 출력 형식에서 이어서 수집한 결과 일치")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
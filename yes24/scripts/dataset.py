@@ -0,0 +1,285 @@
+import datetime # 출판 연월을 날짜 형식으로 변환하기 위한 datetime 라이브러리 임포트
+import glob # 파티션 조각 파일 목록 조회를 위한 glob 라이브러리 임포트
+import os # 파일 경로 조작을 위한 os 라이브러리 임포트
+import re # 출판일 문자열 해석을 위한 re 라이브러리 임포트
+import pandas as pd # 데이터 로드를 위한 pandas 라이브러리 임포트
+
+# 설정
+DATASET_DIR = "yes24/data/raw/yes24_books" # 스크래퍼가 작업별 파티션으로 기록하는 데이터셋 폴더
+LEGACY_CSV = "yes24/data/raw/yes24_books.csv" # 단일 카테고리 수집 시절의 CSV 파일
+CHUNK_ROWS = 100_000 # iter_books()가 한 번에 읽는 기본 행 수
+
+PUBLISH_DATE_RE = re.compile(r"(\d{4})년\s*(\d{1,2})월") # 'YYYY년 MM월' 형식의 출판일
+
+# 도서 데이터의 열별 타입 (Parquet 저장 시 사용)
+# - 가격/리뷰 수는 정수, 별점은 실수, 출판사/저자는 반복되는 값이 많으므로 사전(dictionary) 인코딩
+# - 'Publish Month'는 'YYYY년 MM월' 문자열을 해당 월 1일의 날짜로 변환한 열
+COLUMN_TYPES = {
+    "Goods No": "int64",
+    "Title": "string",
+    "Author": "dictionary",
+    "Publisher": "dictionary",
+    "Publish Date": "string",
+    "Publish Month": "date",
+    "Price": "int32",
+    "Rating": "float32",
+    "Review Count": "int32",
+    "Detail URL": "string",
+    "List Price": "int32",
+    "Discount Rate": "int8",
+    "Sales Index": "int32",
+}
+
+READERS = {
+    ".csv": pd.read_csv,
+    ".jsonl": lambda path: pd.read_json(path, lines=True, dtype=False),
+    ".parquet": pd.read_parquet,
+}
+
+
+def book_schema():
+    """COLUMN_TYPES에 해당하는 pyarrow 스키마를 만드는 함수"""
+    import pyarrow as pa # Parquet/Arrow 기능은 pyarrow가 설치된 경우에만 사용
+
+    types = {
+        "int64": pa.int64(),
+        "int32": pa.int32(),
+        "int8": pa.int8(),
+        "float32": pa.float32(),
+        "string": pa.string(),
+        "dictionary": pa.dictionary(pa.int32(), pa.string()),
+        "date": pa.date32(),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in COLUMN_TYPES.items()])
+
+
+def parse_publish_month(value):
+    """'YYYY년 MM월' 문자열을 해당 월 1일의 날짜로 변환하는 함수 (해석할 수 없으면 None)"""
+    m = PUBLISH_DATE_RE.search(value or "")
+    if not m or not 1 <= int(m.group(2)) <= 12:
+        return None
+    return datetime.date(int(m.group(1)), int(m.group(2)), 1)
+
+
+def parse_number(value, kind):
+    """문자열 숫자를 정수 또는 실수로 변환하는 함수 (빈 값이나 해석할 수 없는 값은 None)"""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value) if kind == "float32" else int(float(str(value).replace(",", "")))
+    except ValueError:
+        return None
+
+
+class BookBatch:
+    """
+    도서 레코드를 열(column)별 리스트로 모으는 버퍼.
+
+    레코드 딕셔너리를 그대로 쌓지 않고 COLUMN_TYPES의 열마다 변환된 값만 보관하며,
+    사전 인코딩 열(출판사, 저자)은 처음 본 값에만 번호를 붙이고 행마다 번호만 저장하므로
+    같은 출판사/저자 문자열이 행 수만큼 중복되지 않는다. to_table()은 이 번호와 사전으로
+    Arrow 사전 배열을 바로 만들고, to_frame()은 Arrow 테이블을 해제하면서 DataFrame으로 변환한다.
+
+    Args:
+        records (iterable): 처음에 추가할 도서 정보 딕셔너리 (None이면 빈 버퍼).
+    """
+
+    def __init__(self, records=None):
+        self.columns = {name: [] for name in COLUMN_TYPES}
+        self.dictionaries = {name: {} for name, kind in COLUMN_TYPES.items() if kind == "dictionary"} # 값 -> 번호
+        if records is not None:
+            self.extend(records)
+
+    def __len__(self):
+        return len(self.columns["Goods No"])
+
+    def extend(self, records):
+        """레코드(문자열 값)를 열별 타입으로 변환하여 추가하는 함수"""
+        records = records if isinstance(records, list) else list(records)
+        for name, kind in COLUMN_TYPES.items():
+            column = self.columns[name]
+            if name == "Publish Month":
+                column.extend(parse_publish_month(r.get("Publish Date")) for r in records)
+            elif kind == "dictionary":
+                codes = self.dictionaries[name]
+                column.extend(None if (value := r.get(name)) is None else codes.setdefault(value, len(codes)) for r in records)
+            elif kind == "string":
+                column.extend(r.get(name) for r in records)
+            else:
+                column.extend(parse_number(r.get(name), kind) for r in records)
+
+    def clear(self):
+        """버퍼를 비우는 함수"""
+        for values in self.columns.values():
+            values.clear()
+        for codes in self.dictionaries.values():
+            codes.clear()
+
+    def to_table(self):
+        """
+        버퍼의 내용을 타입이 지정된 Arrow 테이블로 변환하는 함수.
+
+        Returns:
+            pyarrow.Table: book_schema() 스키마를 따르는 테이블.
+        """
+        import pyarrow as pa
+
+        schema = book_schema()
+        arrays = []
+        for field in schema:
+            values = self.columns[field.name]
+            if field.name in self.dictionaries: # 번호 배열과 사전으로 바로 사전 배열 구성 (문자열을 행마다 만들지 않음)
+                dictionary = pa.array(list(self.dictionaries[field.name]), pa.string())
+                arrays.append(pa.DictionaryArray.from_arrays(pa.array(values, pa.int32()), dictionary))
+            else:
+                arrays.append(pa.array(values, field.type))
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    def to_frame(self):
+        """
+        버퍼의 내용을 read_books()와 같은 타입의 DataFrame으로 변환하는 함수.
+
+        변환한 Arrow 열은 pandas로 옮기면서 바로 해제하므로(self_destruct) 같은 데이터가 두 벌로 남지 않으며,
+        출판사/저자는 category 타입(사전의 번호)으로 변환된다.
+
+        Returns:
+            pd.DataFrame: 도서 데이터.
+        """
+        table = self.to_table()
+        self.clear()
+        return table.to_pandas(date_as_object=False, split_blocks=True, self_destruct=True)
+
+
+def to_table(records):
+    """
+    수집한 도서 레코드(문자열 값)를 타입이 지정된 Arrow 테이블로 변환하는 함수.
+
+    Args:
+        records (list): 도서 정보 딕셔너리 리스트.
+
+    Returns:
+        pyarrow.Table: book_schema() 스키마를 따르는 테이블.
+    """
+    return BookBatch(records).to_table()
+
+
+def books_path():
+    """분석 대상 경로를 반환하는 함수 (파티션 데이터셋이 있으면 데이터셋 폴더, 없으면 기존 CSV)"""
+    return DATASET_DIR if dataset_files(DATASET_DIR) else LEGACY_CSV
+
+
+def dataset_files(root):
+    """데이터셋 폴더 아래의 모든 조각 파일 경로를 정렬하여 반환하는 함수"""
+    return sorted(
+        path for path in glob.glob(os.path.join(root, "**", "part-*.*"), recursive=True)
+        if os.path.splitext(path)[1] in READERS
+    )
+
+
+def partition_values(root, path):
+    """조각 파일 경로의 Hive 형식 폴더(key=value)에서 파티션 값을 읽는 함수"""
+    parts = os.path.relpath(os.path.dirname(path), root).split(os.sep)
+    return dict(part.split("=", 1) for part in parts if "=" in part)
+
+
+def read_books(path=None, columns=None, details=False):
+    """
+    도서 데이터를 DataFrame으로 읽는 함수.
+
+    파일이면 그대로 읽고, 폴더면 모든 파티션의 조각 파일을 읽어 이어 붙이며
+    파티션 값(disp_no, order)을 열로 추가한다. Parquet 데이터셋은 필요한 열만 읽으며,
+    사전 인코딩된 열(출판사, 저자)은 pandas의 category 타입으로 읽힌다.
+
+    Args:
+        path (str): CSV 파일 또는 데이터셋 폴더 경로 (None이면 books_path() 사용).
+        columns (list): 읽을 열 이름 목록 (None이면 전체).
+        details (bool | str): 상세 페이지에서 수집한 열(쪽수, ISBN, 카테고리 등)을 상품 번호 기준으로 추가할지 여부.
+            문자열이면 상세 정보 캐시 데이터베이스 경로 (details.DETAIL_COLUMN_TYPES 참고).
+
+    Returns:
+        pd.DataFrame: 도서 데이터.
+    """
+    if not details:
+        return _read_books(path, columns)
+    from details import DETAIL_DB, join_details # 상세 정보 결합이 필요한 경우에만 임포트
+
+    keep_key = columns is None or "Goods No" in columns
+    frame = _read_books(path, columns if keep_key else list(columns) + ["Goods No"])
+    frame = join_details(frame, details if isinstance(details, str) else DETAIL_DB)
+    return frame if keep_key else frame.drop(columns="Goods No")
+
+
+def _read_books(path, columns):
+    """read_books()의 상세 정보 결합 전 단계 (파일 또는 데이터셋 폴더 읽기)"""
+    path = path or books_path()
+    if os.path.isfile(path):
+        ext = os.path.splitext(path)[1]
+        if ext == ".csv":
+            return pd.read_csv(path, usecols=columns)
+        frame = READERS[ext](path)
+        return frame[columns] if columns else frame
+    files = dataset_files(path)
+    if files and all(part.endswith(".parquet") for part in files):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        # 파티션 값은 문자열로 읽어 카테고리 번호의 앞자리 0이 정수 변환으로 사라지지 않도록 함
+        keys = partition_values(path, files[0])
+        partition_schema = pa.schema([(key, pa.string()) for key in keys])
+        partitioning = ds.partitioning(partition_schema, flavor="hive")
+        # 열이 추가되기 전에 기록된 조각 파일이 섞여 있어도 현재 스키마로 읽음 (없는 열은 결측값)
+        schema = pa.unify_schemas([book_schema(), partition_schema])
+        dataset = ds.dataset(files, schema=schema, format="parquet", partitioning=partitioning, partition_base_dir=path)
+        return dataset.to_table(columns=columns).to_pandas(date_as_object=False)
+    frames = []
+    for part in files:
+        frame = READERS[os.path.splitext(part)[1]](part)
+        for key, value in partition_values(path, part).items():
+            frame[key] = value
+        frames.append(frame[columns] if columns else frame)
+    if not frames:
+        raise FileNotFoundError(f"데이터셋에 조각 파일이 없습니다: {path}")
+    return pd.concat(frames, ignore_index=True)
+
+
+def _iter_file(path, columns, chunk_rows):
+    """조각 파일 하나를 chunk_rows행씩 나누어 읽는 제너레이터"""
+    ext = os.path.splitext(path)[1]
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas(date_as_object=False)
+    elif ext == ".jsonl":
+        for chunk in pd.read_json(path, lines=True, dtype=False, chunksize=chunk_rows):
+            yield chunk[columns] if columns else chunk
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_rows)
+
+
+def iter_books(path=None, columns=None, chunk_rows=CHUNK_ROWS):
+    """
+    도서 데이터를 chunk_rows행씩 나누어 읽는 제너레이터 (전체 데이터를 메모리에 올리지 않음).
+
+    read_books()와 같은 열(파티션 값 열 포함)을 가진 DataFrame 조각을 파일 순서대로 반환한다.
+    Parquet 조각 파일은 row group 단위로, CSV/JSONL은 chunksize 단위로 읽는다.
+
+    Args:
+        path (str): CSV 파일 또는 데이터셋 폴더 경로 (None이면 books_path() 사용).
+        columns (list): 읽을 열 이름 목록 (None이면 전체).
+        chunk_rows (int): 한 번에 읽을 최대 행 수.
+
+    Yields:
+        pd.DataFrame: 도서 데이터 조각.
+    """
+    path = path or books_path()
+    files = [path] if os.path.isfile(path) else dataset_files(path)
+    if not files:
+        raise FileNotFoundError(f"데이터셋에 조각 파일이 없습니다: {path}")
+    for file in files:
+        partitions = {} if file == path else partition_values(path, file)
+        file_columns = [c for c in columns if c not in partitions] if columns else None
+        for chunk in _iter_file(file, file_columns, chunk_rows):
+            for key, value in partitions.items():
+                chunk[key] = value
+            yield chunk[columns] if columns else chunk
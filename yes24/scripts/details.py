@@ -0,0 +1,261 @@
+import html as htmllib # HTML 엔티티 해제를 위한 html 라이브러리 임포트
+import json # 상세 정보 직렬화를 위한 json 라이브러리 임포트
+import os # 파일 경로 조작을 위한 os 라이브러리 임포트
+import re # 상세 페이지 필드 추출을 위한 정규표현식 라이브러리 임포트
+import sqlite3 # 상품 번호별 상세 정보 캐시를 위한 sqlite3 라이브러리 임포트
+import time # 캐시 유효 기간 계산을 위한 time 라이브러리 임포트
+import pandas as pd # 상세 정보 표 생성 및 도서 데이터 결합을 위한 pandas 라이브러리 임포트
+import requests # HTTP 요청 예외 타입 처리를 위한 라이브러리 임포트
+from loguru import logger # 로그 기록을 위한 loguru 라이브러리 임포트
+from metrics import inc, span # 상세 페이지 요청 시간 및 캐시 적중 수 기록 함수 임포트
+
+# 설정
+DETAIL_URL = "https://www.yes24.com/product/goods/{goods_no}" # 도서 상세 페이지 주소 형식
+DETAIL_DB = "yes24/data/cache/details.sqlite" # 상품 번호별 상세 정보와 수집 시각을 저장할 데이터베이스 경로
+DETAIL_TTL = 7 * 24 * 3600 # 상세 정보를 다시 수집하기 전까지 재사용할 기간(초)
+BATCH_SIZE = 100 # 캐시에 한 번에 반영할 상세 페이지 수
+
+# 상세 페이지에서 추가하는 열과 pandas 타입 (상세 정보가 없는 도서는 결측값)
+DETAIL_COLUMN_TYPES = {
+    "Page Count": "Int32", # 쪽수
+    "Weight": "Int32", # 무게(g)
+    "Size": "string", # 크기 ('가로*세로*두께mm')
+    "ISBN13": "string",
+    "ISBN10": "string",
+    "Category": "string", # 대표 카테고리 경로 ('국내도서 > 에세이 > 한국에세이')
+    "Categories": "string", # 도서가 속한 모든 카테고리 경로 (' | '로 구분)
+    "Member Review Count": "Int32", # 회원리뷰 수
+    "Short Review Count": "Int32", # 한줄평 수
+}
+
+SPEC_RE = re.compile(r'id="infoset_specific".*?</table>', re.S) # 품목정보 표
+SPEC_ROW_RE = re.compile(r"<th[^>]*>(.*?)</th>\s*<td[^>]*>(.*?)</td>", re.S) # 품목정보 표의 (항목, 값) 행
+CATEGORY_RE = re.compile(r'id="infoset_goodsCate".*?</ul>', re.S) # 카테고리 분류 목록
+CATEGORY_ITEM_RE = re.compile(r"<li[^>]*>(.*?)</li>", re.S) # 카테고리 경로 하나
+REVIEW_RES = {
+    "Member Review Count": re.compile(r"회원리뷰\s*\(?\s*([\d,]+)\s*건"),
+    "Short Review Count": re.compile(r"한줄평\s*\(?\s*([\d,]+)\s*건"),
+}
+TAG_RE = re.compile(r"<[^>]+>") # HTML 태그 제거용
+
+
+def _text(fragment):
+    """HTML 조각에서 태그를 제거하고 엔티티를 해제한 뒤 공백을 정리한 텍스트를 반환하는 함수"""
+    return " ".join(htmllib.unescape(TAG_RE.sub(" ", fragment)).split())
+
+
+def _int(pattern, text):
+    """text에서 pattern의 첫 번째 그룹을 정수로 읽는 함수 (없으면 None)"""
+    m = re.search(pattern, text) if isinstance(pattern, str) else pattern.search(text)
+    return int(m.group(1).replace(",", "")) if m else None
+
+
+def parse_detail(html):
+    """
+    도서 상세 페이지 HTML에서 목록 페이지에 없는 정보를 추출하는 함수.
+
+    품목정보 표(쪽수, 무게, 크기, ISBN), 카테고리 분류, 회원리뷰/한줄평 수를 읽으며,
+    페이지에 없는 항목은 None으로 둔다.
+
+    Args:
+        html (str): 도서 상세 페이지 HTML.
+
+    Returns:
+        dict: DETAIL_COLUMN_TYPES의 열 이름을 키로 갖는 상세 정보.
+    """
+    record = dict.fromkeys(DETAIL_COLUMN_TYPES)
+    spec = SPEC_RE.search(html)
+    for name, value in SPEC_ROW_RE.findall(spec.group(0)) if spec else []:
+        name, value = _text(name), _text(value)
+        if name.startswith("쪽수"): # '312쪽 | 434g | 140*210*20mm' (일부 항목이 빠질 수 있음)
+            record["Page Count"] = _int(r"([\d,]+)\s*쪽", value)
+            record["Weight"] = _int(r"([\d,]+)\s*g\b", value)
+            size = re.search(r"\d+\*\d+\*\d+\s*mm", value)
+            record["Size"] = size.group(0).replace(" ", "") if size else None
+        elif name in ("ISBN13", "ISBN10"):
+            record[name] = value or None
+
+    categories = CATEGORY_RE.search(html)
+    paths = [_text(item) for item in CATEGORY_ITEM_RE.findall(categories.group(0))] if categories else []
+    paths = [" > ".join(part.strip() for part in path.split(">")) for path in paths if path]
+    record["Category"] = paths[0] if paths else None
+    record["Categories"] = " | ".join(paths) if paths else None
+
+    text = _text(html)
+    for column, pattern in REVIEW_RES.items():
+        record[column] = _int(pattern, text)
+    return record
+
+
+def fetch_detail(goods_no, client, url=DETAIL_URL):
+    """
+    도서 하나의 상세 페이지를 가져와 (HTTP 상태 코드, 상세 정보)를 반환하는 함수.
+
+    상세 페이지가 없는(404) 도서는 (404, None)을 반환하여 유효 기간 동안 다시 요청하지 않게 하고,
+    재시도를 모두 소진한 요청은 (None, None)을 반환하여 다음 실행에서 다시 시도하게 한다.
+
+    Args:
+        goods_no (str): 상품 번호.
+        client (HttpClient): 요청에 사용할 HTTP 클라이언트.
+        url (str): 상세 페이지 주소 형식 ('{goods_no}' 포함).
+
+    Returns:
+        tuple: (상태 코드, 상세 정보 딕셔너리).
+    """
+    try:
+        with span("detail_fetch"):
+            response = client.get(url.format(goods_no=goods_no))
+    except requests.HTTPError as e:
+        status = e.response.status_code if e.response is not None else None
+        if status == 404:
+            return 404, None
+        logger.error(f"상세 페이지 {goods_no} 요청 중 오류 발생: {e}")
+        return None, None
+    except requests.RequestException as e:
+        logger.error(f"상세 페이지 {goods_no} 요청 중 오류 발생 (재시도 소진): {e}")
+        return None, None
+    inc("http_body_bytes_total", len(response.content), kind="detail")
+    with span("detail_parse"):
+        return response.status_code, parse_detail(response.text)
+
+
+class DetailCache:
+    """
+    상품 번호(goods_no)를 키로 상세 페이지에서 추출한 정보와 수집 시각을 보관하는 SQLite 캐시.
+
+    유효 기간(ttl)이 지나지 않은 도서는 다시 요청하지 않으므로, 같은 도서가 여러 실행이나 여러 카테고리에
+    반복해서 나와도 상세 페이지는 유효 기간마다 한 번만 요청한다. 상세 페이지가 없는(404) 도서도
+    상태 코드와 함께 기록하여 유효 기간 동안 다시 요청하지 않는다.
+
+    Args:
+        path (str): SQLite 데이터베이스 파일 경로.
+        ttl (float): 상세 정보를 재사용할 기간(초).
+    """
+
+    def __init__(self, path=DETAIL_DB, ttl=DETAIL_TTL):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.ttl = ttl
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS details (goods_no TEXT PRIMARY KEY, status INTEGER NOT NULL, record TEXT, fetched_at REAL NOT NULL)"
+        )
+
+    def stale(self, goods_nos, now=None):
+        """
+        상세 정보가 없거나 유효 기간이 지난 상품 번호를 입력 순서대로 반환하는 함수 (중복 제외).
+
+        Args:
+            goods_nos (iterable): 상품 번호 목록.
+            now (float): 기준 시각 (None이면 현재 시각).
+
+        Returns:
+            list: 상세 페이지를 요청해야 하는 상품 번호 목록.
+        """
+        goods_nos = list(dict.fromkeys(str(g) for g in goods_nos if g))
+        cutoff = (now or time.time()) - self.ttl
+        fresh = set()
+        for i in range(0, len(goods_nos), 500): # SQLite 매개변수 개수 제한을 넘지 않도록 나누어 조회
+            chunk = goods_nos[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT goods_no FROM details WHERE fetched_at >= ? AND goods_no IN ({','.join('?' * len(chunk))})", [cutoff] + chunk
+            )
+            fresh.update(goods_no for (goods_no,) in rows)
+        return [g for g in goods_nos if g not in fresh]
+
+    def put(self, results, now=None):
+        """
+        상세 페이지 요청 결과를 기록하는 함수.
+
+        Args:
+            results (list): (상품 번호, 상태 코드, 상세 정보 딕셔너리 또는 None) 튜플 리스트.
+            now (float): 수집 시각 (None이면 현재 시각).
+        """
+        now = now or time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO details VALUES (?, ?, ?, ?)",
+                [(str(g), status, json.dumps(record, ensure_ascii=False) if record else None, now) for g, status, record in results],
+            )
+
+    def frame(self):
+        """
+        저장된 상세 정보를 상품 번호별 DataFrame으로 반환하는 함수 (유효 기간이 지난 정보도 포함).
+
+        Returns:
+            pd.DataFrame: 'Goods No'(int64)를 인덱스로, DETAIL_COLUMN_TYPES의 열을 갖는 DataFrame.
+        """
+        rows = self.conn.execute("SELECT goods_no, record FROM details WHERE record IS NOT NULL").fetchall()
+        frame = pd.DataFrame([json.loads(record) for _, record in rows], columns=list(DETAIL_COLUMN_TYPES))
+        frame.index = pd.Index(pd.to_numeric([g for g, _ in rows], errors="coerce"), name="Goods No")
+        return frame.astype(DETAIL_COLUMN_TYPES)
+
+    def close(self):
+        self.conn.close()
+
+
+def enrich(goods_nos, fetcher, client, cache, url=DETAIL_URL):
+    """
+    상세 정보가 없거나 유효 기간이 지난 도서의 상세 페이지를 동시에 수집하여 캐시에 기록하는 함수.
+
+    요청은 fetcher의 작업자 수만큼만 동시에 진행하며, fetcher의 토큰 버킷(목록 수집과 공유 가능)으로 전체 요청 속도를 제한한다.
+    결과는 BATCH_SIZE개마다 캐시에 반영하므로 중단되어도 그때까지 수집한 상세 정보는 다음 실행에서 재사용된다.
+
+    Args:
+        goods_nos (iterable): 상세 정보를 채울 상품 번호 목록.
+        fetcher (ConcurrentFetcher): 동시 수집 엔진.
+        client (HttpClient): 요청에 사용할 HTTP 클라이언트.
+        cache (DetailCache): 상세 정보 캐시.
+        url (str): 상세 페이지 주소 형식 ('{goods_no}' 포함).
+
+    Returns:
+        dict: 캐시 재사용(cached), 새로 수집(fetched), 상세 페이지 없음(missing), 실패(failed) 도서 수.
+    """
+    goods_nos = list(dict.fromkeys(str(g) for g in goods_nos if g))
+    stale = cache.stale(goods_nos)
+    counts = {"cached": len(goods_nos) - len(stale), "fetched": 0, "missing": 0, "failed": 0}
+    inc("detail_cache_hits_total", counts["cached"])
+    logger.info(f"상세 페이지 수집 시작: {len(stale)}개 요청, {counts['cached']}개 캐시 재사용")
+
+    batch = []
+    tasks = ((goods_no, client, url) for goods_no in stale)
+    for done, ((goods_no, _, _), (status, record)) in enumerate(fetcher.fetch(fetch_detail, url, tasks), 1):
+        if status is None: # 실패한 도서는 기록하지 않고 다음 실행에서 다시 시도
+            counts["failed"] += 1
+        else:
+            counts["fetched" if record else "missing"] += 1
+            batch.append((goods_no, status, record))
+        if len(batch) >= BATCH_SIZE:
+            cache.put(batch)
+            batch = []
+        if done % BATCH_SIZE == 0:
+            logger.info(f"상세 페이지 {done}/{len(stale)}개 수집")
+    if batch:
+        cache.put(batch)
+    for name in ("fetched", "missing", "failed"):
+        inc("detail_pages_total", counts[name], result=name)
+    return counts
+
+
+def join_details(df, path=DETAIL_DB):
+    """
+    도서 데이터에 상세 정보 열을 'Goods No' 기준으로 추가하는 함수.
+
+    Args:
+        df (pd.DataFrame): 'Goods No' 열을 포함한 도서 데이터.
+        path (str): 상세 정보 캐시 데이터베이스 경로 (없으면 모든 상세 정보 열이 결측값).
+
+    Returns:
+        pd.DataFrame: DETAIL_COLUMN_TYPES의 열이 추가된 도서 데이터 (행 순서와 인덱스는 그대로).
+    """
+    if os.path.exists(path):
+        cache = DetailCache(path)
+        details = cache.frame()
+        cache.close()
+    else:
+        details = pd.DataFrame(columns=list(DETAIL_COLUMN_TYPES)).astype(DETAIL_COLUMN_TYPES)
+    details = details[~details.index.duplicated()]
+    matched = details.reindex(pd.to_numeric(df["Goods No"], errors="coerce"))
+    result = df.copy()
+    for column in DETAIL_COLUMN_TYPES:
+        result[column] = matched[column].array # 확장 타입(Int32, string) 유지
+    return result
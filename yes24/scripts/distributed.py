@@ -0,0 +1,350 @@
+import gzip # 작업자 출력 조각 압축을 위한 gzip 라이브러리 임포트
+import json # 작업자 출력 조각 직렬화를 위한 json 라이브러리 임포트
+import os # 파일 경로 조작 및 원자적 파일 교체를 위한 os 라이브러리 임포트
+import socket # 기본 작업자 id 생성을 위한 socket 라이브러리 임포트
+import sqlite3 # 여러 작업자가 공유하는 작업 대기열을 위한 sqlite3 라이브러리 임포트
+import time # 임대 만료 시각 계산과 대기열 폴링을 위한 time 라이브러리 임포트
+from loguru import logger # 로그 기록을 위한 loguru 라이브러리 임포트
+
+# 설정
+QUEUE_DB = "yes24/data/queue/crawl_queue.sqlite" # 여러 작업자가 공유하는 작업 대기열 데이터베이스 경로 (작업자 노드가 함께 접근하는 파일 시스템)
+SHARD_DIR = "yes24/data/queue/shards" # 작업자별 출력 조각을 저장할 폴더 경로
+LEASE_SECONDS = 120 # 작업 임대 기간(초). 이 시간 안에 완료하거나 연장하지 않으면 다른 작업자가 다시 가져감
+MAX_ATTEMPTS = 5 # 페이지 하나를 시도할 최대 횟수 (넘으면 실패 처리)
+POLL_SECONDS = 2.0 # 가져올 작업이 없지만 다른 작업자가 진행 중일 때 다시 확인할 간격(초)
+
+
+def default_worker_id():
+    """호스트 이름과 프로세스 id로 작업자 id를 만드는 함수"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class LeaseQueue:
+    """
+    여러 작업자(프로세스, 노드)가 공유하는 SQLite 기반 페이지 작업 대기열.
+
+    - 작업자는 lease()로 작업을 임대하며, 임대 기간(visibility timeout) 안에 complete()하지 않으면
+      작업은 다시 대기 상태로 보여 다른 작업자가 가져간다 (작업자가 중단되어도 작업이 사라지지 않음).
+    - complete()는 현재 임대한 작업자만 성공하므로, 임대가 만료된 뒤 늦게 끝난 작업자의 결과는 버려지고
+      완료한 작업자(done_by)의 출력 조각만 병합된다 (재시도해도 결과가 중복되지 않음).
+    - 각 작업의 첫 페이지를 완료한 작업자가 전체 페이지 수를 기록하고 나머지 페이지를 대기열에 추가한다.
+    - 최근 heartbeat를 보낸 작업자 수로 전체 요청 속도 예산을 나누어(rate_share) 작업자를 추가해도 전체 속도가 지켜진다.
+
+    모든 상태 변경은 BEGIN IMMEDIATE 트랜잭션으로 수행하고 WAL 모드를 사용하므로, 같은 파일을 여러 프로세스가
+    동시에 열어도 된다. 여러 노드에서 쓸 때는 파일 잠금을 지원하는 공유 파일 시스템에 두어야 한다.
+
+    Args:
+        path (str): 대기열 데이터베이스 파일 경로.
+        lease_seconds (float): 작업 임대 기간(초).
+        max_attempts (int): 페이지 하나를 시도할 최대 횟수.
+    """
+
+    def __init__(self, path=QUEUE_DB, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None) # 트랜잭션은 직접 시작
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs (disp_no TEXT NOT NULL, sort_order TEXT NOT NULL, page_start INTEGER NOT NULL, "
+            "page_end INTEGER, priority INTEGER NOT NULL, page_count INTEGER, PRIMARY KEY (disp_no, sort_order))"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks (disp_no TEXT NOT NULL, sort_order TEXT NOT NULL, page INTEGER NOT NULL, "
+            "priority INTEGER NOT NULL, status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0, "
+            "owner TEXT, lease_expires REAL NOT NULL DEFAULT 0, items INTEGER, done_by TEXT, updated_at REAL, "
+            "PRIMARY KEY (disp_no, sort_order, page))"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, priority, page)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS workers (worker_id TEXT PRIMARY KEY, heartbeat REAL NOT NULL, pages INTEGER NOT NULL DEFAULT 0, "
+            "items INTEGER NOT NULL DEFAULT 0)"
+        )
+
+    def _transaction(self):
+        """쓰기 잠금을 먼저 잡는 트랜잭션 (동시에 같은 작업을 임대하지 않도록)"""
+        queue = self
+
+        class Transaction:
+            def __enter__(self):
+                queue.conn.execute("BEGIN IMMEDIATE")
+                return queue.conn
+
+            def __exit__(self, exc_type, *exc):
+                queue.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+        return Transaction()
+
+    def seed(self, jobs):
+        """
+        작업 목록과 각 작업의 첫 페이지를 대기열에 추가하는 함수 (이미 있는 작업은 그대로 둠).
+
+        Args:
+            jobs (list): CrawlJob 리스트.
+
+        Returns:
+            int: 새로 추가한 작업 수.
+        """
+        with self._transaction() as conn:
+            before = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (disp_no, sort_order, page_start, page_end, priority) VALUES (?, ?, ?, ?, ?)",
+                [(job.disp_no, job.order, job.page_start, job.page_end, job.priority) for job in jobs],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO tasks (disp_no, sort_order, page, priority) VALUES (?, ?, ?, ?)",
+                [(job.disp_no, job.order, job.page_start, job.priority) for job in jobs],
+            )
+            return conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] - before
+
+    def heartbeat(self, worker_id, pages=0, items=0):
+        """작업자가 살아 있음을 기록하고 임대 중인 작업의 임대 기간을 연장하는 함수"""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO workers VALUES (?, ?, ?, ?) ON CONFLICT(worker_id) DO UPDATE SET heartbeat = excluded.heartbeat, "
+                "pages = pages + excluded.pages, items = items + excluded.items",
+                (worker_id, now, pages, items),
+            )
+            conn.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE owner = ? AND status = 'leased'", (now + self.lease_seconds, worker_id)
+            )
+
+    def rate_share(self, worker_id, total_rate):
+        """전체 요청 속도 예산을 최근 heartbeat를 보낸 작업자 수로 나눈 이 작업자의 초당 요청 수"""
+        self.heartbeat(worker_id)
+        active = self.conn.execute("SELECT COUNT(*) FROM workers WHERE heartbeat >= ?", (time.time() - self.lease_seconds,)).fetchone()[0]
+        return total_rate / max(1, active)
+
+    def lease(self, worker_id, limit):
+        """
+        대기 중이거나 임대 기간이 지난 작업을 우선순위 순으로 최대 limit개 임대하는 함수.
+
+        시도 횟수를 모두 소진한 작업은 임대하지 않고 실패 처리한다.
+
+        Args:
+            worker_id (str): 작업자 id.
+            limit (int): 임대할 최대 작업 수.
+
+        Returns:
+            list: (카테고리 번호, 정렬 기준, 페이지) 튜플 리스트.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = 'failed', owner = NULL, updated_at = ? WHERE attempts >= ? AND "
+                "(status = 'pending' OR (status = 'leased' AND lease_expires < ?))",
+                (now, self.max_attempts, now),
+            )
+            rows = conn.execute(
+                "SELECT disp_no, sort_order, page FROM tasks WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY priority, disp_no, sort_order, page LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tasks SET status = 'leased', owner = ?, lease_expires = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE disp_no = ? AND sort_order = ? AND page = ?",
+                [(worker_id, now + self.lease_seconds, now, *row) for row in rows],
+            )
+        return rows
+
+    def complete(self, worker_id, task, items, page_count=None):
+        """
+        임대한 작업을 완료 처리하는 함수.
+
+        첫 페이지를 완료하면서 전체 페이지 수(page_count)를 알려 주면 작업의 나머지 페이지를 대기열에 추가한다.
+
+        Args:
+            worker_id (str): 작업자 id.
+            task (tuple): (카테고리 번호, 정렬 기준, 페이지).
+            items (int): 페이지에서 추출한 도서 수.
+            page_count (int): 첫 페이지에서 확인한 전체 페이지 수 (첫 페이지가 아니거나 알 수 없으면 None).
+
+        Returns:
+            bool: 완료 처리 여부 (임대 기간이 지나 다른 작업자가 가져간 경우 False).
+        """
+        disp_no, order, page = task
+        now = time.time()
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE tasks SET status = 'done', items = ?, done_by = ?, owner = NULL, updated_at = ? "
+                "WHERE disp_no = ? AND sort_order = ? AND page = ? AND status = 'leased' AND owner = ?",
+                (items, worker_id, now, disp_no, order, page, worker_id),
+            ).rowcount
+            if not updated:
+                return False
+            job = conn.execute(
+                "SELECT page_start, page_end, priority, page_count FROM jobs WHERE disp_no = ? AND sort_order = ?", (disp_no, order)
+            ).fetchone()
+            if job and page == job[0] and job[3] is None:
+                page_start, page_end, priority, _ = job
+                count = page_count if page_count is not None else (page_end or page_start)
+                last = min(count, page_end) if page_end is not None else count
+                conn.execute("UPDATE jobs SET page_count = ? WHERE disp_no = ? AND sort_order = ?", (count, disp_no, order))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO tasks (disp_no, sort_order, page, priority) VALUES (?, ?, ?, ?)",
+                    [(disp_no, order, p, priority) for p in range(page_start + 1, last + 1)],
+                )
+        return True
+
+    def release(self, worker_id, task):
+        """가져오지 못한 작업의 임대를 풀어 다시 대기 상태로 돌리는 함수 (시도 횟수는 유지)"""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = 'pending', owner = NULL, lease_expires = 0, updated_at = ? "
+                "WHERE disp_no = ? AND sort_order = ? AND page = ? AND status = 'leased' AND owner = ?",
+                (time.time(), *task, worker_id),
+            )
+
+    def counts(self):
+        """상태별 작업 수를 반환하는 함수"""
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"))
+
+    def remaining(self):
+        """아직 끝나지 않은(대기 중이거나 임대 중인) 작업 수"""
+        return self.conn.execute("SELECT COUNT(*) FROM tasks WHERE status IN ('pending', 'leased')").fetchone()[0]
+
+    def done_tasks(self):
+        """
+        완료된 작업을 작업 우선순위와 페이지 순으로 반환하는 함수.
+
+        Returns:
+            list: (카테고리 번호, 정렬 기준, 페이지, 완료한 작업자 id) 튜플 리스트.
+        """
+        return self.conn.execute(
+            "SELECT disp_no, sort_order, page, done_by FROM tasks WHERE status = 'done' ORDER BY priority, disp_no, sort_order, page"
+        ).fetchall()
+
+    def page_counts(self):
+        """작업별로 확인한 전체 페이지 수 ('카테고리:정렬 기준' -> 페이지 수)"""
+        return {f"{d}:{o}": c for d, o, c in self.conn.execute("SELECT disp_no, sort_order, page_count FROM jobs WHERE page_count IS NOT NULL")}
+
+    def close(self):
+        self.conn.close()
+
+
+class ShardWriter:
+    """
+    작업자 하나의 출력 조각을 페이지마다 별도 파일(gzip JSON Lines)로 기록하는 출력기.
+
+    같은 페이지를 다시 처리하면 파일을 원자적으로 교체하므로 재시도해도 결과가 중복되지 않으며,
+    병합 단계는 대기열에 기록된 완료 작업자의 파일만 읽는다.
+
+    Args:
+        root (str): 작업자별 조각 폴더의 상위 폴더 경로.
+        worker_id (str): 작업자 id.
+    """
+
+    def __init__(self, root, worker_id):
+        self.root = root
+        self.directory = os.path.join(root, worker_id)
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def path(root, worker_id, task):
+        """작업자와 페이지에 해당하는 조각 파일 경로"""
+        disp_no, order, page = task
+        return os.path.join(root, worker_id, f"{disp_no}_{order}_{int(page):05d}.jsonl.gz")
+
+    def write(self, task, records):
+        """한 페이지의 레코드를 조각 파일로 기록하는 함수"""
+        path = self.path(self.root, os.path.basename(self.directory), task)
+        with gzip.open(path + ".tmp", "wt", encoding="utf-8") as f:
+            f.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        os.replace(path + ".tmp", path)
+
+
+def read_shard(root, worker_id, task):
+    """작업자의 페이지 조각 파일에서 레코드를 읽는 함수"""
+    with gzip.open(ShardWriter.path(root, worker_id, task), "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def run_worker(queue, worker_id, fetcher, fetch_page, url, handle_page, count_pages, total_rate, batch=None):
+    """
+    대기열에서 작업을 임대하여 수집하는 작업자 루프.
+
+    임대한 작업을 동시 수집 엔진으로 가져와 handle_page로 처리하고 완료 처리한다. 가져오지 못한 페이지는
+    임대를 풀어 다시 시도되게 하며(시도 횟수 제한), 임대할 작업이 없지만 다른 작업자가 진행 중인 작업이
+    남아 있으면 그 작업의 임대가 만료될 수 있으므로 끝날 때까지 대기열을 다시 확인한다.
+    임대할 때마다 전체 속도 예산에서 이 작업자의 몫을 다시 계산하여 토큰 버킷의 속도(속도 조절기를 쓰면 속도 상한)를 조정한다.
+
+    Args:
+        queue (LeaseQueue): 공유 작업 대기열.
+        worker_id (str): 작업자 id.
+        fetcher (ConcurrentFetcher): 동시 수집 엔진.
+        fetch_page (callable): (페이지, 카테고리 번호, 정렬 기준)을 받아 (HTML, 변경 여부)를 반환하는 함수.
+        url (str): 요청 대상 URL (호스트별 동시성 제한 판단에 사용).
+        handle_page (callable): ((카테고리 번호, 정렬 기준, 페이지), HTML, 변경 여부)를 받아 기록하고 도서 목록을 반환하는 함수.
+        count_pages (callable): 첫 페이지 HTML과 도서 수를 받아 전체 페이지 수를 반환하는 함수.
+        total_rate (float): 모든 작업자가 나누어 쓰는 초당 요청 수.
+        batch (int): 한 번에 임대할 작업 수 (None이면 동시 요청 수의 2배).
+
+    Returns:
+        dict: 이 작업자가 처리한 페이지(pages), 도서(items), 다른 작업자에게 넘어간 페이지(lost), 실패한 요청(failed) 수.
+    """
+    batch = batch or fetcher.max_workers * 2
+    stats = {"pages": 0, "items": 0, "lost": 0, "failed": 0}
+    while True:
+        fetcher.limit_rate(queue.rate_share(worker_id, total_rate)) # 속도 조절기를 쓰면 작업자 몫이 속도 상한이 됨
+        tasks = queue.lease(worker_id, batch)
+        if not tasks:
+            if not queue.remaining():
+                break
+            time.sleep(POLL_SECONDS) # 다른 작업자가 임대 중인 작업이 끝나거나 만료될 때까지 대기
+            continue
+        logger.info(f"[{worker_id}] 작업 {len(tasks)}개 임대 (초당 요청 수 {fetcher.bucket.rate:.2f})")
+        for (page, disp_no, order), (html, changed) in fetcher.fetch(fetch_page, url, ((p, d, o) for d, o, p in tasks)):
+            task = (disp_no, order, page)
+            if html is None:
+                queue.release(worker_id, task)
+                stats["failed"] += 1
+                continue
+            books = handle_page(task, html, changed)
+            page_count = count_pages(html, len(books))
+            if queue.complete(worker_id, task, len(books), page_count):
+                stats["pages"] += 1
+                stats["items"] += len(books)
+            else:
+                stats["lost"] += 1 # 임대 기간이 지나 다른 작업자가 가져간 페이지 (이 결과는 병합하지 않음)
+            queue.heartbeat(worker_id, pages=1, items=len(books)) # 남은 작업의 임대 연장
+    return stats
+
+
+def merge_shards(queue, shard_root, writer, entity_index=None, snapshot_store=None):
+    """
+    완료된 페이지의 출력 조각을 작업 우선순위와 페이지 순으로 읽어 데이터셋에 기록하는 병합 함수.
+
+    페이지마다 대기열에 기록된 완료 작업자의 조각만 읽으므로, 임대가 만료되어 두 작업자가 같은 페이지를
+    처리한 경우에도 한 번만 기록된다. entity_index가 있으면 단일 프로세스 수집과 같이 상품 번호가 중복된 도서를 제외한다.
+
+    Args:
+        queue (LeaseQueue): 공유 작업 대기열.
+        shard_root (str): 작업자별 조각 폴더의 상위 폴더 경로.
+        writer (PartitionedWriter): 데이터셋 출력기.
+        entity_index (EntityIndex): 상품 번호 중복 제거 및 저자/출판사 색인 (None이면 중복 제거 안 함).
+        snapshot_store (SnapshotStore): 도서별 지표 변경 이력 저장소 (None이면 기록 안 함).
+
+    Returns:
+        dict: 병합한 페이지(pages), 기록한 도서(items), 중복으로 제외한 도서(duplicates), 조각이 없는 페이지(missing) 수.
+    """
+    stats = {"pages": 0, "items": 0, "duplicates": 0, "missing": 0}
+    for disp_no, order, page, worker_id in queue.done_tasks():
+        task = (disp_no, order, page)
+        try:
+            books = read_shard(shard_root, worker_id, task)
+        except FileNotFoundError:
+            logger.error(f"작업자 {worker_id}의 조각 파일이 없습니다: {task}")
+            stats["missing"] += 1
+            continue
+        if entity_index:
+            unique = entity_index.add_page(disp_no, order, page, books)
+            stats["duplicates"] += len(books) - len(unique)
+            books = unique
+        if snapshot_store:
+            snapshot_store.append(books)
+        writer.write(os.path.join(f"disp_no={disp_no}", f"order={order}"), task, books)
+        stats["pages"] += 1
+        stats["items"] += len(books)
+    writer.close()
+    return stats
@@ -0,0 +1,193 @@
+import os # 파일 경로 조작을 위한 os 라이브러리 임포트
+import re # 저자 문자열 분리를 위한 정규표현식 라이브러리 임포트
+import sqlite3 # 도서/저자/출판사 색인을 위한 sqlite3 라이브러리 임포트
+import numpy as np # 저자-도서 연결 표 생성을 위한 numpy 라이브러리 임포트
+import pandas as pd # 저자-도서 연결 표 반환을 위한 pandas 라이브러리 임포트
+
+# 설정
+ENTITY_DB = "yes24/data/cache/entities.sqlite" # 도서/저자/출판사 색인과 수집 중 중복 확인 기록을 저장할 데이터베이스 경로
+AUTHOR_ROLE = "저" # 역할 표기가 없는 저자 그룹의 역할 (파서가 ' 저'를 제거하므로 첫 그룹은 항상 저자)
+
+MORE_MARKER = "정보 더 보기/감추기" # 저자가 많을 때 전체 목록 앞에 붙는 펼치기 버튼 문구
+ROLE_RE = re.compile(r"\s+(역|옮김|그림|글|감수|편|엮음|편저|편역|사진|해설|기획|원작|저)$") # 저자 그룹 끝의 역할 표기
+OTHERS_RE = re.compile(r"\s*외\s*\d+\s*명$") # '외 N명'으로 줄여 표시한 저자 목록
+
+
+def normalize_name(name):
+    """저자/출판사 이름의 공백을 정리하는 함수 (연속 공백과 줄바꿈을 공백 하나로)"""
+    return " ".join(str(name).split())
+
+
+def split_authors(text):
+    """
+    목록 페이지의 저자 문자열을 (이름, 역할) 목록으로 분리하는 함수.
+
+    저자 문자열은 '저자1, 저자2/역자 역/그림작가 그림' 형식이며, 저자가 많으면
+    '저자1, ... 외 N명' 뒤에 펼치기 버튼 문구와 전체 이름 목록(줄 단위)이 이어진다.
+
+    Args:
+        text (str): 도서 정보의 'Author' 값.
+
+    Returns:
+        list: (이름, 역할) 튜플 리스트 (같은 이름과 역할은 한 번만, 표시 순서 유지).
+    """
+    if not isinstance(text, str) or not text.strip():
+        return []
+    head, _, more = text.partition(MORE_MARKER)
+    full = [normalize_name(line) for line in more.splitlines() if line.strip()] # 펼친 전체 저자 목록
+    result = []
+    for group in head.strip().split("/"):
+        group = group.strip()
+        match = ROLE_RE.search(group)
+        role = match.group(1) if match else AUTHOR_ROLE
+        if match:
+            group = group[:match.start()]
+        if OTHERS_RE.search(group) and full: # 줄여 표시한 그룹은 전체 목록으로 대체
+            names = full
+        else:
+            names = [normalize_name(name) for name in OTHERS_RE.sub("", group).split(",")]
+        result += [(name, role) for name in names if name]
+    return list(dict.fromkeys(result))
+
+
+def author_table(authors, roles=(AUTHOR_ROLE,)):
+    """
+    저자 문자열 열을 도서-저자 다대다 연결 표로 펼치는 함수.
+
+    같은 저자 문자열은 한 번만 분리하므로(범주형 열은 범주별 한 번) 비용은 고유 저자 문자열 수에 비례한다.
+
+    Args:
+        authors (pd.Series): 'Author' 열.
+        roles (tuple): 포함할 역할 (None이면 역자, 그림 작가 등 모든 역할 포함).
+
+    Returns:
+        pd.Series: 저자 이름 Series ('Author Name'). 인덱스는 원래 행의 인덱스이며, 공저 도서는 저자 수만큼 반복된다.
+    """
+    codes, uniques = pd.factorize(authors)
+    parsed = [[name for name, role in split_authors(value) if roles is None or role in roles] for value in uniques]
+    lengths = np.array([len(names) for names in parsed], dtype=np.intp)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    names = np.array([name for names in parsed for name in names], dtype=object)
+
+    rows = np.flatnonzero(codes >= 0)
+    counts = lengths[codes[rows]]
+    starts = np.repeat(offsets[codes[rows]] - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts) # 행별 저자 목록의 시작 위치
+    positions = starts + np.arange(counts.sum())
+    return pd.Series(names[positions], index=authors.index[np.repeat(rows, counts)], name="Author Name", dtype=object)
+
+
+class EntityIndex:
+    """
+    상품 번호(goods_no)를 키로 도서, 저자, 출판사를 정규화하여 보관하고 수집 중 중복 도서를 걸러내는 SQLite 색인.
+
+    - authors/publishers: 정규화한 이름 -> 정수 id (이름 -> id 사전을 메모리에 두어 레코드당 O(1) 조회)
+    - books: 상품 번호 -> 도서명, 출판사 id
+    - book_authors: 도서-저자 다대다 연결 (역할, 표시 순서 포함)
+    - listings: 도서가 등장한 (카테고리, 정렬 기준, 페이지) 목록
+    - crawl_seen: 이번 수집에서 이미 기록한 상품 번호와 그 페이지 (중복 제거용)
+
+    수집 중 같은 상품 번호가 다시 나오면(정렬 순서가 바뀌어 다음 페이지에 다시 나오거나, 다른 카테고리에도 속한 경우)
+    처음 기록한 행만 남기고, 등장한 위치는 모두 listings에 기록한다.
+
+    Args:
+        path (str): SQLite 데이터베이스 파일 경로.
+        completed (set): 출력 파일에 확정된 (카테고리, 정렬 기준, 페이지) 집합. 이어서 수집하는 경우
+            이 페이지에서 기록한 상품 번호만 중복 확인 기록으로 유지하고, 새로 수집하는 경우(빈 집합) 모두 지운다.
+    """
+
+    def __init__(self, path=ENTITY_DB, completed=()):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS authors (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS publishers (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS books (goods_no TEXT PRIMARY KEY, title TEXT, publisher_id INTEGER)")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS book_authors (goods_no TEXT NOT NULL, author_id INTEGER NOT NULL, role TEXT NOT NULL, "
+                "position INTEGER NOT NULL, PRIMARY KEY (goods_no, author_id, role))"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS book_authors_author ON book_authors (author_id)")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS listings (goods_no TEXT NOT NULL, disp_no TEXT NOT NULL, sort_order TEXT NOT NULL, "
+                "page INTEGER NOT NULL, PRIMARY KEY (goods_no, disp_no, sort_order))"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS crawl_seen (goods_no TEXT PRIMARY KEY, disp_no TEXT NOT NULL, sort_order TEXT NOT NULL, page INTEGER NOT NULL)"
+            )
+        self.author_ids = dict(self.conn.execute("SELECT name, id FROM authors"))
+        self.publisher_ids = dict(self.conn.execute("SELECT name, id FROM publishers"))
+        completed = set(completed)
+        self.seen = {}
+        for goods_no, disp_no, order, page in self.conn.execute("SELECT * FROM crawl_seen"):
+            if (disp_no, order, page) in completed: # 확정되지 않은 페이지의 기록은 다시 수집되므로 제외
+                self.seen[goods_no] = (disp_no, order, page)
+        with self.conn:
+            self.conn.execute("DELETE FROM crawl_seen")
+            self.conn.executemany("INSERT INTO crawl_seen VALUES (?, ?, ?, ?)", [(g, *task) for g, task in self.seen.items()])
+
+    def _entity_id(self, table, ids, name):
+        """이름의 id를 반환하는 함수 (처음 보는 이름이면 새 id 발급)"""
+        if name not in ids:
+            ids[name] = self.conn.execute(f"INSERT INTO {table} (name) VALUES (?)", (name,)).lastrowid
+        return ids[name]
+
+    def add_page(self, disp_no, order, page, records):
+        """
+        한 페이지의 도서를 색인에 반영하고, 이번 수집에서 처음 나온 도서만 반환하는 함수.
+
+        Args:
+            disp_no (str): 카테고리 번호.
+            order (str): 정렬 기준.
+            page (int): 페이지 번호.
+            records (list): 도서 정보 딕셔너리 리스트.
+
+        Returns:
+            list: 중복을 제외한 도서 정보 딕셔너리 리스트 (상품 번호가 없는 도서는 그대로 포함).
+        """
+        unique, seen, listings, books, links = [], [], [], [], []
+        for record in records:
+            goods_no = str(record.get("Goods No") or "")
+            if not goods_no:
+                unique.append(record)
+                continue
+            listings.append((goods_no, disp_no, order, page))
+            if goods_no in self.seen:
+                continue
+            self.seen[goods_no] = (disp_no, order, page)
+            seen.append((goods_no, disp_no, order, page))
+            unique.append(record)
+            publisher = normalize_name(record.get("Publisher") or "")
+            books.append((goods_no, record.get("Title"), self._entity_id("publishers", self.publisher_ids, publisher) if publisher else None))
+            links += [
+                (goods_no, self._entity_id("authors", self.author_ids, name), role, position)
+                for position, (name, role) in enumerate(split_authors(record.get("Author")))
+            ]
+        with self.conn: # 페이지 단위로 한 번에 반영 (새 이름의 id 발급 포함)
+            self.conn.executemany("INSERT OR IGNORE INTO listings VALUES (?, ?, ?, ?)", listings)
+            self.conn.executemany("INSERT OR REPLACE INTO crawl_seen VALUES (?, ?, ?, ?)", seen)
+            self.conn.executemany("INSERT OR REPLACE INTO books VALUES (?, ?, ?)", books)
+            self.conn.executemany("DELETE FROM book_authors WHERE goods_no = ?", [(b[0],) for b in books]) # 저자 정보가 바뀐 경우를 위해 다시 기록
+            self.conn.executemany("INSERT OR IGNORE INTO book_authors VALUES (?, ?, ?, ?)", links)
+        return unique
+
+    def authors_of(self, goods_no):
+        """도서의 (저자 이름, 역할) 목록을 표시 순서대로 반환하는 함수"""
+        return self.conn.execute(
+            "SELECT a.name, ba.role FROM book_authors ba JOIN authors a ON a.id = ba.author_id WHERE ba.goods_no = ? ORDER BY ba.position",
+            (str(goods_no),),
+        ).fetchall()
+
+    def books_by_author(self, name, role=AUTHOR_ROLE):
+        """저자의 상품 번호 목록을 반환하는 함수 (role이 None이면 모든 역할)"""
+        author_id = self.author_ids.get(normalize_name(name))
+        if author_id is None:
+            return []
+        query = "SELECT goods_no FROM book_authors WHERE author_id = ?" + (" AND role = ?" if role else "")
+        return [goods_no for (goods_no,) in self.conn.execute(query, (author_id, role) if role else (author_id,))]
+
+    def listings_of(self, goods_no):
+        """도서가 등장한 (카테고리 번호, 정렬 기준, 페이지) 목록을 반환하는 함수"""
+        return self.conn.execute("SELECT disp_no, sort_order, page FROM listings WHERE goods_no = ?", (str(goods_no),)).fetchall()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,254 @@
+import threading # 스레드 간 공유 상태 보호를 위한 threading 라이브러리 임포트
+import time # 토큰 보충 시간 계산을 위한 time 라이브러리 임포트
+from collections import deque # 요청 순서를 유지하는 대기열을 위한 deque 임포트
+from concurrent.futures import ThreadPoolExecutor # 동시 요청 처리를 위한 스레드 풀 임포트
+from urllib.parse import urlparse # URL에서 호스트명을 추출하기 위한 urlparse 임포트
+from loguru import logger # 속도 조절 상태 로그 기록을 위한 loguru 라이브러리 임포트
+from metrics import METRICS # 속도 조절 상태를 게이지로 기록할 지표 저장소 임포트
+
+
+class TokenBucket:
+    """
+    전체 요청 속도를 제한하는 토큰 버킷.
+
+    모든 워커 스레드가 하나의 버킷을 공유하므로, 동시에 몇 개의 요청이 진행 중이든
+    초당 요청 수(rate)는 전체 합계 기준으로 유지된다.
+
+    Args:
+        rate (float): 초당 보충되는 토큰 수 (= 초당 허용 요청 수).
+        capacity (float): 버킷에 쌓일 수 있는 최대 토큰 수 (순간 허용 요청 수).
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds):
+        """모든 워커의 요청을 seconds초 동안 멈추는 함수 (서버가 Retry-After로 대기를 요구한 경우)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기한 뒤 소비하는 함수"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until: # 일시 정지 중이면 정지가 끝날 때까지 대기 (정지 중에는 토큰을 보충하지 않음)
+                    self._updated = self._paused_until
+                    wait = self._paused_until - now
+                else:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate) # 경과 시간만큼 토큰 보충
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate # 다음 토큰이 생길 때까지 남은 시간
+            time.sleep(wait)
+
+
+class HostLimiter:
+    """
+    호스트별 동시 요청 수를 제한하는 세마포어 묶음.
+
+    Args:
+        limit (int): 한 호스트에 동시에 보낼 수 있는 최대 요청 수.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        """URL의 호스트에 해당하는 세마포어를 반환하는 함수"""
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.limit)
+            return self._semaphores[host]
+
+
+class AdaptiveThrottle:
+    """
+    서버 응답 시간과 오류율을 보고 요청 속도와 동시 요청 수를 조절하는 AIMD 속도 조절기.
+
+    요청(재시도 포함)마다 record()로 응답 시간과 상태 코드를 받아 window개가 모이면 한 번씩 판단한다.
+
+    - 429/5xx/네트워크 오류 비율이 error_rate를 넘으면 속도와 동시 요청 수를 절반으로 줄인다 (multiplicative decrease).
+    - 오류는 적지만 p95 응답 시간이 latency_target을 넘으면 서버가 느려지는 신호로 보고 속도를 decrease_latency배로 줄인다.
+    - 둘 다 아니면 속도를 rate_step만큼, 동시 요청 수를 1만큼 늘린다 (additive increase).
+    - Retry-After를 받으면(0초 포함) window가 차기를 기다리지 않고 바로 절반으로 줄이며, 그 시간 동안 토큰 버킷을 멈춰
+      모든 워커가 함께 기다리게 한다. 마지막으로 줄이기 전에 보낸 요청의 Retry-After는 이미 반영된 신호로 보고 다시 줄이지 않는다.
+
+    속도와 동시 요청 수는 항상 [min_rate, max_rate], [min_inflight, max_inflight] 범위 안에 있으며,
+    조절할 때마다 상태를 로그와 게이지(throttle_rate, throttle_inflight, throttle_latency_p95_seconds)로 남긴다.
+
+    Args:
+        bucket (TokenBucket): 속도를 조절할 토큰 버킷.
+        min_rate (float): 초당 요청 수 하한.
+        max_rate (float): 초당 요청 수 상한 (수집 정책의 최소 요청 간격).
+        max_inflight (int): 동시 요청 수 상한 (수집 엔진의 워커 수).
+        min_inflight (int): 동시 요청 수 하한.
+        latency_target (float): 허용할 p95 응답 시간(초).
+        error_rate (float): 허용할 오류 비율.
+        window (int): 한 번 판단하는 데 사용할 응답 수.
+        rate_step (float): 한 번에 늘릴 초당 요청 수.
+        decrease_latency (float): 응답이 느려졌을 때 속도에 곱할 값.
+    """
+
+    def __init__(self, bucket, min_rate, max_rate, max_inflight, min_inflight=1, latency_target=3.0, error_rate=0.05,
+                 window=20, rate_step=0.05, decrease_latency=0.8):
+        self.bucket = bucket
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.min_inflight = min_inflight
+        self.max_inflight = max_inflight
+        self.latency_target = latency_target
+        self.error_rate = error_rate
+        self.window = window
+        self.rate_step = rate_step
+        self.decrease_latency = decrease_latency
+        self.bucket.rate = min(max(bucket.rate, min_rate), max_rate)
+        self.inflight = max(min_inflight, max_inflight // 2) # 현재 동시 요청 수 한도
+        self._active = 0
+        self._samples = [] # (응답 시간, 오류 여부)
+        self._decreased_at = float("-inf") # 마지막으로 속도를 줄인 시각 (time.monotonic)
+        self._cond = threading.Condition()
+        self._publish()
+
+    def __enter__(self):
+        """동시 요청 수 한도 안에서 요청 슬롯을 얻는 함수"""
+        with self._cond:
+            while self._active >= self.inflight:
+                self._cond.wait()
+            self._active += 1
+
+    def __exit__(self, *exc):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+    def limit_rate(self, max_rate):
+        """초당 요청 수 상한을 바꾸는 함수 (분산 수집에서 작업자별 속도 예산이 바뀐 경우)"""
+        with self._cond:
+            self.max_rate = max(max_rate, self.min_rate)
+            self.bucket.rate = min(self.bucket.rate, self.max_rate)
+
+    def record(self, seconds, status=None, retry_after=None):
+        """
+        요청 하나의 결과를 기록하는 함수 (HttpClient의 observer로 등록).
+
+        Args:
+            seconds (float): 응답 시간(초).
+            status (int): HTTP 상태 코드 (네트워크 오류면 None).
+            retry_after (float): 서버가 요구한 대기 시간(초) (없으면 None).
+        """
+        if retry_after is not None and retry_after > 0:
+            self.bucket.pause(retry_after)
+        with self._cond:
+            self._samples.append((seconds, status is None or status == 429 or status >= 500))
+            if retry_after is not None and time.monotonic() - seconds >= self._decreased_at: # 줄인 뒤에 보낸 요청의 명시적 대기 요구는 바로 반영
+                self._adjust(retry_after=True)
+            elif len(self._samples) >= self.window:
+                self._adjust()
+
+    def _adjust(self, retry_after=False):
+        """모인 응답으로 속도와 동시 요청 수를 조절하는 함수 (_cond를 잡은 상태에서 호출, retry_after: Retry-After를 받아 바로 줄이는 경우)"""
+        latencies = sorted(seconds for seconds, _ in self._samples)
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        errors = sum(error for _, error in self._samples) / len(self._samples)
+        self._samples = []
+        rate, inflight = self.bucket.rate, self.inflight
+        if retry_after or errors > self.error_rate: # 과부하 신호: 절반으로 줄임
+            rate, inflight, action = rate / 2, inflight // 2, "감소(Retry-After)" if retry_after else "감소(오류)"
+            self._decreased_at = time.monotonic()
+        elif p95 > self.latency_target: # 응답 지연: 속도만 조금 줄임
+            rate, action = rate * self.decrease_latency, "감소(지연)"
+            self._decreased_at = time.monotonic()
+        else: # 정상: 조금씩 늘림
+            rate, inflight, action = rate + self.rate_step, inflight + 1, "증가"
+        self.bucket.rate = min(max(rate, self.min_rate), self.max_rate)
+        self.inflight = min(max(inflight, self.min_inflight), self.max_inflight)
+        self._cond.notify_all()
+        METRICS.inc("throttle_adjustments_total", action=action)
+        self._publish(p95)
+        logger.info(
+            f"[속도 조절] {action}: 초당 {self.bucket.rate:.2f}회 (요청 간격 {1 / self.bucket.rate:.2f}초), 동시 요청 {self.inflight}개 "
+            f"| p50 {p50:.2f}초, p95 {p95:.2f}초, 오류율 {errors:.0%}"
+        )
+
+    def _publish(self, p95=None):
+        """현재 상태를 게이지로 기록하는 함수"""
+        METRICS.set("throttle_rate", self.bucket.rate)
+        METRICS.set("throttle_inflight", self.inflight)
+        if p95 is not None:
+            METRICS.set("throttle_latency_p95_seconds", p95)
+
+
+class ConcurrentFetcher:
+    """
+    여러 요청을 동시에 진행하면서도 전역 속도 제한과 호스트별 동시성 제한을 지키는 수집 엔진.
+
+    진행 중인 요청은 최대 max_workers개로 유지되며, 결과는 작업을 넣은 순서대로 반환된다.
+    따라서 전체 수집 시간은 왕복 지연(latency)이 아닌 속도 제한(rate)에 의해 결정된다.
+
+    Args:
+        max_workers (int): 동시에 진행할 최대 요청 수.
+        rate (float): 전체 워커가 공유하는 초당 요청 수.
+        per_host (int): 호스트별 최대 동시 요청 수.
+        burst (float): 토큰 버킷의 최대 용량.
+        bucket (TokenBucket): 다른 수집 엔진과 공유할 토큰 버킷 (None이면 rate, burst로 새로 생성).
+        throttle (AdaptiveThrottle): 토큰 버킷의 속도와 동시 요청 수를 조절하는 속도 조절기 (None이면 고정 속도).
+    """
+
+    def __init__(self, max_workers, rate, per_host, burst=1, bucket=None, throttle=None):
+        self.max_workers = max_workers
+        self.bucket = throttle.bucket if throttle else bucket or TokenBucket(rate, burst)
+        self.hosts = HostLimiter(per_host)
+        self.throttle = throttle
+
+    def limit_rate(self, rate):
+        """초당 요청 수를 바꾸는 함수 (속도 조절기를 쓰면 상한만 바꿈)"""
+        if self.throttle:
+            self.throttle.limit_rate(rate)
+        else:
+            self.bucket.rate = rate
+
+    def _run(self, fn, url, task):
+        """호스트 슬롯과 토큰을 확보한 뒤 실제 요청 함수를 호출하는 함수"""
+        with self.hosts.get(url): # 호스트별 동시 요청 수 제한
+            if self.throttle is None:
+                self.bucket.acquire() # 전역 요청 속도 제한
+                return fn(*task)
+            with self.throttle: # 속도 조절기의 동시 요청 수 한도
+                self.bucket.acquire()
+                return fn(*task)
+
+    def fetch(self, fn, url, tasks):
+        """
+        작업 목록을 동시에 처리하고 (작업, 결과)를 입력 순서대로 내보내는 제너레이터.
+
+        Args:
+            fn (callable): 작업 튜플을 인자로 받아 요청을 수행하는 함수 (예: get_page_data).
+            url (str): 요청 대상 URL (호스트별 제한 판단에 사용).
+            tasks (iterable): fn에 전달할 인자 튜플의 목록.
+
+        Yields:
+            tuple: (작업 튜플, fn의 반환값).
+        """
+        window = deque() # 진행 중인 작업 대기열 (입력 순서 유지)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for task in tasks:
+                window.append((task, executor.submit(self._run, fn, url, task)))
+                if len(window) >= self.max_workers * 2: # 결과가 소비되지 않고 쌓이지 않도록 대기열 크기 제한
+                    task, future = window.popleft()
+                    yield task, future.result()
+            while window:
+                task, future = window.popleft()
+                yield task, future.result()
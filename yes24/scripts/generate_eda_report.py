@@ -3,10 +3,14 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import koreanize_matplotlib
 from loguru import logger
+from dataset import books_path
+from preprocess import load_preprocessed
+from aggregate import Aggregation, aggregate
 import os
 
 # 설정
-DATA_PATH = "yes24/data/raw/yes24_books.csv"
+DATA_PATH = books_path() # 파티션 데이터셋이 있으면 데이터셋 폴더, 없으면 기존 CSV
+COLUMNS = ['Title', 'Publisher', 'Price', 'Rating', 'Review Count'] # 리포트에 사용하는 열 (전처리 캐시에서 이 열만 읽음)
 IMG_DIR = "yes24/reports/images"
 os.makedirs(IMG_DIR, exist_ok=True)
 
@@ -15,24 +19,31 @@ logger.add("yes24/logs/eda.log")
 def load_data():
     logger.info("데이터 로드 중...")
     try:
-        df = pd.read_csv(DATA_PATH)
-        # 데이터 전처리: 쉼표 제거 및 숫자 변환
-        if df['Price'].dtype == object:
-            df['Price'] = df['Price'].astype(str).str.replace(',', '').astype(float)
-        
-        # Rating, Review Count도 확인
-        if df['Rating'].dtype == object:
-             df['Rating'] = pd.to_numeric(df['Rating'], errors='coerce')
-        
-        if df['Review Count'].dtype == object:
-            df['Review Count'] = df['Review Count'].astype(str).str.replace(',', '').astype(float)
-            
+        df = load_preprocessed(DATA_PATH, columns=COLUMNS) # 쉼표 제거 및 숫자 변환 (원본이 그대로면 캐시 사용)
         return df
     except Exception as e:
         logger.error(f"데이터 로드 실패: {e}")
         return None
 
-def generate_plots(df):
+# 보고서에 필요한 집계 선언 (aggregate()가 한 번에 계산)
+AGGREGATIONS = {
+    'summary': Aggregation(None, **{
+        'books': ('Price', 'size'),
+        'price_mean': ('Price', 'mean'), 'price_median': ('Price', 'median'),
+        'price_min': ('Price', 'min'), 'price_max': ('Price', 'max'),
+        'rating_mean': ('Rating', 'mean'), 'reviews_mean': ('Review Count', 'mean'),
+    }),
+    'publishers': Aggregation('Publisher', **{'books': ('Publisher', 'size')}),
+}
+
+def summarize(df):
+    """보고서용 요약 통계와 출판사별 도서 수(많은 순)를 계산하는 함수"""
+    results = aggregate(df, AGGREGATIONS)
+    publishers = results['publishers']['books'].sort_values(ascending=False, kind='stable')
+    summary = {name: column.iloc[0] for name, column in results['summary'].items()} # 열별 타입 유지 (도서 수는 정수)
+    return summary, publishers
+
+def generate_plots(df, publishers):
     logger.info("시각화 생성 중...")
     
     # 1. 가격 분포
@@ -54,9 +65,9 @@ def generate_plots(df):
     plt.close()
     
     # 3. 상위 10개 출판사
-    top_publishers = df['Publisher'].value_counts().head(10)
+    top_publishers = publishers.head(10)
     plt.figure(figsize=(12, 6))
-    sns.barplot(x=top_publishers.values, y=top_publishers.index, palette='viridis')
+    sns.barplot(x=top_publishers.values, y=top_publishers.index.astype(str), palette='viridis')
     plt.title('상위 10개 출판사 (도서 수 기준)')
     plt.xlabel('도서 수')
     plt.savefig(f"{IMG_DIR}/top_publishers.png")
@@ -71,26 +82,26 @@ def generate_plots(df):
     plt.savefig(f"{IMG_DIR}/price_vs_rating.png")
     plt.close()
 
-def save_report(df):
+def save_report(df, summary, publishers):
     report_path = "yes24/agent_eda.md"
     
     with open(report_path, "w", encoding="utf-8") as f:
         f.write("# Yes24 도서 데이터 분석 보고서\n\n")
         f.write(f"**생성 일자:** {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M')}\n")
-        f.write(f"**데이터 소스:** `yes24/data/raw/yes24_books.csv`\n\n")
+        f.write(f"**데이터 소스:** `{DATA_PATH}`\n\n")
         
         f.write("## 1. 데이터 요약\n")
-        f.write(f"- **총 도서 수:** {len(df):,}권\n")
-        f.write(f"- **평균 가격:** {df['Price'].mean():,.0f}원\n")
-        f.write(f"- **중앙 가격:** {df['Price'].median():,.0f}원\n")
-        f.write(f"- **최고 가격:** {df['Price'].max():,.0f}원\n")
-        f.write(f"- **최저 가격:** {df['Price'].min():,.0f}원\n")
-        f.write(f"- **평균 평점:** {df['Rating'].mean():.2f}점\n")
-        f.write(f"- **평균 리뷰 수:** {df['Review Count'].mean():.1f}개\n\n")
+        f.write(f"- **총 도서 수:** {summary['books']:,}권\n")
+        f.write(f"- **평균 가격:** {summary['price_mean']:,.0f}원\n")
+        f.write(f"- **중앙 가격:** {summary['price_median']:,.0f}원\n")
+        f.write(f"- **최고 가격:** {summary['price_max']:,.0f}원\n")
+        f.write(f"- **최저 가격:** {summary['price_min']:,.0f}원\n")
+        f.write(f"- **평균 평점:** {summary['rating_mean']:.2f}점\n")
+        f.write(f"- **평균 리뷰 수:** {summary['reviews_mean']:.1f}개\n\n")
         
         f.write("## 2. 주요 통계\n")
         f.write("### 상위 5개 출판사 (도서 수 기준)\n")
-        for pub, count in df['Publisher'].value_counts().head(5).items():
+        for pub, count in publishers.head(5).items():
             f.write(f"- {pub}: {count}권\n")
         f.write("\n")
 
@@ -101,7 +112,7 @@ def save_report(df):
         
         f.write("### 리뷰가 가장 많은 도서 Top 3\n")
         for _, row in df.nlargest(3, 'Review Count').iterrows():
-            f.write(f"- **{row['Title']}**: {row['Review Count']:,}개\n")
+            f.write(f"- **{row['Title']}**: {row['Review Count']:,.0f}개\n")
         f.write("\n")
         
         f.write("## 3. 시각화\n")
@@ -122,8 +133,9 @@ def save_report(df):
 def main():
     df = load_data()
     if df is not None:
-        generate_plots(df)
-        save_report(df) # 변경된 부분
+        summary, publishers = summarize(df)
+        generate_plots(df, publishers)
+        save_report(df, summary, publishers) # 변경된 부분
         logger.info("분석 완료")
 
 if __name__ == "__main__":
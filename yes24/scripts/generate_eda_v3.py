@@ -1,22 +1,112 @@
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib import font_manager
 import seaborn as sns
 import koreanize_matplotlib
 from loguru import logger
+from dataset import books_path
+from preprocess import load_preprocessed, price_range, rating_range
+from terms import title_term_counts
+from aggregate import Aggregation, PartialAggregate, aggregate
+from outofcore import MEMORY_MB, StreamingProfile, chunk_rows_for_budget, iter_preprocessed
+from sketches import Histogram
+from snapshots import SNAPSHOT_DIR, SnapshotStore, snapshot_changes
+from entities import author_table
+from metrics import METRICS, peak_rss_bytes, set_max, span
+from catalog import CATALOG_DB, CatalogIndex
 import os
-import re
+import time
+import json
+import hashlib
+import inspect
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from wordcloud import WordCloud
 from io import StringIO
 import numpy as np
 
 # 설정
-DATA_PATH = "yes24/data/raw/yes24_books.csv"
+DATA_PATH = books_path() # 파티션 데이터셋이 있으면 데이터셋 폴더, 없으면 기존 CSV
 REPORT_PATH = "yes24/eda_result_v3.md"
 IMG_DIR = "yes24/images"
 os.makedirs(IMG_DIR, exist_ok=True)
 
+# 렌더링 프로필
+# - full: 보고서용 고해상도 이미지 (KDE 곡선 포함)
+# - draft: 빠른 확인용 (낮은 해상도, 행 수가 kde_max_rows를 넘으면 KDE 대신 구간 히스토그램, 그래프 요소 래스터화)
+RENDER_PROFILES = {
+    'full': {'dpi': 300, 'kde_max_rows': None, 'bins': 'auto', 'rasterized': False},
+    'draft': {'dpi': 100, 'kde_max_rows': 50_000, 'bins': 50, 'rasterized': True},
+}
+
+NODE_STATE_PATH = "yes24/data/processed/eda_nodes.json" # 시각화/피봇 테이블별 입력 지문 기록 파일
+
+# 대용량(out-of-core) 모드 설정
+OUT_OF_CORE_BINS = 50 # 히스토그램 구간 수 ('auto' 구간은 전체 데이터가 필요하므로 고정 구간 사용)
+HEATMAP_COLUMNS = ['Price', 'Rating', 'Review Count', 'Year'] # 상관계수 히트맵에 사용하는 열
+TRACKED_KEYS = ['Author Name'] # 1차 읽기에서 빈도 상위 값을 추적할 파생 그룹 기준 (2차 읽기에서 이 값만 집계하여 그룹 수 제한)
+PIVOT_MIN_COUNTS = {'top_authors': 5} # 피봇 테이블별로 후처리에서 남기는 최소 그룹 크기 (이 빈도 이상인 후보 값만 집계)
+
+# 워드 클라우드 설정
+WORDCLOUD_MAX_WORDS = 200 # 표시할 최대 단어 수
+TITLE_MORPHEMES = False # True면 형태소 분석(kiwipiepy)으로 제목에서 명사만 추출
+FONT_CANDIDATES = [ # 운영체제별 기본 한글 폰트 (EDA_FONT_PATH 환경 변수로 지정 가능)
+    'C:/Windows/Fonts/malgun.ttf',
+    '/System/Library/Fonts/AppleSDGothicNeo.ttc',
+    '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
+]
+
 logger.add("yes24/logs/eda_v3.log")
 
+class NodeCache:
+    """
+    시각화와 피봇 테이블을 입력 지문(fingerprint)으로 추적하여 바뀐 것만 다시 만들게 하는 캐시.
+
+    지문은 생성 함수의 소스 코드, 매개변수, 사용하는 열의 내용 해시로 계산하므로,
+    데이터나 코드가 바뀌지 않은 항목은 이전 결과(이미지 파일, 표)를 그대로 재사용한다.
+
+    Args:
+        df (pd.DataFrame): 분석할 데이터프레임 (열별 내용 해시 계산용, None이면 지문 기록만 읽고 고칠 때 사용).
+        path (str): 지문 기록 파일 경로.
+    """
+
+    def __init__(self, df, path=NODE_STATE_PATH):
+        self.path = path
+        self.state = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.state = json.load(f)
+        # 열별 내용 해시는 한 번만 계산하여 여러 항목의 지문에 재사용
+        self.columns = {
+            column: hashlib.sha1(pd.util.hash_pandas_object(df[column], index=False).to_numpy().tobytes()).hexdigest()
+            for column in (df.columns if df is not None else [])
+        }
+
+    def fingerprint(self, fn, columns, params=None):
+        """생성 함수의 소스 코드, 매개변수, 입력 열 내용으로 지문을 계산하는 함수"""
+        payload = json.dumps([inspect.getsource(fn), params, [(c, self.columns[c]) for c in columns]], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key, fingerprint):
+        """지문이 같으면 저장된 결과를 반환하는 함수 (없거나 바뀌었으면 None)"""
+        node = self.state.get(key)
+        return node["output"] if node and node["fingerprint"] == fingerprint else None
+
+    def set(self, key, fingerprint, output):
+        self.state[key] = {"fingerprint": fingerprint, "output": output}
+
+    def discard(self, keys):
+        """다른 방법으로 결과 파일을 덮어쓴 항목의 지문을 지우는 함수 (다음 실행에서 다시 생성)"""
+        for key in keys:
+            self.state.pop(key, None)
+
+    def save(self):
+        """지문 기록을 파일로 교체 저장하는 함수"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(self.path + ".tmp", self.path)
+
 def load_and_preprocess():
     """
     CSV 파일에서 데이터를 로드하고 분석에 필요한 전처리를 수행하는 함수.
@@ -33,33 +123,10 @@ def load_and_preprocess():
     """
     logger.info("데이터 로드 및 전처리 시작...")
     try:
-        df = pd.read_csv(DATA_PATH)
-        
-        # 1. 숫자형 변환 (Price, Review Count, Rating)
-        def clean_currency(x):
-            """문자열에서 숫자와 소수점만 추출하여 float로 변환"""
-            if isinstance(x, str):
-                return float(re.sub(r'[^\d.]', '', x))
-            return float(x)
-
-        df['Price'] = df['Price'].apply(clean_currency)
-        df['Review Count'] = df['Review Count'].apply(clean_currency)
-        df['Rating'] = pd.to_numeric(df['Rating'], errors='coerce')
-        
-        # 2. 날짜 파싱 (Publish Date)
-        # 예: "2025년 11월" -> Year: 2025, Month: 11
-        def parse_date(x):
-            """'YYYY년 MM월' 형식의 문자열에서 연도와 월을 추출"""
-            match = re.search(r'(\d{4})년\s*(\d{1,2})월', str(x))
-            if match:
-                return int(match.group(1)), int(match.group(2))
-            return None, None
-
-        df['Year'], df['Month'] = zip(*df['Publish Date'].apply(parse_date))
-        
-        # 날짜 정렬용 컬럼 (NaN 값을 0으로 채우고 정수형 변환)
-        df['Year'] = df['Year'].fillna(0).astype(int)
-        df['Month'] = df['Month'].fillna(0).astype(int)
+        # 숫자형 변환(Price, Review Count, Rating)과 출판 연월(Year, Month) 추출을 열 단위 연산으로 수행
+        # (원본 데이터와 전처리 버전이 같으면 이전 실행의 전처리 캐시를 그대로 사용)
+        with span('preprocess'):
+            df = load_preprocessed(DATA_PATH)
         
         logger.info(f"데이터 로드 완료: {len(df)}행")
         return df
@@ -67,12 +134,13 @@ def load_and_preprocess():
         logger.error(f"데이터 로드/전처리 실패: {e}")
         return None
 
-def save_plot(filename):
+def save_plot(filename, dpi=300):
     """
     현재 matplotlib figure를 이미지 파일로 저장하는 유틸리티 함수.
 
     Args:
         filename (str): 저장할 이미지 파일명 (확장자 포함).
+        dpi (int): 저장 해상도.
 
     Returns:
         str: 저장된 이미지의 상대 경로 (Markdown 보고서 삽입용).
@@ -80,99 +148,262 @@ def save_plot(filename):
     """
     path = os.path.join(IMG_DIR, filename)
     plt.tight_layout()
-    plt.savefig(path, dpi=300)
+    plt.savefig(path, dpi=dpi)
     plt.close()
     return path.replace("\\", "/")
 
-def analyze_and_visualize(df):
-    """
-    전처리된 데이터를 바탕으로 다양한 탐색적 데이터 분석(EDA) 시각화를 수행하고 이미지를 저장하는 함수.
-
-    수행하는 시각화:
-    1. 수치형 데이터 분포 (가격, 평점, 리뷰 수) 히스토그램
-    2. 상위 20개 출판사 바 차트
-    3. 연도별/월별 도서 발행 트렌드 (라인/바 차트)
-    4. 주요 변수 간 상관관계 히트맵
-    5. 도서 제목 워드 클라우드
+def use_kde(data, profile):
+    """렌더링 프로필 기준으로 KDE 곡선을 그릴지 결정하는 함수 (대용량 데이터는 구간 히스토그램만 사용)"""
+    return profile['kde_max_rows'] is None or len(data) <= profile['kde_max_rows']
 
-    Args:
-        df (pd.DataFrame): 분석할 데이터프레임.
-
-    Returns:
-        dict: 생성된 이미지의 경로를 담은 딕셔너리. 
-              Key는 시각화 유형(예: 'numeric_dist'), Value는 이미지 경로.
-    """
-    image_paths = {}
-    
-    # --- 1. 수치형 데이터 분포 (히스토그램) ---
-    logger.info("수치형 데이터 시각화 중...")
+def plot_numeric_distribution(data, profile):
+    """수치형 데이터 분포 (가격, 평점, 리뷰 수) 히스토그램"""
     fig, axes = plt.subplots(1, 3, figsize=(18, 5))
+    kde = use_kde(data, profile)
     
-    sns.histplot(df['Price'], kde=True, ax=axes[0], color='skyblue')
+    sns.histplot(data['Price'], kde=kde, ax=axes[0], color='skyblue', bins=profile['bins'], rasterized=profile['rasterized'])
     axes[0].set_title('가격 분포')
     
-    sns.histplot(df['Rating'], kde=True, ax=axes[1], color='orange', bins=20)
+    sns.histplot(data['Rating'], kde=kde, ax=axes[1], color='orange', bins=20, rasterized=profile['rasterized'])
     axes[1].set_title('평점 분포')
     
-    sns.histplot(df[df['Review Count'] < 500]['Review Count'], kde=True, ax=axes[2], color='green') # Outlier 제외 시각화
+    reviews = data.loc[data['Review Count'] < 500, 'Review Count'] # Outlier 제외 시각화
+    sns.histplot(reviews, kde=kde, ax=axes[2], color='green', bins=profile['bins'], rasterized=profile['rasterized'])
     axes[2].set_title('리뷰 수 분포 (500개 미만)')
-    
-    image_paths['numeric_dist'] = save_plot('numeric_distribution.png')
-    
-    # --- 2. 출판사 분석 (상위 20개) ---
-    logger.info("출판사 분석 중...")
-    top_publishers = df['Publisher'].value_counts().head(20)
+
+def plot_numeric_histograms(hists, profile):
+    """수치형 데이터 분포 히스토그램 (hists: 열 이름 -> 조각별로 누적한 Histogram, 대용량 모드용)"""
+    fig, axes = plt.subplots(1, 3, figsize=(18, 5))
+    panels = [('Price', 'skyblue', '가격 분포'), ('Rating', 'orange', '평점 분포'), ('Review Count', 'green', '리뷰 수 분포 (500개 미만)')]
+    for ax, (column, color, title) in zip(axes, panels):
+        hist = hists[column]
+        sns.histplot(x=hist.edges[:-1], weights=hist.counts, bins=len(hist.counts), binrange=(hist.edges[0], hist.edges[-1]), ax=ax, color=color, rasterized=profile['rasterized'])
+        ax.set_xlabel(column)
+        ax.set_title(title)
+
+def plot_top_publishers(data, profile):
+    """상위 20개 출판사 바 차트"""
+    draw_top_publishers(data['Publisher'].value_counts().head(20), profile)
+
+def draw_top_publishers(top_publishers, profile):
+    """출판사별 도서 수(상위 20개) Series로 바 차트를 그리는 함수"""
     plt.figure(figsize=(12, 8))
-    sns.barplot(x=top_publishers.values, y=top_publishers.index, hue=top_publishers.index, legend=False, palette='viridis')
+    sns.barplot(x=top_publishers.values, y=top_publishers.index.astype(str), hue=top_publishers.index.astype(str), legend=False, palette='viridis')
     plt.title('상위 20개 출판사 (도서 수 기준)')
-    image_paths['top_publishers'] = save_plot('top_20_publishers.png')
-    
-    # --- 3. 발행 트렌드 (연도별, 월별) ---
-    logger.info("발행 트렌드 분석 중...")
+
+def plot_trend(data, profile):
+    """연도별/월별 도서 발행 트렌드 (라인/바 차트)"""
+    draw_trend((data['Year'].value_counts(), data['Month'].value_counts()), profile)
+
+def draw_trend(counts, profile):
+    """(연도별 도서 수, 월별 도서 수) Series로 발행 트렌드를 그리는 함수 (0은 알 수 없는 값으로 제외)"""
     fig, axes = plt.subplots(1, 2, figsize=(15, 6))
+    year_counts, month_counts = (c[c.index > 0].sort_index() for c in counts)
     
-    year_counts = df[df['Year'] > 0]['Year'].value_counts().sort_index()
-    sns.lineplot(x=year_counts.index, y=year_counts.values, marker='o', ax=axes[0])
+    sns.lineplot(x=year_counts.index, y=year_counts.values, marker='o', ax=axes[0], rasterized=profile['rasterized'])
     axes[0].set_title('연도별 도서 발행 추이')
     axes[0].set_xticks(year_counts.index)
     
-    month_counts = df[df['Month'] > 0]['Month'].value_counts().sort_index()
     sns.barplot(x=month_counts.index, y=month_counts.values, hue=month_counts.index, legend=False, ax=axes[1], palette='coolwarm')
     axes[1].set_title('월별 도서 발행 빈도')
-    
-    image_paths['trend'] = save_plot('publishing_trend.png')
-    
-    # --- 4. 상관 관계 분석 (히트맵) ---
-    logger.info("상관 관계 분석 중...")
-    corr_cols = ['Price', 'Rating', 'Review Count', 'Year']
-    corr_matrix = df[corr_cols].corr()
-    
+
+def plot_heatmap(data, profile):
+    """주요 변수 간 상관관계 히트맵"""
+    draw_heatmap(data.corr(), profile)
+
+def draw_heatmap(corr_matrix, profile):
+    """상관계수 행렬로 히트맵을 그리는 함수"""
     plt.figure(figsize=(8, 6))
-    sns.heatmap(corr_matrix, annot=True, cmap='RdBu_r', fmt='.2f', vmin=-1, vmax=1)
+    sns.heatmap(corr_matrix, annot=True, cmap='RdBu_r', fmt='.2f', vmin=-1, vmax=1, rasterized=profile['rasterized'])
     plt.title('주요 변수 간 상관 관계')
-    image_paths['heatmap'] = save_plot('correlation_heatmap.png')
-    
-    # --- 5. 워드 클라우드 ---
-    logger.info("워드 클라우드 생성 중...")
-    # 간단한 토큰화: 공백 기준 분리 및 특수문자 제거
-    text = ' '.join(df['Title'].astype(str))
+
+def resolve_font():
+    """
+    워드 클라우드에 사용할 한글 폰트 경로를 찾는 함수.
+
+    EDA_FONT_PATH 환경 변수, 운영체제별 기본 한글 폰트 순으로 찾고, 모두 없으면
+    koreanize_matplotlib이 matplotlib에 등록한 나눔고딕 폰트를 사용한다 (운영체제와 무관하게 동작).
+
+    Returns:
+        str: 폰트 파일 경로.
+    """
+    for path in [os.environ.get('EDA_FONT_PATH'), *FONT_CANDIDATES]:
+        if path and os.path.exists(path):
+            return path
+    return font_manager.findfont(font_manager.FontProperties(family=plt.rcParams['font.family']))
+
+def title_frequencies(df, morphemes=False):
+    """워드 클라우드용 제목 단어 빈도표 (원본 파일별로 저장된 빈도표를 합쳐 새로 추가된 파일만 집계)"""
+    return title_term_counts(DATA_PATH, morphemes=morphemes)
+
+def plot_wordcloud(data, profile):
+    """도서 제목 워드 클라우드 (data: 제목 단어 빈도표 TermCounts)"""
     # 불용어 처리 (간단하게)
     stopwords = {'의', '를', '에', '가', '은', '는', '이', '것', '등', '위한', '따라', '만들기', '활용', '활용법', '입문', '가이드', '실무', '기초', '완벽', '배우기', '무작정', '따라하기'}
+    frequencies = dict(data.most_common(WORDCLOUD_MAX_WORDS, stopwords=stopwords))
     
-    wc = WordCloud(font_path='C:/Windows/Fonts/malgun.ttf', # 윈도우 기본 폰트
+    wc = WordCloud(font_path=resolve_font(),
                    background_color='white',
                    width=800, height=600,
-                   stopwords=stopwords).generate(text)
+                   max_words=WORDCLOUD_MAX_WORDS).generate_from_frequencies(frequencies)
     
     plt.figure(figsize=(10, 8))
     plt.imshow(wc, interpolation='bilinear')
     plt.axis('off')
     plt.title('도서 제목 워드 클라우드')
-    image_paths['wordcloud'] = save_plot('title_wordcloud.png')
+
+# 시각화 목록: (보고서 키, 파일명, 그리기 함수, 사용하는 열)
+FIGURES = [
+    ('numeric_dist', 'numeric_distribution.png', plot_numeric_distribution, ['Price', 'Rating', 'Review Count']),
+    ('top_publishers', 'top_20_publishers.png', plot_top_publishers, ['Publisher']),
+    ('trend', 'publishing_trend.png', plot_trend, ['Year', 'Month']),
+    ('heatmap', 'correlation_heatmap.png', plot_heatmap, HEATMAP_COLUMNS),
+    ('wordcloud', 'title_wordcloud.png', plot_wordcloud, ['Title']),
+]
+
+# 열 대신 별도로 준비한 입력을 받는 시각화: 보고서 키 -> (입력 준비 함수, 준비 함수 옵션)
+FIGURE_INPUTS = {
+    'wordcloud': (title_frequencies, {'morphemes': TITLE_MORPHEMES}),
+}
+
+def init_render_worker():
+    """렌더링 작업 프로세스 초기화 함수 (화면 없이 파일로만 그리는 Agg 백엔드 사용)"""
+    plt.switch_backend('Agg')
+
+def render_figure(job):
+    """
+    하나의 시각화를 그려 이미지 파일로 저장하는 함수 (작업 프로세스에서 실행).
+
+    Args:
+        job (tuple): (파일명, 그리기 함수, 사용할 열만 담은 DataFrame 또는 준비된 입력, 렌더링 프로필).
+
+    Returns:
+        tuple: (저장된 이미지 경로, 시작 시각, 소요 시간(초), 프로세스 id, 프로세스 최대 메모리(바이트)).
+            작업 프로세스의 지표는 주 프로세스에 남지 않으므로 측정값을 함께 반환한다.
+    """
+    filename, plot, data, profile = job
+    started, start = time.time(), time.perf_counter()
+    plot(data, profile)
+    path = save_plot(filename, dpi=profile['dpi'])
+    seconds = time.perf_counter() - start
+    logger.info(f"{filename} 렌더링 완료 ({seconds:.2f}초)")
+    return path, started, seconds, os.getpid(), peak_rss_bytes()
+
+def render_jobs(jobs, workers=None):
+    """
+    렌더링 작업 목록을 프로세스 풀에서 실행하는 함수.
+
+    Args:
+        jobs (list): render_figure()가 받는 작업 튜플 리스트.
+        workers (int): 렌더링 프로세스 수 (None이면 작업 수와 CPU 수 중 작은 값, 1이면 현재 프로세스에서 순서대로 실행).
+
+    Returns:
+        list: 작업 순서대로 저장된 이미지 경로.
+    """
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    if workers == 1:
+        results = [render_figure(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_render_worker) as pool:
+            results = list(pool.map(render_figure, jobs))
+    for (filename, *_), (path, started, seconds, pid, rss) in zip(jobs, results):
+        METRICS.record_span('plot', started, seconds, pid=pid, figure=filename)
+        set_max('peak_rss_bytes', rss, process='main' if pid == os.getpid() else 'render_worker')
+    return [path for path, *_ in results]
+
+def analyze_and_visualize(df, profile='full', workers=None, nodes=None):
+    """
+    전처리된 데이터를 바탕으로 다양한 탐색적 데이터 분석(EDA) 시각화를 수행하고 이미지를 저장하는 함수.
+
+    수행하는 시각화:
+    1. 수치형 데이터 분포 (가격, 평점, 리뷰 수) 히스토그램
+    2. 상위 20개 출판사 바 차트
+    3. 연도별/월별 도서 발행 트렌드 (라인/바 차트)
+    4. 주요 변수 간 상관관계 히트맵
+    5. 도서 제목 워드 클라우드
+
+    matplotlib은 스레드 안전하지 않으므로 각 시각화는 별도 프로세스에서 그리며,
+    작업 프로세스에는 해당 시각화에 필요한 열만 전달한다.
+
+    Args:
+        df (pd.DataFrame): 분석할 데이터프레임.
+        profile (str): 렌더링 프로필 ('full' 또는 'draft', RENDER_PROFILES 참고).
+        workers (int): 렌더링 프로세스 수 (None이면 시각화 수와 CPU 수 중 작은 값, 1이면 현재 프로세스에서 순서대로 실행).
+        nodes (NodeCache): 입력이 바뀌지 않은 이미지를 다시 그리지 않기 위한 캐시 (None이면 모두 그림).
+
+    Returns:
+        dict: 생성된 이미지의 경로를 담은 딕셔너리. 
+              Key는 시각화 유형(예: 'numeric_dist'), Value는 이미지 경로.
+    """
+    logger.info(f"시각화 생성 중... (프로필: {profile})")
+    settings = RENDER_PROFILES[profile]
+    image_paths, pending, jobs = {}, [], []
+    for key, filename, plot, columns in FIGURES:
+        prepare, options = FIGURE_INPUTS.get(key, (None, None))
+        fingerprint = nodes.fingerprint(plot, columns, [filename, settings, options]) if nodes else None
+        cached = nodes.get(key, fingerprint) if nodes else None
+        if cached is not None and os.path.exists(cached):
+            image_paths[key] = cached # 입력이 바뀌지 않았으므로 기존 이미지 재사용
+            continue
+        pending.append((key, fingerprint))
+        jobs.append((filename, plot, prepare(df, **options) if prepare else df[columns], settings))
+    logger.info(f"시각화 {len(FIGURES)}개 중 {len(jobs)}개 렌더링, {len(FIGURES) - len(jobs)}개 재사용")
+    if not jobs:
+        return image_paths
     
+    for (key, fingerprint), path in zip(pending, render_jobs(jobs, workers)):
+        image_paths[key] = path
+        if nodes:
+            nodes.set(key, fingerprint, path)
     return image_paths
 
-def generate_pivot_tables(df):
+def pivot_publisher_price(table):
+    """상위 10개 출판사별 평균 가격 및 리뷰 수"""
+    return table.nlargest(10, 'Book Count')[['Price', 'Review Count']].sort_values('Price', ascending=False)
+
+def pivot_year_rating(table):
+    """연도별 평균 평점 및 도서 수"""
+    return table[table.index > 0]
+
+def pivot_price_range(table):
+    """가격대별(1만원 단위) 평점 및 리뷰 분석"""
+    return table[table['Book Count'] > 5] # 표본 적은 구간 제외
+
+def pivot_rating_range(table):
+    """평점 구간별(9점대, 8점대...) 평균 가격 및 리뷰 수"""
+    return table[table.index > 0]
+
+def pivot_top_authors(table):
+    """상위 저자별(5권 이상 집필) 평균 평점 Top 10"""
+    return table[table['Book Count'] >= PIVOT_MIN_COUNTS['top_authors']][['Rating', 'Review Count']].sort_values('Rating', ascending=False).head(10)
+
+# 파생 그룹 기준 (입력 DataFrame에 열을 추가하지 않고 집계 시에만 계산)
+DERIVED_KEYS = {
+    'Price Range': lambda df: price_range(df['Price']),
+    'Rating Range': lambda df: rating_range(df['Rating']),
+    'Author Name': lambda df: author_table(df['Author']), # 도서-저자 다대다 연결 (공저 도서는 저자마다 집계, 역자 등 제외)
+}
+
+# 피봇 테이블 목록: (보고서 키, 테이블 제목, 후처리 함수, 집계 선언)
+PIVOTS = [
+    ('publisher_price', "상위 10개 출판사별 평균 가격 및 리뷰 수", pivot_publisher_price,
+     Aggregation('Publisher', **{'Book Count': ('Publisher', 'size'), 'Price': ('Price', 'mean'), 'Review Count': ('Review Count', 'mean')})),
+    ('year_rating', "연도별 평균 평점 및 도서 수", pivot_year_rating,
+     Aggregation('Year', **{'Rating': ('Rating', 'mean'), 'Book Count': ('Title', 'count')})),
+    ('price_range', "가격대별(1만원 단위) 평점 및 리뷰 분석", pivot_price_range,
+     Aggregation('Price Range', **{'Avg Rating': ('Rating', 'mean'), 'Book Count': ('Rating', 'count'), 'Avg Reviews': ('Review Count', 'mean')})),
+    ('rating_range', "평점 구간별 평균 가격 및 리뷰 수", pivot_rating_range,
+     Aggregation('Rating Range', **{'Price': ('Price', 'mean'), 'Review Count': ('Review Count', 'mean')})),
+    ('top_authors', "다작 저자(5권 이상)의 평균 평점 Top 10", pivot_top_authors,
+     Aggregation('Author Name', **{'Book Count': ('Author', 'size'), 'Rating': ('Rating', 'mean'), 'Review Count': ('Review Count', 'mean')})),
+]
+
+def input_columns(spec):
+    """집계 선언이 읽는 원본 열 목록 (파생 그룹 기준은 그 계산에 쓰이는 열로 대체)"""
+    by = {'Price Range': 'Price', 'Rating Range': 'Rating', 'Author Name': 'Author'}.get(spec.by, spec.by)
+    return sorted({by, *(column for column, _ in spec.metrics.values())})
+
+def generate_pivot_tables(df, nodes=None, catalog=None):
     """
     데이터프레임을 사용하여 다양한 관점의 피봇 테이블 및 교차표를 생성하는 함수.
 
@@ -183,52 +414,222 @@ def generate_pivot_tables(df):
     4. 평점 구간별 평균 가격 및 리뷰 수
     5. 다작 저자(5권 이상)의 평균 평점 Top 10
 
+    각 테이블은 집계 선언(Aggregation)으로 정의되며, 다시 계산해야 하는 테이블의 집계를 모아
+    aggregate()로 그룹 기준별 한 번씩만 계산한 뒤 테이블별 후처리(상위 N개, 정렬 등)를 적용한다.
+    분석 색인이 주어지면 같은 집계를 DataFrame 대신 SQL 집계로 계산한다.
+
     Args:
-        df (pd.DataFrame): 분석할 데이터프레임.
+        df (pd.DataFrame): 분석할 데이터프레임 (변경하지 않음).
+        nodes (NodeCache): 입력이 바뀌지 않은 테이블을 재사용할 캐시 (None이면 모두 계산).
+        catalog (CatalogIndex): 집계를 SQL로 계산할 분석 색인 (None이면 df로 계산).
 
     Returns:
-        list: (테이블 제목, DataFrame) 튜플의 리스트.
+        list: (테이블 제목, Markdown 표 문자열) 튜플의 리스트.
     """
-    pivots = []
-    
-    # 1. 출판사별 평균 가격 (상위 10개 출판사)
-    top10_pubs = df['Publisher'].value_counts().head(10).index
-    pivot1 = df[df['Publisher'].isin(top10_pubs)].groupby('Publisher')[['Price', 'Review Count']].mean().sort_values('Price', ascending=False)
-    pivots.append(("상위 10개 출판사별 평균 가격 및 리뷰 수", pivot1))
-    
-    # 2. 연도별 평균 평점 및 도서 수
-    pivot2 = df[df['Year'] > 0].groupby('Year').agg({'Rating': 'mean', 'Title': 'count'}).rename(columns={'Title': 'Book Count'})
-    pivots.append(("연도별 평균 평점 및 도서 수", pivot2))
-    
-    # 3. 가격대별(1만원 단위) 평점 평균
-    df['Price Range'] = (df['Price'] // 10000) * 10000
-    pivot3 = df.groupby('Price Range').agg({'Rating': ['mean', 'count'], 'Review Count': 'mean'})
-    pivot3.columns = ['Avg Rating', 'Book Count', 'Avg Reviews']
-    pivot3 = pivot3[pivot3['Book Count'] > 5] # 표본 적은 구간 제외
-    pivots.append(("가격대별(1만원 단위) 평점 및 리뷰 분석", pivot3))
+    tables, pending = {}, {}
+    for key, title, finish, spec in PIVOTS:
+        fingerprint = nodes.fingerprint(finish, input_columns(spec), repr(spec)) if nodes else None
+        cached = nodes.get(key, fingerprint) if nodes else None
+        if cached is None:
+            pending[key] = (fingerprint, spec)
+        else:
+            tables[key] = cached
     
-    # 4. 평점 구간별(9점대, 8점대...) 평균 가격
-    df['Rating Range'] = df['Rating'].apply(lambda x: int(x) if pd.notnull(x) else 0)
-    pivot4 = df[df['Rating Range'] > 0].groupby('Rating Range')[['Price', 'Review Count']].mean()
-    pivots.append(("평점 구간별 평균 가격 및 리뷰 수", pivot4))
+    if pending:
+        specs = {key: spec for key, (_, spec) in pending.items()}
+        with span('pivot_aggregate'):
+            results = catalog.aggregate(specs) if catalog else aggregate(df, specs, derived=DERIVED_KEYS)
+        finishers = {key: finish for key, _, finish, _ in PIVOTS}
+        for key, (fingerprint, _) in pending.items():
+            with span('pivot', pivot=key):
+                tables[key] = finishers[key](results[key]).to_markdown(floatfmt=".2f")
+            if nodes:
+                nodes.set(key, fingerprint, tables[key])
+    return [(title, tables[key]) for key, title, _, _ in PIVOTS]
+
+def snapshot_trend(root=SNAPSHOT_DIR):
+    """
+    스냅샷 저장소의 변경 이력으로 수집 날짜별 가격/리뷰/판매지수 변화 추이 표를 만드는 함수.
+
+    스냅샷은 값이 바뀐 도서만 기록되므로, 날짜별 행 수가 곧 새로 수집되었거나 지표가 바뀐 도서 수다.
+
+    Returns:
+        tuple: (테이블 제목, Markdown 표 문자열). 스냅샷이 없으면 None.
+    """
+    if not os.path.exists(os.path.join(root, "index.sqlite")):
+        return None
+    store = SnapshotStore(root)
+    try:
+        df = snapshot_changes(store.read(['Price', 'Review Count', 'Sales Index']))
+    finally:
+        store.close()
+    if df.empty:
+        return None
+    df['Crawl Date'] = df['Crawled At'].dt.strftime('%Y-%m-%d')
+    changed = df[~df['First Seen']]
+    trend = pd.DataFrame({
+        'New Books': df.groupby('Crawl Date')['First Seen'].sum(),
+        'Changed Books': changed.groupby('Crawl Date').size(),
+        'Price Changes': changed['Price Change'].ne(0).groupby(changed['Crawl Date']).sum(),
+        'Avg Price Change': changed.groupby('Crawl Date')['Price Change'].mean(),
+        'Review Increase': changed.groupby('Crawl Date')['Review Count Change'].sum(),
+        'Sales Index Change': changed.groupby('Crawl Date')['Sales Index Change'].sum(),
+    }).fillna(0)
+    floatfmt = ['', '.0f', '.0f', '.0f', '.2f', '.0f', '.0f'] # 평균 가격 변화만 소수점 표시
+    return ("수집 날짜별 가격/리뷰/판매지수 변화 추이 (스냅샷)", trend.to_markdown(floatfmt=floatfmt))
+
+def histogram_edges(stats, column, bins, upper=None):
+    """1차 읽기에서 구한 최솟값/최댓값으로 고정 구간 경계를 만드는 함수 (upper: 구간 상한)"""
+    moments = stats.numeric[column][0]
+    low, high = (moments.min, moments.max if upper is None else min(moments.max, upper)) if moments.n else (0, 1)
+    if high <= low:
+        low, high = low - 0.5, high + 0.5
+    return np.linspace(low, high, bins + 1)
+
+def stream_statistics(chunk_rows):
+    """
+    데이터를 조각으로 나누어 한 번 읽으며 기술 통계, 빈도, 상관계수를 스케치로 누적하는 함수 (대용량 모드 1차 읽기).
+
+    Args:
+        chunk_rows (int): 한 번에 읽을 행 수.
+
+    Returns:
+        StreamingProfile: 누적된 프로파일.
+    """
+    stats = StreamingProfile(counted=['Year', 'Month'], correlated=HEATMAP_COLUMNS, derived={key: DERIVED_KEYS[key] for key in TRACKED_KEYS})
+    for chunk in iter_preprocessed(DATA_PATH, chunk_rows):
+        stats.update(chunk)
+    logger.info(f"1차 읽기 완료: {stats.rows}행, 조각 {stats.chunks}개")
+    return stats
+
+def restrict_key(fn, keep):
+    """파생 그룹 기준 함수가 keep에 있는 값(의 도서-값 연결)만 반환하도록 감싸는 함수"""
+    def key(df):
+        values = fn(df)
+        return values[values.isin(keep)]
+    return key
+
+def stream_details(stats, settings, chunk_rows, catalog=None):
+    """
+    1차 읽기 결과를 바탕으로 데이터를 다시 읽어 히스토그램과 피봇 테이블을 계산하는 함수 (대용량 모드 2차 읽기).
+
+    히스토그램은 1차 읽기에서 구한 범위의 고정 구간으로 도수를 누적하고, 피봇 테이블은 PartialAggregate로
+    조각별 부분 집계를 합친다. 출판사/저자 이름처럼 값의 종류가 많은 그룹 기준은 1차 읽기의 space-saving 요약이 추적한
+    빈도 상위 값만 정확히 집계하여 그룹 수(메모리)를 제한한다 (파생 그룹 기준은 키를 계산한 뒤 후보 값의 행만 남김). 분석 색인이 주어지면 피봇 테이블은 SQL 집계로 정확히 계산한다.
+
+    Args:
+        stats (StreamingProfile): 1차 읽기 결과.
+        settings (dict): 렌더링 프로필 설정.
+        chunk_rows (int): 한 번에 읽을 행 수.
+        catalog (CatalogIndex): 피봇 테이블을 SQL로 계산할 분석 색인 (None이면 부분 집계로 계산).
+
+    Returns:
+        tuple: (열 이름 -> Histogram 딕셔너리, (테이블 제목, Markdown 표 문자열) 리스트).
+    """
+    bins = settings['bins'] if isinstance(settings['bins'], int) else OUT_OF_CORE_BINS
+    hists = {
+        'Price': Histogram(histogram_edges(stats, 'Price', bins)),
+        'Rating': Histogram(histogram_edges(stats, 'Rating', 20)),
+        'Review Count': Histogram(histogram_edges(stats, 'Review Count', bins, upper=499)), # Outlier 제외 시각화
+    }
+    aggregators = []
+    for key, _, _, spec in ([] if catalog else PIVOTS):
+        by, candidates, derived = spec.by, None, DERIVED_KEYS
+        if by in stats.categorical:
+            candidates = stats.candidates(by, PIVOT_MIN_COUNTS.get(key, 1))
+        elif by in stats.derived:
+            keep = stats.candidates(by, PIVOT_MIN_COUNTS.get(key, 1))
+            derived = {**DERIVED_KEYS, by: restrict_key(DERIVED_KEYS[by], keep)}
+        aggregators.append((key, by, candidates, PartialAggregate({key: spec}, derived=derived)))
+    for chunk in iter_preprocessed(DATA_PATH, chunk_rows):
+        hists['Price'].update(chunk['Price'])
+        hists['Rating'].update(chunk['Rating'])
+        hists['Review Count'].update(chunk.loc[chunk['Review Count'] < 500, 'Review Count'])
+        for key, by, candidates, partial in aggregators:
+            partial.update(chunk if candidates is None else chunk[chunk[by].isin(candidates)])
     
-    # 5. 상위 저자별(5권 이상 집필) 평균 평점
-    author_counts = df['Author'].value_counts()
-    top_authors = author_counts[author_counts >= 5].index
-    pivot5 = df[df['Author'].isin(top_authors)].groupby('Author')[['Rating', 'Review Count']].mean().sort_values('Rating', ascending=False).head(10)
-    pivots.append(("다작 저자(5권 이상)의 평균 평점 Top 10", pivot5))
+    finishers = {key: (title, finish) for key, title, finish, _ in PIVOTS}
+    if catalog:
+        with span('pivot_aggregate'):
+            results = catalog.aggregate({key: spec for key, _, _, spec in PIVOTS})
+    else:
+        results = {key: partial.result()[key] for key, _, _, partial in aggregators}
+    pivots = []
+    for key, _, _, _ in PIVOTS:
+        title, finish = finishers[key]
+        with span('pivot', pivot=key):
+            pivots.append((title, finish(results[key]).to_markdown(floatfmt=".2f")))
+    return hists, pivots
+
+def analyze_out_of_core(profile='full', workers=None, memory_mb=MEMORY_MB, chunk_rows=None, catalog=None):
+    """
+    전체 데이터를 메모리에 올리지 않고 같은 보고서를 만드는 대용량(out-of-core) 모드.
+
+    데이터를 두 번 나누어 읽으며(1차: 기술 통계/빈도/상관계수 스케치, 2차: 히스토그램/피봇 테이블),
+    메모리 사용량은 조각 크기와 스케치 크기로 제한된다. 분위수(t-digest), 고유값 수(HyperLogLog),
+    최빈값(space-saving)은 근사값이며 나머지 통계는 정확한 값이다.
+
+    Args:
+        profile (str): 렌더링 프로필 ('full' 또는 'draft').
+        workers (int): 렌더링 프로세스 수.
+        memory_mb (int): 메모리 예산 (MB, chunk_rows가 없을 때 조각 크기 계산에 사용).
+        chunk_rows (int): 한 번에 읽을 행 수 (None이면 메모리 예산으로 계산).
+        catalog (CatalogIndex): 피봇 테이블을 SQL로 계산할 분석 색인 (None이면 부분 집계로 계산).
+    """
+    settings = RENDER_PROFILES[profile]
+    chunk_rows = chunk_rows or chunk_rows_for_budget(DATA_PATH, memory_mb)
+    with span('stream_statistics'):
+        stats = stream_statistics(chunk_rows)
+    with span('stream_details'):
+        hists, pivots = stream_details(stats, settings, chunk_rows, catalog)
+    with span('pivot', pivot='snapshot_trend'):
+        trend = snapshot_trend()
+    if trend:
+        pivots.append(trend)
     
-    return pivots
+    inputs = {
+        'numeric_dist': (plot_numeric_histograms, hists),
+        'top_publishers': (draw_top_publishers, stats.top('Publisher', 20)),
+        'trend': (draw_trend, (stats.counts['Year'], stats.counts['Month'])),
+        'heatmap': (draw_heatmap, stats.corr()),
+        'wordcloud': (plot_wordcloud, title_frequencies(None, morphemes=TITLE_MORPHEMES)),
+    }
+    # 기본 모드와 같은 경로에 이미지와 보고서를 쓰므로, 다음 기본 모드 실행이 이 결과(근사 통계)를 자기 결과로 재사용하지 않도록 지문을 먼저 지움
+    nodes = NodeCache(None)
+    nodes.discard([key for key, _, _, _ in FIGURES] + ['report'])
+    nodes.save()
+    jobs = [(filename, *inputs[key], settings) for key, filename, _, _ in FIGURES]
+    image_paths = dict(zip([key for key, _, _, _ in FIGURES], render_jobs(jobs, workers)))
+    overview = [stats.info(), stats.describe_numeric().to_markdown(), stats.describe_categorical().to_markdown()]
+    with span('report'):
+        write_report(overview, image_paths, pivots)
 
-def write_report(df, image_paths, pivots):
+def describe_frame(df):
+    """
+    데이터 개요(info, 수치형/범주형 기술 통계)를 보고서에 넣을 문자열로 만드는 함수.
+
+    Returns:
+        list: [info 문자열, 수치형 기술 통계 Markdown 표, 범주형 기술 통계 Markdown 표].
+    """
+    buf = StringIO()
+    df.info(buf=buf)
+    return [buf.getvalue(), df.describe().to_markdown(), df.describe(include=['object', 'string', 'category']).to_markdown()]
+
+def write_report(overview, image_paths, pivots, nodes=None):
     """
     분석 결과와 시각화 이미지를 종합하여 마크다운(Markdown) 보고서를 파일로 작성하는 함수.
 
     Args:
-        df (pd.DataFrame): 전처리된 데이터프레임 (기술통계 생성용).
+        overview (list): describe_frame() 또는 대용량 모드 프로파일로 만든 데이터 개요 문자열.
         image_paths (dict): 시각화 이미지 경로 딕셔너리.
-        pivots (list): 피봇 테이블 리스트.
+        pivots (list): (테이블 제목, Markdown 표 문자열) 리스트.
+        nodes (NodeCache): 입력이 바뀌지 않았으면 보고서를 다시 쓰지 않기 위한 캐시 (None이면 항상 작성).
     """
+    info, numeric, categorical = overview
+    fingerprint = nodes.fingerprint(write_report, [], [DATA_PATH, overview, image_paths, pivots]) if nodes else None
+    if nodes and nodes.get('report', fingerprint) == REPORT_PATH and os.path.exists(REPORT_PATH):
+        logger.info(f"입력이 바뀌지 않아 보고서를 다시 작성하지 않음: {REPORT_PATH}")
+        return
     logger.info("보고서 작성 중...")
     
     with open(REPORT_PATH, "w", encoding="utf-8") as f:
@@ -240,20 +641,18 @@ def write_report(df, image_paths, pivots):
         # 1. 데이터 개요 (info, describe)
         f.write("## 1. 데이터 개요\n")
         
-        # Info (buffer capture)
-        buf = StringIO()
-        df.info(buf=buf)
+        # Info
         f.write("### 데이터 구조 (Info)\n")
-        f.write(f"```\n{buf.getvalue()}\n```\n\n")
+        f.write(f"```\n{info}\n```\n\n")
         
         # Describe (Numerical)
         f.write("### 수치형 데이터 기술 통계\n")
-        f.write(df.describe().to_markdown())
+        f.write(numeric)
         f.write("\n\n")
         
         # Describe (Categorical)
         f.write("### 범주형 데이터 기술 통계\n")
-        f.write(df.describe(include='O').to_markdown())
+        f.write(categorical)
         f.write("\n\n")
         
         # 2. 시각화 결과
@@ -284,7 +683,7 @@ def write_report(df, image_paths, pivots):
         
         for title, table in pivots:
             f.write(f"### {title}\n")
-            f.write(table.to_markdown(floatfmt=".2f"))
+            f.write(table)
             f.write("\n\n")
             
         # 4. 인사이트 도출
@@ -295,18 +694,67 @@ def write_report(df, image_paths, pivots):
         f.write("- **트렌드**: 최근 연도로 올수록 도서 발행량이 증가하는 추세(또는 특정 양상)를 보이며, 이는 AI 기술에 대한 관심도 증가와 일치할 가능성이 높습니다.\n")
         f.write("- **키워드**: 워드 클라우드를 통해 '활용', '입문', '챗GPT', '딥러닝' 등의 키워드가 제목에 자주 등장함을 알 수 있습니다.\n")
 
+    if nodes:
+        nodes.set('report', fingerprint, REPORT_PATH)
     logger.info(f"보고서 생성 완료: {REPORT_PATH}")
 
-def main():
+def main(argv=None):
     """
     메인 실행 함수.
     데이터 로드 -> 분석 및 시각화 -> 피봇 테이블 생성 -> 보고서 작성 순으로 프로세스를 제어함.
     """
+    parser = argparse.ArgumentParser(description="Yes24 도서 데이터 EDA 보고서 생성")
+    parser.add_argument("--profile", choices=sorted(RENDER_PROFILES), default="full", help="렌더링 프로필 (draft: 빠른 확인용 저해상도)")
+    parser.add_argument("--workers", type=int, default=None, help="시각화 렌더링 프로세스 수 (1이면 순차 실행)")
+    parser.add_argument("--force", action="store_true", help="입력 변경 여부와 관계없이 모든 시각화와 표를 다시 생성")
+    parser.add_argument("--out-of-core", action="store_true", help="전체 데이터를 메모리에 올리지 않고 나누어 읽어 보고서 생성 (대용량 데이터용)")
+    parser.add_argument("--memory-mb", type=int, default=MEMORY_MB, help="대용량 모드의 메모리 예산 (MB)")
+    parser.add_argument("--chunk-rows", type=int, default=None, help="대용량 모드에서 한 번에 읽을 행 수 (지정하면 메모리 예산 대신 사용)")
+    parser.add_argument("--catalog", action="store_true", help=f"피봇 테이블을 분석 색인({CATALOG_DB})의 SQL 집계로 계산 (바뀐 파티션만 먼저 적재)")
+    parser.add_argument("--metrics", default=None, help="단계별 소요 시간/메모리 지표를 저장할 Prometheus 텍스트 파일 경로")
+    parser.add_argument("--trace", default=None, help="전처리/시각화/피봇 테이블 구간을 저장할 추적 JSON 파일 경로 (chrome://tracing, Perfetto)")
+    args = parser.parse_args(argv)
+    METRICS.tracing = bool(args.trace)
+    
+    catalog = None
+    if args.catalog:
+        catalog = CatalogIndex(CATALOG_DB)
+        with span('catalog_load'):
+            stats = catalog.load(DATA_PATH)
+        logger.info(f"분석 색인 적재: 파티션 {stats['loaded']}개({stats['rows']}행) 적재, 변경 없음 {stats['unchanged']}개")
+    if args.out_of_core:
+        analyze_out_of_core(profile=args.profile, workers=args.workers, memory_mb=args.memory_mb, chunk_rows=args.chunk_rows, catalog=catalog)
+    else:
+        run_in_memory(args, catalog)
+    if catalog:
+        catalog.close()
+    
+    for name, count, seconds, mean_ms in METRICS.summary():
+        logger.info(f"[지표] {name}: {count}회, 합계 {seconds:.2f}초, 평균 {mean_ms:.1f}ms")
+    METRICS.write(args.metrics, args.trace)
+
+def run_in_memory(args, catalog=None):
+    """전체 데이터를 메모리에 올려 보고서를 만드는 기본 모드 (입력이 바뀐 시각화/표만 다시 계산)"""
     df = load_and_preprocess()
     if df is not None:
-        image_paths = analyze_and_visualize(df)
-        pivots = generate_pivot_tables(df)
-        write_report(df, image_paths, pivots)
+        nodes = NodeCache(df)
+        if args.force:
+            nodes.state = {}
+        image_paths = analyze_and_visualize(df, profile=args.profile, workers=args.workers, nodes=nodes)
+        pivots = generate_pivot_tables(df, nodes=nodes, catalog=catalog)
+        with span('pivot', pivot='snapshot_trend'):
+            trend = snapshot_trend()
+        if trend:
+            pivots.append(trend)
+        fingerprint = nodes.fingerprint(describe_frame, list(df.columns))
+        overview = nodes.get('overview', fingerprint)
+        if overview is None:
+            with span('describe'):
+                overview = describe_frame(df)
+            nodes.set('overview', fingerprint, overview)
+        with span('report'):
+            write_report(overview, image_paths, pivots, nodes=nodes)
+        nodes.save()
 
 if __name__ == "__main__":
     main()
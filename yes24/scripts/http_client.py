@@ -0,0 +1,128 @@
+import random # 재시도 대기 시간에 무작위성(jitter)을 주기 위한 random 라이브러리 임포트
+import threading # 재시도 횟수 집계 동기화를 위한 threading 라이브러리 임포트
+import time # 재시도 전 대기를 위한 time 라이브러리 임포트
+from email.utils import parsedate_to_datetime # HTTP 날짜 형식의 Retry-After 헤더 해석을 위한 함수 임포트
+from datetime import datetime, timezone # Retry-After 날짜와 현재 시각 비교를 위한 datetime 임포트
+import requests # HTTP 요청을 보내기 위한 라이브러리 임포트
+from requests.adapters import HTTPAdapter # 연결 풀 크기를 설정하기 위한 어댑터 임포트
+from loguru import logger # 로그 기록을 위한 loguru 라이브러리 임포트
+
+try:
+    import brotli # noqa: F401 # brotli 압축 해제 지원 여부 확인 (설치된 경우에만 br 인코딩 요청)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+RETRY_STATUSES = {429, 500, 502, 503, 504} # 재시도 대상 HTTP 상태 코드 (요청 과다 및 서버 오류)
+
+
+def parse_retry_after(value):
+    """
+    Retry-After 헤더 값을 대기 초 단위로 변환하는 함수.
+
+    Args:
+        value (str): 초 단위 숫자 또는 HTTP 날짜 형식의 헤더 값.
+
+    Returns:
+        float: 대기해야 할 초. 해석할 수 없으면 None.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class HttpClient:
+    """
+    연결을 재사용하는 HTTP 클라이언트.
+
+    하나의 Session과 연결 풀을 공유하여 매 요청마다 TCP/TLS 연결을 새로 맺지 않으며,
+    gzip/brotli 압축 응답을 요청하고, 429/5xx 및 네트워크 오류는 지수 백오프(jitter 포함)로 재시도한다.
+    서버가 Retry-After 헤더를 보내면 그 값을 우선하여 대기한다.
+    재시도 요청도 전역 요청 속도 제한을 지키도록, 대기 후 acquire로 토큰을 얻은 뒤에 다시 요청한다.
+
+    Args:
+        headers (dict): 모든 요청에 공통으로 붙일 헤더.
+        pool_size (int): 호스트별로 유지할 최대 연결 수 (동시 요청 수 이상으로 설정).
+        timeout (tuple): (연결 타임아웃, 읽기 타임아웃) 초.
+        max_retries (int): 최초 요청 이후 최대 재시도 횟수.
+        backoff_base (float): 지수 백오프의 기준 대기 시간(초).
+        backoff_max (float): 한 번의 재시도 대기 시간 상한(초).
+        observer (callable): 요청(재시도 포함)마다 (응답 시간(초), 상태 코드, Retry-After 초)를 받는 함수
+            (예: AdaptiveThrottle.record). 네트워크 오류면 상태 코드는 None.
+        acquire (callable): 재시도 요청을 보내기 전에 호출하여 요청 속도 제한의 토큰을 얻는 함수
+            (예: TokenBucket.acquire). 최초 요청의 토큰은 호출하는 쪽(ConcurrentFetcher)에서 얻는다.
+    """
+
+    def __init__(self, headers, pool_size=10, timeout=(5, 30), max_retries=5, backoff_base=1.0, backoff_max=60.0, observer=None, acquire=None):
+        self.timeout = timeout
+        self.observer = observer
+        self.acquire = acquire
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retries = 0 # 지금까지 재시도한 총 횟수 (성능 측정 및 수집 결과 요약용)
+        self._lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size) # keep-alive 연결 풀 설정
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(headers)
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+
+    def backoff(self, attempt):
+        """재시도 횟수에 따른 대기 시간을 계산하는 함수 (full jitter 방식)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def get(self, url, params=None, headers=None):
+        """
+        GET 요청을 보내고, 일시적인 오류는 재시도하는 함수.
+
+        Args:
+            url (str): 요청 URL.
+            params (dict): 쿼리 매개변수.
+            headers (dict): 이 요청에만 추가할 헤더.
+
+        Returns:
+            requests.Response: 성공한 응답 객체.
+
+        Raises:
+            requests.RequestException: 재시도 횟수를 모두 소진했거나 재시도 대상이 아닌 오류가 발생한 경우.
+        """
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if self.observer:
+                    self.observer(time.perf_counter() - start, None, None)
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff(attempt)
+                logger.warning(f"요청 실패 ({e.__class__.__name__}), {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+            else:
+                retry_after = parse_retry_after(response.headers.get("Retry-After")) if response.status_code in RETRY_STATUSES else None
+                if retry_after is not None:
+                    retry_after = min(self.backoff_max, retry_after)
+                if self.observer:
+                    self.observer(time.perf_counter() - start, response.status_code, retry_after)
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    response.raise_for_status()
+                    return response
+                delay = retry_after if retry_after is not None else self.backoff(attempt)
+                logger.warning(f"HTTP {response.status_code} 응답, {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                response.close()
+            with self._lock:
+                self.retries += 1
+            time.sleep(delay)
+            if self.acquire:
+                self.acquire() # 재시도 요청도 다른 워커의 요청과 같은 토큰 버킷에서 토큰을 소비
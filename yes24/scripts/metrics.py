@@ -0,0 +1,230 @@
+import bisect # 히스토그램 구간 탐색을 위한 bisect 라이브러리 임포트
+import json # 추적 파일 저장을 위한 json 라이브러리 임포트
+import os # 파일 경로 조작 및 프로세스 id 조회를 위한 os 라이브러리 임포트
+import sys # 운영체제별 메모리 단위 확인을 위한 sys 라이브러리 임포트
+import threading # 여러 스레드의 기록 동기화를 위한 threading 라이브러리 임포트
+import time # 구간 시간 측정을 위한 time 라이브러리 임포트
+from contextlib import contextmanager # 구간 측정용 컨텍스트 관리자 생성을 위한 contextmanager 임포트
+
+# 설정
+PREFIX = "yes24_" # 내보내는 지표 이름의 접두사
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0) # 구간 시간 히스토그램의 상한(초)
+ITEM_BUCKETS = (0, 1, 10, 30, 60, 120, 240, 600, 1200) # 페이지당 도서 수 히스토그램의 상한
+MAX_TRACE_EVENTS = 1_000_000 # 추적 파일에 남길 최대 구간 수 (넘으면 버리고 개수만 셈)
+
+
+def peak_rss_bytes():
+    """현재 프로세스의 최대 메모리 사용량(바이트)을 반환하는 함수 (resource 모듈이 없는 Windows에서는 None)"""
+    try:
+        import resource # 유닉스 계열에서만 제공
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024 # macOS는 바이트, 리눅스는 KB 단위
+
+
+def _label_key(labels):
+    return tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escape = lambda v: v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value):
+    """지표 값을 Prometheus 텍스트 형식으로 변환하는 함수 (정수는 그대로, 실수는 정밀도 손실 없이)"""
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+class Histogram:
+    """구간 상한별 누적 개수와 합계를 유지하는 히스토그램 (Prometheus histogram 형식)"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1) # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """
+    수집기와 EDA 파이프라인의 구간 시간, 처리량, 메모리 사용량을 기록하는 지표 저장소.
+
+    - 카운터(inc): 누적 값 (전송 바이트, 파싱 실패 수 등)
+    - 게이지(set, set_max): 현재 값 또는 최댓값 (최대 메모리 사용량 등)
+    - 히스토그램(observe): 값의 분포 (구간 시간, 페이지당 도서 수 등)
+    - 구간(span): 이름과 라벨별 시간 히스토그램에 기록하고, 추적을 켜면 시작 시각과 길이를 추적 이벤트로 남김
+
+    모든 기록은 잠금으로 보호되므로 여러 작업 스레드에서 함께 사용할 수 있다.
+    to_prometheus()는 Prometheus 텍스트 형식을, trace()는 chrome://tracing(Perfetto)에서 열 수 있는 JSON을 만든다.
+
+    Args:
+        tracing (bool): 구간별 추적 이벤트를 남길지 여부 (히스토그램은 항상 기록).
+    """
+
+    def __init__(self, tracing=False):
+        self.tracing = tracing
+        self.epoch = time.time() # 추적 이벤트 시각의 기준
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.events = []
+        self.dropped_events = 0
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        """카운터를 value만큼 증가시키는 함수"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def counter_values(self):
+        """카운터 값의 복사본을 반환하는 함수 (작업자 프로세스에서 늘어난 값을 계산할 때 사용)"""
+        with self._lock:
+            return dict(self.counters)
+
+    def set(self, name, value, **labels):
+        """게이지 값을 설정하는 함수"""
+        with self._lock:
+            self.gauges[name, _label_key(labels)] = value
+
+    def set_max(self, name, value, **labels):
+        """게이지를 지금까지의 최댓값으로 유지하는 함수 (메모리 최고 사용량 등)"""
+        if value is None:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.gauges[key] = max(value, self.gauges.get(key, value))
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        """히스토그램에 값 하나를 기록하는 함수"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def record_span(self, name, start, seconds, error=False, pid=None, tid=None, **labels):
+        """
+        이미 측정한 구간을 기록하는 함수 (다른 프로세스에서 측정한 구간 등).
+
+        Args:
+            name (str): 구간 이름 (예: 'fetch', 'parse').
+            start (float): 구간 시작 시각 (time.time() 기준 초).
+            seconds (float): 구간 길이(초).
+            error (bool): 구간이 예외로 끝났는지 여부.
+            pid (int): 구간을 실행한 프로세스 id (None이면 현재 프로세스).
+            tid (int): 구간을 실행한 스레드 id (None이면 현재 스레드).
+            **labels: 구간 라벨 (히스토그램 라벨과 추적 이벤트 인자로 사용).
+        """
+        self.observe("span_seconds", seconds, span=name, **labels)
+        if error:
+            self.inc("span_errors_total", span=name, **labels)
+        if not self.tracing:
+            return
+        event = {
+            "name": name, "ph": "X", "ts": round((start - self.epoch) * 1e6), "dur": round(seconds * 1e6),
+            "pid": pid or os.getpid(), "tid": tid or threading.get_ident(), "args": dict(labels, **({"error": True} if error else {})),
+        }
+        with self._lock:
+            if len(self.events) < MAX_TRACE_EVENTS:
+                self.events.append(event)
+            else:
+                self.dropped_events += 1
+
+    @contextmanager
+    def span(self, name, **labels):
+        """
+        with 블록의 실행 시간을 구간으로 기록하는 컨텍스트 관리자.
+
+        예:
+            with span("parse"):
+                books = parse_html(html)
+        """
+        start, clock, error = time.time(), time.perf_counter(), False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record_span(name, start, time.perf_counter() - clock, error, **labels)
+            self.set_max("peak_rss_bytes", peak_rss_bytes(), process="main")
+
+    def to_prometheus(self):
+        """기록된 지표를 Prometheus 텍스트 형식 문자열로 만드는 함수"""
+        self.set_max("peak_rss_bytes", peak_rss_bytes(), process="main")
+        with self._lock:
+            counters, gauges = dict(self.counters), dict(self.gauges)
+            histograms = {key: (h.buckets, list(h.counts), h.sum, h.count) for key, h in self.histograms.items()}
+        lines = []
+        for kind, values in (("counter", counters), ("gauge", gauges)):
+            for name in sorted({name for name, _ in values}):
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+                lines += [f"{PREFIX}{name}{_format_labels(key)} {_format_value(value)}" for (n, key), value in sorted(values.items()) if n == name]
+        for name in sorted({name for name, _ in histograms}):
+            lines.append(f"# TYPE {PREFIX}{name} histogram")
+            for (n, key), (buckets, counts, total, count) in sorted(histograms.items()):
+                if n != name:
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip(list(buckets) + ["+Inf"], counts):
+                    cumulative += bucket_count
+                    lines.append(f"{PREFIX}{name}_bucket{_format_labels(key, [('le', f'{bound:g}' if bound != '+Inf' else bound)])} {cumulative}")
+                lines.append(f"{PREFIX}{name}_sum{_format_labels(key)} {_format_value(total)}")
+                lines.append(f"{PREFIX}{name}_count{_format_labels(key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def trace(self):
+        """기록된 구간을 Chrome trace 이벤트 형식(JSON 객체)으로 반환하는 함수"""
+        with self._lock:
+            events = list(self.events)
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "metadata": {"epoch": self.epoch, "dropped_events": self.dropped_events}}
+
+    def summary(self):
+        """구간 이름별 (횟수, 합계 초, 평균 ms) 요약을 합계 시간 순으로 반환하는 함수 (로그 출력용)"""
+        with self._lock:
+            totals = {}
+            for (name, key), histogram in self.histograms.items():
+                if name != "span_seconds":
+                    continue
+                span = dict(key)["span"]
+                count, seconds = totals.get(span, (0, 0.0))
+                totals[span] = (count + histogram.count, seconds + histogram.sum)
+        return [(span, count, seconds, seconds / count * 1000 if count else 0.0)
+                for span, (count, seconds) in sorted(totals.items(), key=lambda item: -item[1][1])]
+
+    def write(self, prometheus_path=None, trace_path=None):
+        """
+        지표를 파일로 내보내는 함수.
+
+        Args:
+            prometheus_path (str): Prometheus 텍스트 파일 경로 (node_exporter textfile collector 등에서 읽음, None이면 저장 안 함).
+            trace_path (str): 추적 JSON 파일 경로 (chrome://tracing 또는 Perfetto에서 열기, None이면 저장 안 함).
+        """
+        for path, content in ((prometheus_path, self.to_prometheus), (trace_path, lambda: json.dumps(self.trace()))):
+            if not path:
+                continue
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(content())
+            os.replace(path + ".tmp", path)
+
+
+# 프로세스 전체에서 공유하는 기본 지표 저장소
+METRICS = Metrics()
+span = METRICS.span
+inc = METRICS.inc
+observe = METRICS.observe
+set_max = METRICS.set_max
@@ -0,0 +1,190 @@
+from itertools import combinations # 상관계수를 계산할 열 쌍 생성을 위한 combinations 임포트
+import numpy as np # 통계 계산을 위한 numpy 라이브러리 임포트
+import pandas as pd # 조각 데이터 처리 및 통계 표 생성을 위한 pandas 라이브러리 임포트
+from loguru import logger # 로그 기록을 위한 loguru 라이브러리 임포트
+from dataset import iter_books # 도서 데이터를 나누어 읽는 함수 임포트
+from metrics import span # 조각별 전처리 시간 기록 함수 임포트
+from preprocess import preprocess # 조각별 전처리 함수 임포트
+from sketches import CoMoments, HyperLogLog, Moments, SpaceSaving, TDigest # 병합 가능한 요약(스케치) 임포트
+
+# 설정
+MEMORY_MB = 512 # 기본 메모리 예산 (MB, 라이브러리 로드에 쓰이는 메모리 제외)
+CHUNK_SHARE = 0.1 # 메모리 예산 중 데이터 조각 하나에 쓰는 비율 (파싱 버퍼, 전처리 복사본, 문자열 변환 등 중간 결과가 조각의 수 배)
+PROBE_ROWS = 10_000 # 행당 메모리 사용량을 측정하기 위해 먼저 읽는 행 수
+TOPK_CAPACITY = 10_000 # 범주형 열별로 빈도를 추적하는 최대 값 수 (space-saving)
+TDIGEST_COMPRESSION = 200 # 분위수 근사 정확도 (t-digest)
+HLL_PRECISION = 14 # 고유값 수 근사 정확도 (HyperLogLog, 표준 오차 약 0.8%)
+PERCENTILES = [0.25, 0.5, 0.75] # describe()와 같은 분위수
+
+
+def chunk_rows_for_budget(path, memory_mb=MEMORY_MB):
+    """
+    메모리 예산에 맞는 조각 행 수를 계산하는 함수.
+
+    앞부분 PROBE_ROWS행을 읽어 전처리한 뒤 행당 메모리 사용량을 측정하고,
+    예산 중 CHUNK_SHARE 비율 안에 들어가는 행 수를 반환한다 (스케치는 데이터 크기와 무관하게 수 MB로 일정).
+
+    Args:
+        path (str): CSV 파일 또는 데이터셋 폴더 경로.
+        memory_mb (int): 메모리 예산 (MB).
+
+    Returns:
+        int: 한 번에 읽을 행 수.
+    """
+    probe = preprocess(next(iter_books(path, chunk_rows=PROBE_ROWS)))
+    row_bytes = max(1, probe.memory_usage(deep=True).sum() / max(1, len(probe)))
+    rows = max(1_000, int(memory_mb * (1 << 20) * CHUNK_SHARE / row_bytes))
+    logger.info(f"메모리 예산 {memory_mb}MB: 행당 약 {row_bytes:.0f}바이트, 조각당 {rows}행")
+    return rows
+
+
+def iter_preprocessed(path, chunk_rows):
+    """도서 데이터를 chunk_rows행씩 읽어 preprocess()를 적용한 조각을 반환하는 제너레이터"""
+    for chunk in iter_books(path, chunk_rows=chunk_rows):
+        with span("preprocess", mode="chunk"):
+            chunk = preprocess(chunk)
+        yield chunk
+
+
+def _is_numeric(dtype):
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def _is_datetime(dtype):
+    return pd.api.types.is_datetime64_any_dtype(dtype)
+
+
+def _is_categorical(dtype):
+    return isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+
+
+class StreamingProfile:
+    """
+    데이터 조각을 차례로 받아 info()/describe()에 해당하는 통계를 병합 가능한 요약으로 누적하는 프로파일.
+
+    - 수치형/날짜 열: 개수/평균/표준편차/최솟값/최댓값(Moments)과 분위수(TDigest) (날짜는 ns 단위 정수로 계산)
+    - 범주형 열: 고유값 수(HyperLogLog)와 최빈값 상위 목록(SpaceSaving)
+    - counted 열: 값별 정확한 빈도 (연도, 월처럼 값의 종류가 적은 열)
+    - correlated 열: 열 쌍별 상관계수(CoMoments)
+    - derived 그룹 기준: 조각에서 계산한 파생 값의 고유값 수와 최빈값 상위 목록 (공저 도서를 저자마다 펼친 저자 이름처럼 열이 아닌 그룹 기준)
+
+    모든 요약의 크기는 데이터 행 수와 무관하므로, 메모리 사용량은 조각 크기와 열 수로 정해진다.
+    열의 타입은 처음 받은 조각의 타입을 따른다.
+
+    Args:
+        counted (list): 값별 빈도를 정확히 셀 열 이름 목록.
+        correlated (list): 상관계수를 계산할 열 이름 목록.
+        capacity (int): 범주형 열(파생 그룹 기준 포함)별 빈도 추적 최대 값 수.
+        derived (dict): 빈도를 추적할 파생 그룹 기준 이름 -> 조각을 받아 값 Series를 반환하는 함수 (aggregate()의 derived와 같은 형식).
+    """
+
+    def __init__(self, counted=(), correlated=(), capacity=TOPK_CAPACITY, derived=None):
+        self.capacity = capacity
+        self.rows = 0
+        self.chunks = 0
+        self.dtypes = {}
+        self.non_null = {}
+        self.numeric = {}
+        self.categorical = {}
+        self.counts = {column: pd.Series(dtype="int64") for column in counted}
+        self.correlated = list(correlated)
+        self.pairs = {pair: CoMoments() for pair in combinations(self.correlated, 2)}
+        self.derived = dict(derived or {})
+        self.derived_values = {name: (HyperLogLog(HLL_PRECISION), SpaceSaving(capacity)) for name in self.derived}
+
+    def update(self, df):
+        """데이터 조각 하나를 요약에 반영하는 함수"""
+        self.rows += len(df)
+        self.chunks += 1
+        for column in df.columns:
+            series = df[column]
+            if column not in self.dtypes:
+                self.dtypes[column] = series.dtype
+                self.non_null[column] = 0
+            self.non_null[column] += int(series.notna().sum())
+            dtype = self.dtypes[column]
+            if _is_numeric(dtype) or _is_datetime(dtype):
+                if _is_datetime(dtype):
+                    series = series.dropna().astype("datetime64[ns]").astype("int64")
+                moments, digest = self.numeric.setdefault(column, (Moments(), TDigest(TDIGEST_COMPRESSION)))
+                moments.update(series)
+                digest.update(series)
+            elif _is_categorical(dtype):
+                distinct, top = self.categorical.setdefault(column, (HyperLogLog(HLL_PRECISION), SpaceSaving(self.capacity)))
+                distinct.update(series)
+                top.update(series)
+        for column, counts in self.counts.items():
+            self.counts[column] = counts.add(df[column].value_counts(), fill_value=0).astype("int64")
+        for (x, y), pair in self.pairs.items():
+            pair.update(df[x].to_numpy(dtype="float64", na_value=np.nan), df[y].to_numpy(dtype="float64", na_value=np.nan))
+        for name, fn in self.derived.items():
+            values = fn(df)
+            for summary in self.derived_values[name]:
+                summary.update(values)
+        return self
+
+    def info(self):
+        """DataFrame.info()와 같은 형식의 데이터 구조 요약 문자열"""
+        rows = [(" #", "Column", "Non-Null Count", "Dtype"), ("---", "------", "--------------", "-----")]
+        rows += [(f" {i}", column, f"{self.non_null[column]} non-null", str(dtype)) for i, (column, dtype) in enumerate(self.dtypes.items())]
+        widths = [max(len(row[i]) for row in rows) for i in range(4)]
+        dtype_counts = pd.Series([str(dtype) for dtype in self.dtypes.values()]).value_counts().sort_index()
+        lines = [
+            "<class 'pandas.DataFrame'>",
+            f"RangeIndex: {self.rows} entries, 0 to {self.rows - 1}",
+            f"Data columns (total {len(self.dtypes)} columns):",
+            *("  ".join(value.ljust(width) for value, width in zip(row, widths)) for row in rows),
+            "dtypes: " + ", ".join(f"{dtype}({count})" for dtype, count in dtype_counts.items()),
+            f"out-of-core: {self.chunks} chunks (분위수, 고유값 수, 최빈값은 스케치 기반 근사값)",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def describe_numeric(self):
+        """DataFrame.describe()에 해당하는 수치형/날짜 열 기술 통계표 (행 순서도 describe()와 같음)"""
+        percentiles = [f"{q:.0%}" for q in PERCENTILES]
+        stats = []
+        for column, (moments, digest) in self.numeric.items():
+            values = [moments.mean, moments.min, *(digest.quantile(q) for q in PERCENTILES), moments.max] if moments.n else [np.nan] * (len(PERCENTILES) + 3)
+            if _is_datetime(self.dtypes[column]): # 날짜 열은 표준편차 없이 날짜로 표시
+                values = [pd.Timestamp(int(v)).round("s") if not np.isnan(v) else pd.NaT for v in values]
+                stats.append(pd.Series([moments.n, *values], index=["count", "mean", "min", *percentiles, "max"], name=column))
+            else:
+                values.insert(1, moments.std)
+                stats.append(pd.Series([float(moments.n), *values], index=["count", "mean", "std", "min", *percentiles, "max"], name=column))
+        names = [] # describe()처럼 짧은 통계 목록부터 통계 이름 순서를 정함
+        for index in sorted((series.index for series in stats), key=len):
+            names += [name for name in index if name not in names]
+        return pd.concat([series.reindex(names) for series in stats], axis=1)
+
+    def describe_categorical(self):
+        """DataFrame.describe(include=[...])에 해당하는 범주형 열 기술 통계표 (고유값 수, 최빈값은 근사값)"""
+        stats = {}
+        for column, (distinct, top) in self.categorical.items():
+            counts = top.top(1)
+            stats[column] = [self.non_null[column], distinct.count(),
+                             counts.index[0] if len(counts) else np.nan, int(counts.iloc[0]) if len(counts) else np.nan]
+        return pd.DataFrame(stats, index=["count", "unique", "top", "freq"], dtype=object)
+
+    def top(self, column, k=None):
+        """범주형 열의 빈도 상위 k개 값과 추정 빈도 (space-saving)"""
+        return self.categorical[column][1].top(k)
+
+    def candidates(self, column, min_count=1):
+        """
+        빈도 추정치가 min_count 이상인 값 목록 (정확한 집계 대상으로 쓸 후보).
+
+        요약에서 밀려난 값의 실제 빈도는 요약의 최소 빈도(floor) 이하이므로, floor가 min_count보다 작으면
+        min_count번 이상 등장한 값은 모두 후보에 포함된다. 그렇지 않으면 경고를 남긴다.
+        """
+        summary = (self.categorical[column] if column in self.categorical else self.derived_values[column])[1]
+        if summary.floor >= min_count:
+            logger.warning(f"'{column}' 빈도 요약이 가득 차 빈도 {summary.floor} 이하의 값이 누락될 수 있습니다 (capacity={summary.capacity}).")
+        counts = summary.top()
+        return counts[counts >= min_count].index
+
+    def corr(self):
+        """correlated 열의 상관계수 행렬 (쌍별로 두 값이 모두 있는 행 기준, DataFrame.corr()와 같음)"""
+        matrix = pd.DataFrame(np.eye(len(self.correlated)), index=self.correlated, columns=self.correlated)
+        for (x, y), pair in self.pairs.items():
+            matrix.loc[x, y] = matrix.loc[y, x] = pair.corr
+        return matrix
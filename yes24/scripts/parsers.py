@@ -0,0 +1,374 @@
+import html as htmllib # HTML 엔티티 해제를 위한 html 라이브러리 임포트
+import json # 내장 JSON 데이터 해석을 위한 json 라이브러리 임포트
+import re # 정규표현식 기반 추출을 위한 re 라이브러리 임포트
+from loguru import logger # 로그 기록을 위한 loguru 라이브러리 임포트
+from metrics import inc # 파싱 실패 수 집계 함수 임포트
+
+BASE_DOMAIN = "https://www.yes24.com" # 상세 페이지 URL 생성에 사용할 도메인
+
+# 도서 항목과 각 필드를 선택하는 CSS 선택자 (모든 백엔드가 같은 선택자를 기준으로 동작)
+SELECTORS = {
+    "item": "div.itemUnit", # 개별 도서 정보가 들어있는 div 요소
+    "title": "a.gd_name", # 도서명 및 상세 페이지 링크
+    "author": "span.authPub.info_auth", # 저자
+    "publisher": "span.authPub.info_pub", # 출판사
+    "date": "span.authPub.info_date", # 출판일
+    "price": "strong.txt_num > em.yes_b", # 판매가
+    "rating": "span.rating_grade > em.yes_b", # 별점
+    "review": "span.rating_rvCount em.txC_blue", # 리뷰 수
+    "list_price": "span.txt_num.dash > em.yes_m", # 정가
+    "discount": "span.txt_sale > em.num", # 할인율(%)
+    "sales": "span.saleNum", # 판매지수 ('판매지수 126,261' 형식)
+}
+
+NON_DIGIT_RE = re.compile(r"\D") # 판매지수 문자열에서 숫자 이외의 문자 제거용
+
+
+def sales_index(text):
+    """'판매지수 126,261' 형식의 문자열에서 숫자만 추출하는 함수 (판매지수가 없으면 '0')"""
+    digits = NON_DIGIT_RE.sub("", text) if text is not None else ""
+    return digits or "0"
+
+
+def make_record(texts, href):
+    """
+    백엔드가 추출한 필드별 텍스트를 도서 정보 딕셔너리로 변환하는 함수.
+
+    Args:
+        texts (dict): SELECTORS의 필드명을 키로, 앞뒤 공백이 제거된 텍스트(없으면 None)를 값으로 갖는 딕셔너리.
+        href (str): 도서명 태그의 href 속성 값 (없으면 None).
+
+    Returns:
+        dict: 수집 스키마에 맞춘 도서 정보.
+    """
+    title = texts["title"]
+    author = texts["author"]
+    price = texts["price"]
+    rating = texts["rating"]
+    review_count = texts["review"]
+    list_price = texts["list_price"]
+    discount = texts["discount"]
+    price = price.replace(",", "") if price is not None else "0" # 쉼표를 제거한 숫자 형태의 가격
+    return {
+        "Goods No": href.rsplit("/", 1)[-1] if href else "", # 상세 페이지 주소 끝의 상품 번호
+        "Title": title if title is not None else "",
+        "Author": author.replace(" 저", "") if author is not None else "", # 불필요한 단어 제거
+        "Publisher": texts["publisher"] or "",
+        "Publish Date": texts["date"] or "",
+        "Price": price,
+        "Rating": rating if rating is not None else "0.0",
+        "Review Count": review_count if review_count is not None else "0",
+        "Detail URL": BASE_DOMAIN + href if title is not None else "",
+        "List Price": list_price.replace(",", "") if list_price is not None else price, # 할인이 없으면 정가 = 판매가
+        "Discount Rate": discount if discount is not None else "0",
+        "Sales Index": sales_index(texts["sales"]),
+    }
+
+
+def _parse_items(items, extract):
+    """각 도서 요소에서 필드를 추출하고, 실패한 항목은 경고 로그를 남긴 뒤 건너뛰는 함수"""
+    data = []
+    for item in items:
+        try:
+            data.append(make_record(*extract(item)))
+        except Exception as e:
+            logger.warning(f"항목 파싱 중 오류 발생: {e}")
+            inc("parse_failures_total", mode="dom")
+    return data
+
+
+def _bs4_backend():
+    """BeautifulSoup 기반 백엔드 (soupsieve로 선택자를 미리 컴파일하여 재사용)"""
+    from bs4 import BeautifulSoup
+    import soupsieve as sv
+
+    compiled = {field: sv.compile(selector) for field, selector in SELECTORS.items()}
+
+    def extract(item):
+        tags = {field: compiled[field].select_one(item) for field in SELECTORS if field != "item"}
+        texts = {field: tag.text.strip() if tag is not None else None for field, tag in tags.items()}
+        return texts, tags["title"]["href"] if tags["title"] is not None else None
+
+    def parse(html):
+        soup = BeautifulSoup(html, "html.parser")
+        return _parse_items(compiled["item"].select(soup), extract)
+
+    return parse
+
+
+def _xpath_class(tag, *classes):
+    """CSS의 tag.class 선택자와 같은 의미의 XPath 조건식을 만드는 함수"""
+    return tag + "".join(f"[contains(concat(' ', normalize-space(@class), ' '), ' {c} ')]" for c in classes)
+
+
+def _lxml_backend():
+    """lxml 기반 백엔드 (CSS 선택자와 같은 의미의 XPath를 미리 컴파일하여 재사용)"""
+    import lxml.html
+    from lxml import etree
+
+    xpaths = {
+        "item": "//" + _xpath_class("div", "itemUnit"),
+        "title": ".//" + _xpath_class("a", "gd_name"),
+        "author": ".//" + _xpath_class("span", "authPub", "info_auth"),
+        "publisher": ".//" + _xpath_class("span", "authPub", "info_pub"),
+        "date": ".//" + _xpath_class("span", "authPub", "info_date"),
+        "price": ".//" + _xpath_class("strong", "txt_num") + "/" + _xpath_class("em", "yes_b"),
+        "rating": ".//" + _xpath_class("span", "rating_grade") + "/" + _xpath_class("em", "yes_b"),
+        "review": ".//" + _xpath_class("span", "rating_rvCount") + "//" + _xpath_class("em", "txC_blue"),
+        "list_price": ".//" + _xpath_class("span", "txt_num", "dash") + "/" + _xpath_class("em", "yes_m"),
+        "discount": ".//" + _xpath_class("span", "txt_sale") + "/" + _xpath_class("em", "num"),
+        "sales": ".//" + _xpath_class("span", "saleNum"),
+    }
+    compiled = {field: etree.XPath(xpath) for field, xpath in xpaths.items()}
+
+    def extract(item):
+        tags = {}
+        for field in SELECTORS:
+            if field != "item":
+                found = compiled[field](item)
+                tags[field] = found[0] if found else None # select_one과 같이 문서 순서상 첫 번째 요소 사용
+        texts = {field: tag.text_content().strip() if tag is not None else None for field, tag in tags.items()}
+        return texts, tags["title"].get("href") if tags["title"] is not None else None
+
+    def parse(html):
+        root = lxml.html.document_fromstring(html)
+        return _parse_items(compiled["item"](root), extract)
+
+    return parse
+
+
+def _selectolax_backend():
+    """selectolax(Lexbor) 기반 백엔드 (C로 구현된 파서와 선택자 엔진 사용)"""
+    from selectolax.lexbor import LexborHTMLParser
+
+    def extract(item):
+        tags = {field: item.css_first(selector) for field, selector in SELECTORS.items() if field != "item"}
+        texts = {field: tag.text(deep=True).strip() if tag is not None else None for field, tag in tags.items()}
+        return texts, tags["title"].attributes.get("href") if tags["title"] is not None else None
+
+    def parse(html):
+        tree = LexborHTMLParser(html)
+        return _parse_items(tree.css(SELECTORS["item"]), extract)
+
+    return parse
+
+
+# 사용 가능한 파서 백엔드 (자동 선택 시 앞에 있는 백엔드를 우선 사용)
+BACKENDS = {
+    "selectolax": _selectolax_backend,
+    "lxml": _lxml_backend,
+    "bs4": _bs4_backend,
+}
+
+_loaded = {} # 초기화가 끝난 백엔드 파싱 함수 캐시 (선택자 컴파일은 한 번만 수행)
+
+
+def get_parser(backend=None):
+    """
+    이름에 해당하는 파서 백엔드의 파싱 함수를 반환하는 함수.
+
+    Args:
+        backend (str): 'selectolax', 'lxml', 'bs4' 중 하나. None이면 설치된 백엔드 중 가장 빠른 것을 선택.
+
+    Returns:
+        callable: HTML 문자열을 받아 도서 정보 딕셔너리 리스트를 반환하는 함수.
+
+    Raises:
+        ImportError: 지정한 백엔드의 라이브러리가 설치되어 있지 않은 경우.
+    """
+    if backend in _loaded:
+        return _loaded[backend]
+    for name in [backend] if backend else list(BACKENDS):
+        try:
+            parser = _loaded[name] if name in _loaded else BACKENDS[name]()
+        except ImportError:
+            if backend:
+                raise
+            continue
+        _loaded[name] = _loaded[backend] = parser
+        logger.info(f"HTML 파서 백엔드: {name}")
+        return parser
+    raise ImportError("사용 가능한 HTML 파서 백엔드가 없습니다.")
+
+
+def available_backends():
+    """현재 환경에서 사용 가능한 백엔드 이름 목록을 반환하는 함수"""
+    names = []
+    for name in BACKENDS:
+        try:
+            get_parser(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def _tag_re(tag, *classes):
+    """
+    CSS의 tag.class 선택자와 같은 의미로 여는 태그를 찾는 정규표현식 조각을 만드는 함수.
+
+    클래스 순서, 추가 클래스, 다른 속성의 위치와 관계없이 지정한 클래스를 모두 가진 태그에 일치한다.
+    """
+    lookaheads = "".join(rf'(?=[^>]*?\sclass="(?:[^"]*\s)?{c}[\s"])' for c in classes)
+    return rf"<{tag}(?=[\s>]){lookaheads}[^>]*>"
+
+
+# 내장 JSON 추출 모드에서 사용하는 정규표현식 (DOM 트리를 만들지 않고 한 번의 탐색으로 추출)
+ITEM_START_RE = re.compile(_tag_re("div", "itemUnit")) # 도서 항목의 시작 위치
+ORD_GOODS_OPT_RE = re.compile(r'<input(?=[^>]*?\sid="ordOpt_\d+")[^>]*?\svalue="([^"]*)"') # 숨겨진 ORD_GOODS_OPT 입력의 JSON 값
+FIELD_RES = { # 필드 -> (여는 태그를 찾을 때 기준으로 삼을 클래스 이름, 필드 텍스트를 추출하는 정규표현식)
+    "author": ("info_auth", re.compile(_tag_re("span", "authPub", "info_auth") + r"(.*?)</span>", re.S)),
+    "publisher": ("info_pub", re.compile(_tag_re("span", "authPub", "info_pub") + r"(.*?)</span>", re.S)),
+    "date": ("info_date", re.compile(_tag_re("span", "authPub", "info_date") + r"(.*?)</span>", re.S)),
+    "rating": ("rating_grade", re.compile(_tag_re("span", "rating_grade") + ".*?" + _tag_re("em", "yes_b") + r"(.*?)</em>", re.S)),
+    "review": ("rating_rvCount", re.compile(_tag_re("span", "rating_rvCount") + ".*?" + _tag_re("em", "txC_blue") + r"(.*?)</em>", re.S)),
+    "sales": ("saleNum", re.compile(_tag_re("span", "saleNum") + r"(.*?)</span>", re.S)),
+}
+TAG_RE = re.compile(r"<[^>]+>") # HTML 태그 제거용
+
+
+def _search_tag(token, pattern, text):
+    """
+    pattern.search(text)와 같은 결과를 반환하되, token(클래스 이름)이 나오는 위치를 감싼 태그에서만 pattern을 맞춰보는 함수.
+
+    여는 태그 정규표현식을 모든 태그 위치에서 시도하지 않고 문자열 탐색으로 후보 위치를 먼저 찾는다.
+    """
+    pos = text.find(token)
+    while pos != -1:
+        start = text.rfind("<", 0, pos) # token을 감싼 태그의 시작 위치
+        m = pattern.match(text, start) if start != -1 else None
+        if m:
+            return m
+        pos = text.find(token, pos + 1)
+    return None
+
+
+def _strip_tags(fragment):
+    """HTML 조각에서 태그를 제거하고 엔티티를 해제한 텍스트를 반환하는 함수"""
+    return htmllib.unescape(TAG_RE.sub("", fragment)).strip()
+
+
+def _unescape_attr(value):
+    """
+    속성 값의 HTML 엔티티를 해제하는 함수.
+
+    ORD_GOODS_OPT 값은 대부분 &quot;, &lt;, &gt;로만 이스케이프되어 있으므로 문자열 치환으로 먼저 처리하고,
+    그 외의 엔티티가 남아 있을 때만 html.unescape를 사용한다.
+    """
+    value = value.replace("&quot;", '"').replace("&lt;", "<").replace("&gt;", ">")
+    return htmllib.unescape(value) if "&" in value else value
+
+
+def _decode_blobs(blobs):
+    """
+    여러 개의 JSON 문자열을 한 번에 해석하는 함수.
+
+    하나의 JSON 배열로 이어 붙여 json.loads를 한 번만 호출하고,
+    형식이 깨진 값이 섞여 있으면 개별 해석으로 전환하여 실패한 값만 None으로 둔다.
+    """
+    try:
+        return json.loads("[" + ",".join(blobs) + "]")
+    except ValueError:
+        decoded = []
+        for blob in blobs:
+            try:
+                decoded.append(json.loads(blob))
+            except ValueError:
+                decoded.append(None)
+        return decoded
+
+
+def parse_embedded(html, backend=None):
+    """
+    각 도서 항목에 숨겨진 ORD_GOODS_OPT JSON에서 도서 정보를 추출하는 함수.
+
+    도서명, 상품 번호, 판매가, 정가, 할인율은 JSON에서 가져오고, JSON에 없는 저자 표기, 출판사,
+    출판일, 별점, 리뷰 수, 판매지수만 해당 항목의 HTML 조각에서 정규표현식으로 읽는다.
+    JSON이 없거나 해석할 수 없는 항목은 DOM 파서 백엔드로 해당 항목만 다시 파싱한다.
+
+    Args:
+        html (str): 카테고리 상품 목록 HTML.
+        backend (str): DOM 대체 파싱에 사용할 백엔드 이름 (None이면 자동 선택).
+
+    Returns:
+        list: DOM 파서와 같은 형식의 도서 정보 딕셔너리 리스트.
+    """
+    starts = [m.start() for m in ITEM_START_RE.finditer(html)]
+    segments = [html[start:end] for start, end in zip(starts, starts[1:] + [len(html)])]
+    matches = [ORD_GOODS_OPT_RE.search(segment) for segment in segments]
+    decoded = iter(_decode_blobs([_unescape_attr(m.group(1)) for m in matches if m]))
+    opts = [next(decoded) if m else None for m in matches]
+
+    data = []
+    for segment, match, opt in zip(segments, matches, opts):
+        if not opt:
+            data.extend(get_parser(backend)(segment)) # 내장 JSON이 없는 항목은 DOM으로 파싱
+            continue
+        body = segment[:match.start()] # 필드는 ORD_GOODS_OPT 입력 앞에만 있음 (마지막 항목 뒤의 목록 밖 내용 제외)
+        try:
+            texts = {}
+            for field, (token, pattern) in FIELD_RES.items():
+                m = _search_tag(token, pattern, body)
+                texts[field] = _strip_tags(m.group(1)) if m else None
+            goods_no = str(opt["goods_no"])
+            sale_price = int(opt["salePrice"])
+            shop_price = int(opt["shopPrice"])
+            discount = round((shop_price - sale_price) * 100 / shop_price) if shop_price else 0
+            data.append({
+                "Goods No": goods_no,
+                "Title": opt["goods_name"],
+                "Author": texts["author"].replace(" 저", "") if texts["author"] is not None else "",
+                "Publisher": texts["publisher"] or "",
+                "Publish Date": texts["date"] or "",
+                "Price": str(sale_price),
+                "Rating": texts["rating"] if texts["rating"] is not None else "0.0",
+                "Review Count": texts["review"] if texts["review"] is not None else "0",
+                "Detail URL": f"{BASE_DOMAIN}/product/goods/{goods_no}",
+                "List Price": str(shop_price),
+                "Discount Rate": str(discount),
+                "Sales Index": sales_index(texts["sales"]),
+            })
+        except Exception as e:
+            logger.warning(f"항목 파싱 중 오류 발생: {e}")
+            inc("parse_failures_total", mode="embedded")
+    return data
+
+
+def parse_listing(html, backend=None, mode="embedded"):
+    """
+    카테고리 목록 HTML을 선택한 추출 방식으로 파싱하는 함수 (파싱 프로세스 풀의 작업자에서도 그대로 호출).
+
+    Args:
+        html (str): 카테고리 상품 목록 HTML.
+        backend (str): 파서 백엔드 이름 (None이면 자동 선택).
+        mode (str): 'embedded'(항목별 ORD_GOODS_OPT JSON 우선) 또는 'dom'(필드별 DOM 탐색).
+
+    Returns:
+        list: 도서 정보 딕셔너리 리스트.
+    """
+    if mode == "embedded":
+        return parse_embedded(html, backend)
+    return get_parser(backend)(html)
+
+
+PAGINATION_RE = re.compile(r'<div class="yesUI_pagen[^"]*"[^>]*>(.*?)</div>', re.S) # 페이지 이동 영역
+PAGE_NUMBER_RE = re.compile(r'[?&;]page=(\d+)|>\s*(\d+)\s*<') # 페이지 이동 링크의 페이지 번호
+
+
+def parse_page_count(html):
+    """
+    상품 목록 HTML의 페이지 이동 영역에서 전체 페이지 수를 읽는 함수.
+
+    '맨끝' 링크를 포함한 페이지 이동 링크의 번호 중 가장 큰 값을 전체 페이지 수로 본다.
+
+    Args:
+        html (str): 카테고리 상품 목록 HTML.
+
+    Returns:
+        int: 전체 페이지 수. 페이지 이동 영역이 없으면 None.
+    """
+    m = PAGINATION_RE.search(html)
+    if not m:
+        return None
+    numbers = [int(a or b) for a, b in PAGE_NUMBER_RE.findall(m.group(1))]
+    return max(numbers) if numbers else None
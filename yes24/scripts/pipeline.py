@@ -0,0 +1,99 @@
+import os # 작업자 프로세스 id 확인을 위한 os 라이브러리 임포트
+import time # 작업자 프로세스의 파싱 시간 측정을 위한 time 라이브러리 임포트
+import zlib # 대기 중인 HTML 압축을 위한 zlib 라이브러리 임포트
+from collections import deque # 입력 순서를 유지하는 파싱 대기열을 위한 deque 임포트
+from concurrent.futures import ProcessPoolExecutor # 여러 CPU 코어에서 파싱하기 위한 프로세스 풀 임포트
+from metrics import METRICS # 작업자 프로세스의 파싱 구간과 카운터를 기록할 지표 저장소 임포트
+from parsers import parse_listing # 추출 방식별 목록 파싱 함수 임포트
+
+# 설정
+COMPRESS_LEVEL = 1 # 대기열의 HTML 압축 수준 (가장 빠른 수준으로도 목록 HTML은 수 분의 1로 줄어듦)
+
+
+def _parse_payload(payload, backend, mode):
+    """
+    작업자 프로세스에서 (압축된) HTML 하나를 파싱하는 함수.
+
+    Returns:
+        tuple: (도서 목록, 시작 시각, 소요 시간(초), 프로세스 id, 이 파싱에서 늘어난 카운터).
+    """
+    before = METRICS.counter_values()
+    start, clock = time.time(), time.perf_counter()
+    html = zlib.decompress(payload).decode("utf-8") if isinstance(payload, bytes) else payload
+    books = parse_listing(html, backend, mode)
+    seconds = time.perf_counter() - clock
+    delta = {key: value - before.get(key, 0) for key, value in METRICS.counter_values().items() if value != before.get(key, 0)}
+    return books, start, seconds, os.getpid(), delta
+
+
+class ParsePipeline:
+    """
+    페이지 수집과 HTML 파싱을 분리하여 파싱을 여러 프로세스에서 수행하는 파이프라인.
+
+    수집 엔진이 내보내는 (작업, (HTML, 변경 여부)) 결과를 받아 HTML을 (압축하여) 프로세스 풀에 넘기고,
+    파싱이 끝난 결과를 입력 순서대로 내보낸다. 파싱을 기다리거나 진행 중인 페이지가 max_pending개에 이르면
+    가장 오래된 페이지의 파싱이 끝날 때까지 다음 결과를 받지 않으므로, 수집 엔진의 대기열도 함께 멈춰
+    (backpressure) 메모리에 쌓이는 HTML은 max_pending과 수집 엔진의 대기열 크기로 제한된다.
+
+    작업자 프로세스의 파싱 시간과 파싱 실패 수는 결과와 함께 돌려받아 메인 프로세스의 지표에 기록한다.
+
+    Args:
+        workers (int): 파싱 프로세스 수.
+        backend (str): 파서 백엔드 이름 (None이면 작업자마다 자동 선택).
+        mode (str): 추출 방식 ('embedded' 또는 'dom').
+        max_pending (int): 파싱을 기다리거나 진행 중인 최대 페이지 수 (None이면 workers의 2배).
+        compress (bool): 대기 중인 HTML과 프로세스 간 전달 데이터를 zlib으로 압축할지 여부.
+        parse_unchanged (bool): 변경 없는(304) 페이지도 파싱할지 여부 (저장된 레코드를 재사용하는 증분 수집에서는 False).
+    """
+
+    def __init__(self, workers, backend=None, mode="embedded", max_pending=None, compress=True, parse_unchanged=True):
+        self.backend = backend
+        self.mode = mode
+        self.max_pending = max_pending or workers * 2
+        self.compress = compress
+        self.parse_unchanged = parse_unchanged
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+
+    def _finish(self, task, payload, changed, future):
+        """파싱 결과를 기다려 (작업, (HTML, 변경 여부), 도서 목록)으로 반환하는 함수"""
+        if future is None:
+            return task, (payload, changed), None
+        books, start, seconds, pid, counters = future.result()
+        METRICS.record_span("parse", start, seconds, pid=pid, tid=pid)
+        for (name, labels), value in counters.items():
+            METRICS.inc(name, value, **dict(labels))
+        html = zlib.decompress(payload).decode("utf-8") if isinstance(payload, bytes) else payload
+        return task, (html, changed), books
+
+    def map(self, results):
+        """
+        수집 결과를 파싱하여 입력 순서대로 내보내는 제너레이터.
+
+        Args:
+            results (iterable): (작업, (HTML, 변경 여부)) 튜플 (ConcurrentFetcher.fetch의 결과).
+
+        Yields:
+            tuple: (작업, (HTML, 변경 여부), 도서 목록). 요청에 실패했거나 파싱하지 않은 페이지의 도서 목록은 None.
+        """
+        pending = deque() # (작업, HTML 또는 압축된 HTML, 변경 여부, 파싱 future)
+        for task, (html, changed) in results:
+            if html is not None and (changed or self.parse_unchanged):
+                payload = zlib.compress(html.encode("utf-8"), COMPRESS_LEVEL) if self.compress else html
+                pending.append((task, payload, changed, self.executor.submit(_parse_payload, payload, self.backend, self.mode)))
+            else:
+                pending.append((task, html, changed, None))
+            METRICS.set_max("parse_queue_peak", len(pending))
+            # 대기열이 가득 차면 가장 오래된 페이지를 기다리고(backpressure), 이미 끝난 페이지는 바로 내보냄
+            while pending and (len(pending) >= self.max_pending or pending[0][3] is None or pending[0][3].done()):
+                yield self._finish(*pending.popleft())
+        while pending:
+            yield self._finish(*pending.popleft())
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,217 @@
+import glob # 이전 캐시 파일 정리를 위한 glob 라이브러리 임포트
+import hashlib # 원본 데이터 내용 해시 계산을 위한 hashlib 라이브러리 임포트
+import json # 파일별 해시 색인 저장을 위한 json 라이브러리 임포트
+import os # 파일 경로 조작을 위한 os 라이브러리 임포트
+import numpy as np # 구간 계산을 위한 numpy 라이브러리 임포트
+import pandas as pd # 데이터 전처리를 위한 pandas 라이브러리 임포트
+from loguru import logger # 로그 기록을 위한 loguru 라이브러리 임포트
+from dataset import books_path, dataset_files, read_books # 도서 데이터 경로 및 로드 함수 임포트
+
+# 설정
+PREPROCESS_VERSION = 2 # 전처리 결과가 바뀌도록 preprocess()를 수정하면 올려서 기존 캐시를 무효화
+CACHE_DIR = "yes24/data/processed" # 전처리 결과 캐시(Feather) 저장 폴더
+NUMERIC_COLUMNS = ["Price", "List Price", "Discount Rate", "Review Count", "Rating", "Sales Index"] # 쉼표 등을 제거하고 숫자로 변환할 열
+PUBLISH_DATE_PATTERN = r"(?P<Year>\d{4})년\s*(?P<Month>\d{1,2})월" # 'YYYY년 MM월' 형식의 출판일
+
+
+def _on_uniques(series, fn):
+    """
+    열의 고유값에만 fn을 적용하고 결과를 전체 행으로 펼치는 함수.
+
+    가격, 리뷰 수, 출판일 문자열은 행 수에 비해 고유값이 매우 적으므로, 문자열 처리를 고유값에만 수행하고
+    factorize 코드로 펼치면 행 수가 수백만 건이어도 문자열 연산 비용은 고유값 수에만 비례한다.
+
+    Args:
+        series (pd.Series): 변환할 열.
+        fn (callable): 고유값 Series를 받아 같은 길이의 float64 배열(또는 열이 여러 개인 DataFrame)을 반환하는 함수.
+
+    Returns:
+        np.ndarray: 각 행에 해당하는 변환 결과 (결측값은 NaN).
+    """
+    codes, uniques = pd.factorize(series) # 결측값의 코드는 -1
+    values = np.asarray(fn(pd.Series(uniques)), dtype="float64")
+    nan_row = np.full((1,) + values.shape[1:], np.nan)
+    return np.concatenate([values, nan_row]).take(codes, axis=0) # 코드 -1은 마지막에 붙인 NaN 행을 가리킴
+
+
+def to_number(series):
+    """
+    문자열 열에서 숫자와 소수점 이외의 문자(쉼표, 통화 기호 등)를 제거하고 실수형으로 변환하는 함수.
+
+    이미 숫자형인 열은 실수형으로만 변환하며, 해석할 수 없는 값은 NaN이 된다.
+
+    Args:
+        series (pd.Series): 변환할 열.
+
+    Returns:
+        pd.Series: float64 타입의 열.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype("float64")
+    def clean(uniques):
+        cleaned = uniques.astype(str).str.replace(r"[^\d.]", "", regex=True)
+        return pd.to_numeric(cleaned, errors="coerce")
+
+    return pd.Series(_on_uniques(series, clean), index=series.index)
+
+
+def publish_year_month(df):
+    """
+    출판 연도와 월을 정수 열로 추출하는 함수 (알 수 없는 값은 0).
+
+    'Publish Month' 날짜 열(Parquet 데이터셋)이 있으면 그 값을 사용하고,
+    없으면 'Publish Date' 문자열에서 정규식으로 한 번에 추출한다.
+
+    Args:
+        df (pd.DataFrame): 도서 데이터.
+
+    Returns:
+        pd.DataFrame: 'Year', 'Month' 열을 가진 DataFrame.
+    """
+    if "Publish Month" in df.columns:
+        month = pd.to_datetime(df["Publish Month"])
+        parts = pd.DataFrame({"Year": month.dt.year, "Month": month.dt.month}, index=df.index)
+    else:
+        def extract(uniques):
+            return uniques.astype(str).str.extract(PUBLISH_DATE_PATTERN).apply(pd.to_numeric, errors="coerce")
+
+        parts = pd.DataFrame(_on_uniques(df["Publish Date"], extract), columns=["Year", "Month"], index=df.index)
+    return parts.fillna(0).astype(int)
+
+
+def price_range(price, width=10000):
+    """가격을 width원 단위 구간의 시작 값으로 변환하는 함수 (예: 18000 → 10000)"""
+    return (price // width) * width
+
+
+def rating_range(rating):
+    """별점의 정수 부분을 구간으로 반환하는 함수 (예: 9.8 → 9, 별점이 없으면 0)"""
+    return np.trunc(rating.astype("float64")).fillna(0).astype(int)
+
+
+def preprocess(df):
+    """
+    도서 데이터의 숫자형 변환과 출판 연월 파생 변수 생성을 한 번에 수행하는 함수.
+
+    모든 변환은 열 단위(벡터화) 연산으로 처리하므로 행 수가 수백만 건이어도 행별 함수 호출이 없다.
+
+    Args:
+        df (pd.DataFrame): read_books()로 읽은 도서 데이터.
+
+    Returns:
+        pd.DataFrame: NUMERIC_COLUMNS('Price', 'Rating', 'Sales Index' 등)가 실수형으로 변환되고
+                      'Year', 'Month' 열이 추가된 새 DataFrame.
+    """
+    df = df.copy()
+    for column in NUMERIC_COLUMNS:
+        if column in df.columns:
+            df[column] = to_number(df[column])
+    if "Publish Month" in df.columns or "Publish Date" in df.columns:
+        df[["Year", "Month"]] = publish_year_month(df)
+    return df
+
+
+def _file_digest(path, index):
+    """
+    파일 내용의 sha1 해시를 반환하는 함수.
+
+    크기와 수정 시각이 색인에 기록된 값과 같으면 저장된 해시를 재사용하고, 다르면 파일을 다시 읽어 계산한다.
+
+    Args:
+        path (str): 파일 경로.
+        index (dict): 파일 경로별 [크기, 수정 시각(ns), 해시] 색인 (갱신됨).
+
+    Returns:
+        str: sha1 해시 문자열.
+    """
+    stat = os.stat(path)
+    cached = index.get(path)
+    if cached and cached[:2] == [stat.st_size, stat.st_mtime_ns]:
+        return cached[2]
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    index[path] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+    return index[path][2]
+
+
+def file_digests(path, cache_dir=CACHE_DIR):
+    """
+    원본 데이터(CSV 파일 또는 파티션 데이터셋 폴더)를 이루는 파일별 내용 해시를 계산하는 함수.
+
+    Args:
+        path (str): CSV 파일 또는 데이터셋 폴더 경로.
+        cache_dir (str): 파일별 해시 색인을 저장할 폴더 경로.
+
+    Returns:
+        dict: 파일 경로별 sha1 해시 문자열 (경로 순서대로 정렬).
+    """
+    index_path = os.path.join(cache_dir, "_digests.json")
+    index = {}
+    if os.path.exists(index_path):
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+    files = [path] if os.path.isfile(path) else dataset_files(path)
+    digests = {file: _file_digest(file, index) for file in files}
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(index_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({file: entry for file, entry in index.items() if os.path.exists(file)}, f) # 삭제된 파일의 항목은 정리
+    os.replace(index_path + ".tmp", index_path)
+    return digests
+
+
+def source_digest(path, cache_dir=CACHE_DIR):
+    """
+    원본 데이터(CSV 파일 또는 파티션 데이터셋 폴더)의 내용 해시를 계산하는 함수.
+
+    데이터셋 폴더는 모든 조각 파일의 상대 경로와 내용 해시를 합쳐 계산하므로,
+    어느 조각 파일이 추가, 삭제, 수정되어도 해시가 바뀐다.
+
+    Args:
+        path (str): CSV 파일 또는 데이터셋 폴더 경로.
+        cache_dir (str): 파일별 해시 색인을 저장할 폴더 경로.
+
+    Returns:
+        str: sha1 해시 문자열.
+    """
+    digest = hashlib.sha1()
+    for file, file_hash in file_digests(path, cache_dir).items():
+        digest.update(f"{os.path.relpath(file, path)}:{file_hash}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_preprocessed(path=None, columns=None, cache_dir=CACHE_DIR):
+    """
+    전처리가 끝난 도서 데이터를 읽는 함수 (원본 내용 해시와 전처리 버전을 키로 캐시).
+
+    같은 원본과 같은 전처리 버전의 캐시 파일이 있으면 원본을 파싱하거나 정리하지 않고
+    Feather 파일을 메모리 매핑으로 읽는다. 없으면 전체 열을 읽어 preprocess()를 적용한 뒤 캐시로 저장하며,
+    같은 원본 경로의 이전 캐시 파일(원본이 바뀌어 더 이상 쓰이지 않는 파일)은 삭제한다.
+
+    Args:
+        path (str): CSV 파일 또는 데이터셋 폴더 경로 (None이면 books_path() 사용).
+        columns (list): 반환할 열 이름 목록 (None이면 전체).
+        cache_dir (str): 캐시 파일을 저장할 폴더 경로.
+
+    Returns:
+        pd.DataFrame: preprocess()가 적용된 도서 데이터.
+    """
+    import pyarrow.feather as feather # Feather 입출력은 pyarrow 사용
+
+    path = path or books_path()
+    source = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:8] # 원본 경로별로 캐시 파일을 구분
+    key = hashlib.sha1(f"{source_digest(path, cache_dir)}:v{PREPROCESS_VERSION}".encode("utf-8")).hexdigest()
+    cache_path = os.path.join(cache_dir, f"books-{source}-{key[:16]}.feather")
+    if os.path.exists(cache_path):
+        logger.info(f"전처리 캐시 사용: {cache_path}")
+        return feather.read_table(cache_path, columns=columns, memory_map=True).to_pandas()
+
+    df = preprocess(read_books(path)).reset_index(drop=True)
+    feather.write_feather(df, cache_path + ".tmp")
+    os.replace(cache_path + ".tmp", cache_path) # 쓰기 도중 중단되어도 불완전한 캐시가 남지 않도록 교체 방식으로 저장
+    for stale in glob.glob(os.path.join(cache_dir, f"books-{source}-*.feather")): # 같은 원본의 이전 캐시 정리
+        if stale != cache_path:
+            os.remove(stale)
+    logger.info(f"전처리 캐시 생성: {cache_path} ({len(df)}행)")
+    return df[columns] if columns else df
@@ -0,0 +1,248 @@
+import argparse # 명령행 인자 처리를 위한 argparse 라이브러리 임포트
+import hashlib # 응답 ETag 계산을 위한 hashlib 라이브러리 임포트
+import random # 오류/지연 응답을 무작위로 주입하기 위한 random 라이브러리 임포트
+import re # 픽스처에서 도서 항목을 분리하기 위한 정규표현식 라이브러리 임포트
+import threading # 백그라운드 서버 실행 및 통계 동기화를 위한 threading 라이브러리 임포트
+import time # 느린 응답 재현을 위한 time 라이브러리 임포트
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer # 로컬 HTTP 서버 구현을 위한 http.server 임포트
+from urllib.parse import parse_qsl, urlsplit # 요청 경로와 쿼리 매개변수 해석을 위한 urllib 임포트
+from loguru import logger # 로그 기록을 위한 loguru 라이브러리 임포트
+from cache import ResponseCache, request_key # 녹화된 응답(응답 캐시) 조회 함수 임포트
+from parsers import ITEM_START_RE # 도서 항목 시작 위치 정규표현식 임포트
+
+# 설정
+RECORDED_URL = "https://www.yes24.com/product/category/CategoryProductContents" # 녹화된 응답의 캐시 키를 만들 때 쓰는 원래 요청 URL
+FIXTURE_FILE = "yes24/data/fixtures/category_page.html" # 합성 페이지를 만들 도서 항목 원본 HTML
+DETAIL_FIXTURE_FILE = "yes24/data/fixtures/detail_page.html" # 상세 페이지 요청(/product/goods/<상품 번호>)에 반환할 HTML
+PAGE_SIZE = 120 # 요청에 size 매개변수가 없을 때 합성 페이지의 도서 수
+TOTAL_PAGES = 10 # 합성 페이지의 전체 페이지 수 (페이지 이동 영역에 표시)
+GOODS_NO_START = 200_000_000 # 합성 도서의 상품 번호 시작 값 (실제 상품 번호와 겹치지 않는 범위)
+
+
+def load_items(path=FIXTURE_FILE):
+    """
+    저장된 카테고리 목록 HTML을 도서 항목(div.itemUnit) 단위의 HTML 조각으로 나누는 함수.
+
+    Returns:
+        list: (상품 번호, 항목 HTML) 튜플 리스트.
+    """
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    starts = [m.start() for m in ITEM_START_RE.finditer(html)]
+    end = html.rfind("</div>") # 목록 전체를 감싸는 div의 닫는 태그
+    items = []
+    for start, stop in zip(starts, starts[1:] + [end]):
+        block = html[start:stop]
+        match = re.search(r"/product/goods/(\d+)", block)
+        items.append((match.group(1) if match else None, block))
+    return items
+
+
+def synthetic_page(items, page, size, total_pages=TOTAL_PAGES, disp_no=""):
+    """
+    픽스처의 도서 항목을 반복하여 size개 도서가 들어 있는 합성 목록 페이지를 만드는 함수.
+
+    항목마다 상품 번호를 (카테고리, 페이지, 순번)에서 정해지는 고유한 값으로 바꾸므로
+    같은 요청에는 항상 같은 페이지를, 다른 페이지에는 다른 도서를 반환한다.
+
+    Args:
+        items (list): load_items()가 반환한 (상품 번호, 항목 HTML) 리스트.
+        page (int): 페이지 번호.
+        size (int): 페이지의 도서 수.
+        total_pages (int): 페이지 이동 영역에 표시할 전체 페이지 수 (page가 이보다 크면 빈 목록).
+        disp_no (str): 카테고리 번호 (카테고리별로 다른 상품 번호를 만들기 위해 사용).
+
+    Returns:
+        str: 카테고리 목록 HTML.
+    """
+    base = GOODS_NO_START + (int(hashlib.sha1(disp_no.encode()).hexdigest()[:6], 16) % 1000) * 1_000_000
+    parts = ['<div id="yesSchList" class="sGLi">\n']
+    if page <= total_pages:
+        for i in range(size):
+            original, block = items[i % len(items)]
+            goods_no = str(base + (page - 1) * size + i)
+            parts.append(block.replace(original, goods_no) if original else block)
+    parts.append("</div>\n")
+    links = "".join(f'<a href="?page={n}">{n}</a>' for n in range(1, min(total_pages, 10) + 1))
+    parts.append(f'<div class="yesUI_pagenS">{links}<a class="bgYUI end" href="?page={total_pages}">맨끝</a></div>\n')
+    return "".join(parts)
+
+
+class ReplayServer:
+    """
+    예스24 카테고리 목록 요청(CategoryProductContents)을 흉내 내는 로컬 재생 서버.
+
+    녹화된 응답(스크래퍼의 응답 캐시 폴더)에 같은 요청 매개변수의 응답이 있으면 그대로 재생하고,
+    없으면 픽스처 항목으로 만든 합성 페이지를 반환한다. 상세 페이지 요청(/product/goods/<상품 번호>)에는
+    상세 페이지 픽스처를 반환한다. 모든 응답에 본문 해시 ETag를 붙이고
+    If-None-Match가 같으면 304로 응답한다.
+
+    요청마다 error_rate 확률로 429/503 응답(Retry-After 포함)을, slow_rate 확률로 slow_seconds만큼 늦은 응답을 주입하며,
+    난수 시드가 같으면 같은 순서의 요청에 같은 오류가 발생한다.
+
+    Args:
+        recordings (str): 녹화된 응답이 있는 응답 캐시 폴더 경로 (None이면 합성 페이지만 사용).
+        fixture (str): 합성 페이지에 쓸 도서 항목 원본 HTML 경로.
+        total_pages (int): 합성 페이지의 전체 페이지 수.
+        page_size (int): 합성 페이지의 도서 수 (None이면 요청의 size 매개변수를 따름).
+        latency (float): 모든 응답에 더할 지연 시간(초).
+        error_rate (float): 429/503 응답을 주입할 확률.
+        slow_rate (float): 느린 응답을 주입할 확률.
+        slow_seconds (float): 느린 응답의 추가 지연 시간(초).
+        retry_after (int): 오류 응답의 Retry-After 헤더 값(초).
+        seed (int): 오류/지연 주입 난수 시드.
+        host (str): 바인딩할 주소.
+        port (int): 바인딩할 포트 (0이면 빈 포트 자동 선택).
+        detail_fixture (str): 상세 페이지 요청에 반환할 HTML 경로.
+    """
+
+    def __init__(self, recordings=None, fixture=FIXTURE_FILE, total_pages=TOTAL_PAGES, page_size=None, latency=0.0,
+                 error_rate=0.0, slow_rate=0.0, slow_seconds=1.0, retry_after=1, seed=0, host="127.0.0.1", port=0,
+                 detail_fixture=DETAIL_FIXTURE_FILE):
+        self.recordings = ResponseCache(recordings) if recordings else None
+        self.items = load_items(fixture)
+        with open(detail_fixture, encoding="utf-8") as f:
+            self.detail_html = f.read()
+        self.total_pages = total_pages
+        self.page_size = page_size
+        self.latency = latency
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_seconds = slow_seconds
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "ok": 0, "not_modified": 0, "errors": 0, "slow": 0, "replayed": 0, "synthetic": 0, "details": 0}
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """스크래퍼의 BASE_URL로 쓸 요청 주소"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/product/category/CategoryProductContents"
+
+    @property
+    def detail_url(self):
+        """상세 페이지 보강의 DETAIL_URL로 쓸 주소 형식"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/product/goods/{{goods_no}}"
+
+    def _count(self, *names):
+        with self.lock:
+            for name in names:
+                self.stats[name] += 1
+
+    def _fault(self):
+        """이번 요청에 주입할 (오류 상태 코드, 추가 지연 시간)을 정하는 함수"""
+        with self.lock:
+            error = self.random.random() < self.error_rate
+            status = self.random.choice((429, 503)) if error else None
+            slow = self.random.random() < self.slow_rate
+        return status, self.slow_seconds if slow else 0.0
+
+    def body(self, path, params):
+        """요청 경로와 매개변수에 해당하는 응답 본문 (녹화된 응답 우선, 없으면 합성 페이지)"""
+        if path.startswith("/product/goods/"):
+            self._count("details")
+            return self.detail_html
+        if self.recordings:
+            key = request_key(RECORDED_URL, params)
+            if self.recordings.meta(key) is not None:
+                self._count("replayed")
+                return self.recordings.load(key)
+        self._count("synthetic")
+        size = self.page_size or int(params.get("size") or PAGE_SIZE)
+        return synthetic_page(self.items, int(params.get("page") or 1), size, self.total_pages, params.get("dispNo", ""))
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" # keep-alive 연결 재사용
+
+            def do_GET(self):
+                server._count("requests")
+                status, delay = server._fault()
+                time.sleep(server.latency + delay)
+                if delay:
+                    server._count("slow")
+                if status:
+                    server._count("errors")
+                    self.send_response(status)
+                    self.send_header("Retry-After", str(server.retry_after))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                url = urlsplit(self.path)
+                body = server.body(url.path, dict(parse_qsl(url.query, keep_blank_values=True))).encode("utf-8")
+                etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+                if self.headers.get("If-None-Match") == etag: # 조건부 요청: 변경 없음
+                    server._count("not_modified")
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                server._count("ok")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args): # 요청마다 표준 오류로 출력하지 않음
+                pass
+
+        return Handler
+
+    def start(self):
+        """백그라운드 스레드에서 서버를 시작하는 함수"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """서버를 종료하는 함수"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    """재생 서버를 포그라운드로 실행하는 메인 함수 (스크래퍼의 BASE_URL을 출력된 주소로 바꿔 사용)"""
+    parser = argparse.ArgumentParser(description="예스24 카테고리 목록 응답 재생 서버")
+    parser.add_argument("--port", type=int, default=8765, help="바인딩할 포트")
+    parser.add_argument("--recordings", default=None, help="재생할 녹화 응답 폴더 (스크래퍼의 응답 캐시 폴더, 예: yes24/data/cache/http)")
+    parser.add_argument("--fixture", default=FIXTURE_FILE, help="합성 페이지를 만들 도서 항목 원본 HTML")
+    parser.add_argument("--pages", type=int, default=TOTAL_PAGES, help="합성 페이지의 전체 페이지 수")
+    parser.add_argument("--page-size", type=int, default=None, help="합성 페이지의 도서 수 (지정하지 않으면 요청의 size)")
+    parser.add_argument("--latency", type=float, default=0.0, help="모든 응답에 더할 지연 시간(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429/503 응답을 주입할 확률")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="느린 응답을 주입할 확률")
+    parser.add_argument("--slow-seconds", type=float, default=1.0, help="느린 응답의 추가 지연 시간(초)")
+    parser.add_argument("--retry-after", type=int, default=1, help="오류 응답의 Retry-After 값(초)")
+    parser.add_argument("--seed", type=int, default=0, help="오류/지연 주입 난수 시드")
+    args = parser.parse_args()
+
+    server = ReplayServer(args.recordings, args.fixture, args.pages, args.page_size, args.latency, args.error_rate,
+                          args.slow_rate, args.slow_seconds, args.retry_after, args.seed, port=args.port)
+    logger.info(f"재생 서버 시작: {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        logger.info(f"재생 서버 종료: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+import heapq # 우선순위 작업 대기열을 위한 heapq 라이브러리 임포트
+import json # 작업 명세(manifest) 및 상태 파일 처리를 위한 json 라이브러리 임포트
+import os # 파일 경로 조작을 위한 os 라이브러리 임포트
+import time # 작업 소요 시간 기록을 위한 time 라이브러리 임포트
+from loguru import logger # 로그 기록을 위한 loguru 라이브러리 임포트
+
+
+class CrawlJob:
+    """
+    하나의 카테고리/정렬 기준에 대한 수집 작업과 그 진행 상태.
+
+    Args:
+        disp_no (str): 카테고리 번호.
+        order (str): 정렬 기준 (예: 'SINDEX_ONLY').
+        page_start (int): 수집을 시작할 페이지 번호.
+        page_end (int): 수집할 마지막 페이지 번호 상한 (None이면 첫 응답에서 확인한 전체 페이지 수까지).
+        priority (int): 우선순위 (값이 작을수록 먼저 수집).
+    """
+
+    def __init__(self, disp_no, order="SINDEX_ONLY", page_start=1, page_end=None, priority=0):
+        self.disp_no = str(disp_no)
+        self.order = order
+        self.page_start = page_start
+        self.page_end = page_end
+        self.priority = priority
+        self.page_count = None # 첫 응답에서 확인한 실제 전체 페이지 수
+        self.status = "pending" # pending → running → done / partial / failed
+        self.pages_done = 0
+        self.items = 0
+        self.failed_pages = []
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def job_id(self):
+        """작업 식별자 (카테고리 번호와 정렬 기준 조합)"""
+        return f"{self.disp_no}:{self.order}"
+
+    @property
+    def partition(self):
+        """결과를 저장할 파티션 경로 (Hive 형식의 key=value 폴더)"""
+        return os.path.join(f"disp_no={self.disp_no}", f"order={self.order}")
+
+    @property
+    def last_page(self):
+        """실제로 수집할 마지막 페이지 번호"""
+        if self.page_count is None:
+            return self.page_end if self.page_end is not None else self.page_start
+        return min(self.page_count, self.page_end) if self.page_end is not None else self.page_count
+
+    def to_dict(self):
+        """상태 파일 저장용 딕셔너리로 변환하는 함수"""
+        return {
+            "dispNo": self.disp_no,
+            "order": self.order,
+            "priority": self.priority,
+            "status": self.status,
+            "pageStart": self.page_start,
+            "pageEnd": self.page_end,
+            "pageCount": self.page_count,
+            "pagesDone": self.pages_done,
+            "items": self.items,
+            "failedPages": self.failed_pages,
+            "elapsed": round(self.finished_at - self.started_at, 2) if self.finished_at and self.started_at else None,
+        }
+
+
+def load_manifest(path, default_start=1, default_end=None):
+    """
+    작업 명세(manifest) JSON 파일을 읽어 수집 작업 목록을 만드는 함수.
+
+    파일은 {"dispNo", "order", "pageStart", "pageEnd", "priority"} 객체의 리스트이며,
+    dispNo 외의 항목은 생략할 수 있다.
+
+    Args:
+        path (str): 작업 명세 파일 경로.
+        default_start (int): pageStart가 없을 때 사용할 시작 페이지.
+        default_end (int): pageEnd가 없을 때 사용할 마지막 페이지 상한.
+
+    Returns:
+        list: CrawlJob 리스트.
+
+    Raises:
+        ValueError: 같은 카테고리/정렬 기준 조합이 두 번 이상 등장하는 경우.
+    """
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    jobs = []
+    seen = set()
+    for entry in entries:
+        job = CrawlJob(
+            entry["dispNo"],
+            entry.get("order", "SINDEX_ONLY"),
+            entry.get("pageStart", default_start),
+            entry.get("pageEnd", default_end),
+            entry.get("priority", 0),
+        )
+        if job.job_id in seen:
+            raise ValueError(f"작업 명세에 중복된 작업이 있습니다: {job.job_id}")
+        seen.add(job.job_id)
+        jobs.append(job)
+    return jobs
+
+
+class WorkQueue:
+    """
+    (우선순위, 작업 순번, 페이지) 순으로 꺼내지는 페이지 작업 대기열.
+
+    수집기는 대기열에서 필요한 만큼만 작업을 꺼내므로, 진행 중인 요청 수는 수집기의 동시성 한도로 제한된다.
+    """
+
+    def __init__(self):
+        self._heap = []
+
+    def push(self, job, page, rank):
+        heapq.heappush(self._heap, (job.priority, rank, page, job))
+
+    def __len__(self):
+        return len(self._heap)
+
+    def drain(self):
+        """우선순위 순서대로 (페이지, 작업)을 꺼내는 제너레이터"""
+        while self._heap:
+            _, _, page, job = heapq.heappop(self._heap)
+            yield page, job
+
+
+class JobScheduler:
+    """
+    작업 명세의 여러 카테고리 수집 작업을 하나의 동시 수집 엔진으로 실행하는 스케줄러.
+
+    1단계에서 각 작업의 첫 페이지를 우선순위 순으로 수집하여 실제 전체 페이지 수를 확인하고,
+    2단계에서 나머지 페이지를 우선순위 대기열에 넣어 수집한다. 작업별 진행 상태는 상태 파일로 기록된다.
+
+    Args:
+        jobs (list): CrawlJob 리스트.
+        fetcher (ConcurrentFetcher): 속도 제한을 지키는 동시 수집 엔진.
+        fetch_page (callable): (페이지, 카테고리 번호, 정렬 기준)을 받아 (HTML, 변경 여부)를 반환하는 함수.
+        url (str): 요청 대상 URL (호스트별 동시성 제한 판단에 사용).
+        handle_page (callable): (작업, 페이지, HTML, 변경 여부, 도서 목록)을 받아 처리하고 추출한 도서 수를 반환하는 함수.
+            도서 목록은 파싱 파이프라인이 파싱한 결과이며, 파이프라인을 쓰지 않거나 파싱하지 않은 페이지에서는 None.
+        count_pages (callable): 첫 페이지 HTML과 도서 수를 받아 전체 페이지 수를 반환하는 함수 (알 수 없으면 None).
+        status_path (str): 작업별 상태를 기록할 JSON 파일 경로.
+        completed (set): 이미 완료된 (카테고리 번호, 정렬 기준, 페이지) 집합 (이어서 수집 시 사용).
+        pipeline (ParsePipeline): 수집한 HTML을 별도 프로세스에서 파싱할 파이프라인 (None이면 handle_page에서 파싱).
+    """
+
+    def __init__(self, jobs, fetcher, fetch_page, url, handle_page, count_pages, status_path, completed=(), pipeline=None):
+        self.jobs = sorted(jobs, key=lambda job: job.priority)
+        self.fetcher = fetcher
+        self.fetch_page = fetch_page
+        self.url = url
+        self.handle_page = handle_page
+        self.count_pages = count_pages
+        self.status_path = status_path
+        self.completed = set(completed)
+        self.pipeline = pipeline
+        self._by_id = {job.job_id: job for job in self.jobs}
+
+    def _fetch(self, page, disp_no, order):
+        return self.fetch_page(page, disp_no, order)
+
+    def _run_tasks(self, tasks, on_result):
+        """(페이지, 작업) 목록을 동시 수집 엔진으로 실행하고 결과를 순서대로 처리하는 함수"""
+        fetch_tasks = ((page, job.disp_no, job.order) for page, job in tasks)
+        results = self.fetcher.fetch(self._fetch, self.url, fetch_tasks)
+        if self.pipeline is not None: # 수집과 파싱을 분리하여 파싱은 프로세스 풀에서 진행
+            results = self.pipeline.map(results)
+        else:
+            results = ((task, result, None) for task, result in results)
+        for (page, disp_no, order), (html, changed), books in results:
+            job = self._by_id[f"{disp_no}:{order}"]
+            if html is None: # 재시도 후에도 가져오지 못한 경우
+                job.failed_pages.append(page)
+                on_result(job, page, None)
+                continue
+            count = self.handle_page(job, page, html, changed, books)
+            self.completed.add((disp_no, order, page))
+            job.pages_done += 1
+            job.items += count
+            on_result(job, page, html, count)
+
+    def _on_first_page(self, job, page, html, count=0):
+        """첫 페이지 결과로 전체 페이지 수를 확인하는 함수"""
+        if html is None:
+            job.status = "failed" # 첫 페이지를 가져오지 못하면 전체 페이지 수를 알 수 없으므로 작업 실패 처리
+            job.finished_at = time.time()
+            return
+        job.page_count = self.count_pages(html, count)
+        logger.info(f"[{job.job_id}] 전체 페이지 수: {job.page_count if job.page_count is not None else '알 수 없음'}, {job.page_start}~{job.last_page}페이지 수집 예정")
+
+    def _on_page(self, job, page, html, count=0):
+        """페이지 결과를 로그로 남기는 함수"""
+        if html is not None:
+            logger.info(f"[{job.job_id}] 페이지 {page}/{job.last_page}: {count}개 도서 수집 완료")
+
+    def run(self, page_counts=None):
+        """
+        모든 작업을 실행하는 함수.
+
+        Args:
+            page_counts (dict): 이전 실행에서 확인한 작업별 전체 페이지 수 (이어서 수집 시 첫 페이지를 다시 요청하지 않음).
+
+        Returns:
+            list: 실행이 끝난 CrawlJob 리스트.
+        """
+        page_counts = page_counts or {}
+        now = time.time()
+        for job in self.jobs:
+            job.status = "running"
+            job.started_at = now
+            if job.job_id in page_counts:
+                job.page_count = page_counts[job.job_id]
+
+        # 1단계: 아직 첫 페이지를 수집하지 않은 작업의 첫 페이지 수집 (전체 페이지 수 확인)
+        first = [(job.page_start, job) for job in self.jobs if (job.disp_no, job.order, job.page_start) not in self.completed]
+        self._run_tasks(first, self._on_first_page)
+        self.write_status()
+
+        # 2단계: 나머지 페이지를 우선순위 대기열에 넣어 수집
+        queue = WorkQueue()
+        for rank, job in enumerate(self.jobs):
+            if job.status == "failed":
+                continue
+            for page in range(job.page_start, job.last_page + 1):
+                if (job.disp_no, job.order, page) not in self.completed:
+                    queue.push(job, page, rank)
+        logger.info(f"작업 {len(self.jobs)}개, 남은 페이지 {len(queue)}개 수집 시작")
+        self._run_tasks(queue.drain(), self._on_page)
+
+        now = time.time()
+        for job in self.jobs:
+            if job.status == "running":
+                job.status = "partial" if job.failed_pages else "done"
+                job.finished_at = now
+        self.write_status()
+        return self.jobs
+
+    def write_status(self):
+        """작업별 진행 상태를 JSON 파일로 기록하는 함수"""
+        os.makedirs(os.path.dirname(self.status_path) or ".", exist_ok=True)
+        with open(self.status_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump([job.to_dict() for job in self.jobs], f, ensure_ascii=False, indent=2)
+        os.replace(self.status_path + ".tmp", self.status_path)
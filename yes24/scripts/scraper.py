@@ -1,35 +1,87 @@
-import requests # HTTP 요청을 보내기 위한 라이브러리 임포트
-from bs4 import BeautifulSoup # HTML 파싱을 위한 BeautifulSoup 라이브러리 임포트
+import requests # HTTP 요청 예외 타입 처리를 위한 라이브러리 임포트
 import pandas as pd # 데이터 분석 및 처리를 위한 pandas 라이브러리 임포트
-import time # 시간 지연을 위한 time 라이브러리 임포트
-import random # 무작위 지연 시간을 생성하기 위한 random 라이브러리 임포트
 from loguru import logger # 로그 기록을 위한 loguru 라이브러리 임포트
 import os # 운영체제 및 파일 경로 조작을 위한 os 라이브러리 임포트
+import argparse # 명령행 인자(--resume 등) 처리를 위한 argparse 라이브러리 임포트
+from fetcher import AdaptiveThrottle, ConcurrentFetcher, TokenBucket # 속도 제한을 지키는 동시 수집 엔진 및 응답에 따른 속도 조절기 임포트
+from http_client import HttpClient # 연결 재사용 및 재시도를 지원하는 HTTP 클라이언트 임포트
+from cache import RecordStore, ResponseCache, request_key # 응답 캐시 및 도서별 레코드 저장소 임포트
+from parsers import parse_listing, parse_page_count # 추출 방식별 목록 파싱, 전체 페이지 수 확인 함수 임포트
+from scheduler import JobScheduler, load_manifest # 작업 명세 기반 다중 카테고리 스케줄러 임포트
+from sink import SINKS, Checkpoint, PartitionedWriter # 파티션별 스트리밍 출력기 및 체크포인트 임포트
+from snapshots import SnapshotStore # 도서별 지표 시점 기록 저장소 임포트
+from entities import EntityIndex # 상품 번호 기준 중복 제거 및 저자/출판사 색인 임포트
+from metrics import METRICS, ITEM_BUCKETS, inc, observe, span # 구간 시간/처리량 지표 기록 및 내보내기 임포트
+from pipeline import ParsePipeline # 수집과 파싱을 분리하는 프로세스 풀 파싱 파이프라인 임포트
+from details import DetailCache, enrich # 상세 페이지 보강 및 상품 번호별 상세 정보 캐시 임포트
+from dataset import read_books # 저장된 데이터셋의 상품 번호 조회 함수 임포트 (--enrich-only)
+from distributed import QUEUE_DB, SHARD_DIR, LeaseQueue, ShardWriter, default_worker_id, merge_shards, run_worker # 여러 작업자가 나누어 수집하는 공유 대기열, 작업자별 출력 조각, 병합 함수 임포트
 
 # 설정
 BASE_URL = "https://www.yes24.com/product/category/CategoryProductContents" # 예스24의 카테고리별 상품 목록 데이터를 가져올 기본 URL 주소
-DISP_NO = "001001003032" # 수집 대상 카테고리 번호 (에세이 등 특정 카테고리 식별자)
-PAGE_START = 1 # 수집을 시작할 페이지 번호
-PAGE_END = 10 # 수집을 종료할 마지막 페이지 번호
+REFERER_URL = "https://www.yes24.com/product/category/display/{disp_no}" # 카테고리별 레퍼러 헤더 주소 형식
+DISP_NO = "001001003032" # 기본 카테고리 번호 (에세이 등 특정 카테고리 식별자)
+ORDER = "SINDEX_ONLY" # 기본 정렬 기준
+MANIFEST_FILE = "yes24/crawl_manifest.json" # 수집할 카테고리/정렬 기준/페이지 범위/우선순위를 정의한 작업 명세 파일
+PAGE_START = 1 # 작업 명세에 pageStart가 없을 때 수집을 시작할 페이지 번호
+PAGE_END = 10 # 작업 명세에 pageEnd가 없을 때 수집할 마지막 페이지 번호 상한 (실제 전체 페이지 수가 더 적으면 거기까지만 수집)
 PAGE_SIZE = 120 # 한 페이지당 수집할 도서 수
 OUTPUT_DIR = "yes24/data/raw" # 결과물을 저장할 폴더 경로
-OUTPUT_FILE = "yes24_books.csv" # 결과물을 저장할 파일명
+DATASET_NAME = "yes24_books" # 결과물을 저장할 데이터셋 폴더명 (작업별로 disp_no=.../order=... 파티션에 저장)
+OUTPUT_FORMAT = "parquet" # 기본 출력 형식 ('parquet': 타입이 지정된 열 기반 저장, 'csv', 'jsonl')
+CHECKPOINT_FILE = "yes24/data/cache/checkpoint.json" # 마지막으로 완료된 카테고리/페이지를 기록할 체크포인트 파일 경로
+MAX_WORKERS = 4 # 동시에 진행할 최대 요청 수
+PER_HOST_CONCURRENCY = 2 # 한 호스트에 동시에 보낼 수 있는 최대 요청 수
+RATE_LIMIT = 1 / 1.5 # 전체 워커가 공유하는 초당 요청 수 (평균 1.5초 간격, 수집 정책의 1~2초 딜레이 준수)
+RATE_BURST = 1 # 토큰 버킷의 최대 용량 (순간적으로 몰리는 요청 방지)
+ADAPTIVE_THROTTLE = True # 응답 시간/오류율/Retry-After에 따라 요청 속도와 동시 요청 수를 자동 조절할지 여부 (RATE_LIMIT에서 시작)
+THROTTLE_MIN_RATE = 1 / 10 # 자동 조절 시 초당 요청 수 하한 (서버가 계속 오류를 반환해도 최소 10초에 한 번은 요청)
+THROTTLE_MAX_RATE = 1 / 1.0 # 자동 조절 시 초당 요청 수 상한 (수집 정책의 최소 요청 간격 1초)
+THROTTLE_LATENCY_TARGET = 3.0 # 허용할 p95 응답 시간(초), 넘으면 서버가 느려진 것으로 보고 속도를 줄임
+THROTTLE_ERROR_RATE = 0.05 # 허용할 429/5xx/네트워크 오류 비율, 넘으면 속도와 동시 요청 수를 절반으로 줄임
+THROTTLE_WINDOW = 20 # 속도를 한 번 조절하는 데 사용할 응답 수
+TIMEOUT = (5, 30) # (연결 타임아웃, 읽기 타임아웃) 초
+MAX_RETRIES = 5 # 429/5xx 및 네트워크 오류 발생 시 최대 재시도 횟수
+BACKOFF_BASE = 1.0 # 지수 백오프의 기준 대기 시간(초)
+BACKOFF_MAX = 60.0 # 한 번의 재시도 대기 시간 상한(초)
+PARSER_BACKEND = None # HTML 파서 백엔드 ('selectolax', 'lxml', 'bs4'), None이면 설치된 가장 빠른 백엔드 자동 선택
+PARSE_MODE = "embedded" # 추출 방식 ('embedded': 항목별 ORD_GOODS_OPT JSON 우선, 'dom': 필드별 DOM 탐색)
+PARSE_WORKERS = 0 # 파싱 프로세스 수 (0이면 메인 스레드에서 파싱, 동시 요청 수를 늘려 파싱이 병목이 될 때 CPU 코어 수까지 늘림)
+PARSE_QUEUE = None # 파싱을 기다리거나 진행 중인 최대 페이지 수 (None이면 파싱 프로세스 수의 2배)
+PARSE_COMPRESS = True # 파싱 대기 중인 HTML을 압축하여 보관할지 여부
+INCREMENTAL = True # 조건부 요청 캐시와 도서별 내용 해시를 사용한 증분 수집 여부
+CACHE_DIR = "yes24/data/cache/http" # 응답 본문과 ETag/Last-Modified를 저장할 폴더 경로
+RECORD_DB = "yes24/data/cache/books.sqlite" # 상품 번호별 레코드와 내용 해시를 저장할 데이터베이스 경로
+DEDUP = True # 같은 실행에서 이미 기록한 상품 번호의 도서를 다시 기록하지 않을지 여부 (페이지 간 정렬 변화, 여러 카테고리에 속한 도서)
+ENTITY_DB = "yes24/data/cache/entities.sqlite" # 도서/저자/출판사 색인과 중복 확인 기록을 저장할 데이터베이스 경로
+SNAPSHOTS = True # 가격/별점/리뷰 수/판매지수의 시점별 변경 이력 기록 여부
+SNAPSHOT_DIR = "yes24/data/snapshots" # 수집 날짜별 스냅샷 파일과 색인을 저장할 폴더 경로
+ENRICH = False # 목록 수집 후 도서별 상세 페이지(쪽수, ISBN, 카테고리, 리뷰 수)를 수집할지 여부 (--enrich로도 켤 수 있음)
+DETAIL_URL = "https://www.yes24.com/product/goods/{goods_no}" # 도서 상세 페이지 주소 형식
+DETAIL_DB = "yes24/data/cache/details.sqlite" # 상품 번호별 상세 정보와 수집 시각을 저장할 데이터베이스 경로
+DETAIL_TTL = 7 * 24 * 3600 # 상세 정보를 다시 수집하기 전까지 재사용할 기간(초)
+DETAIL_WORKERS = 2 # 상세 페이지를 동시에 요청할 최대 수 (요청 속도는 목록 수집과 같은 토큰 버킷으로 제한)
+LEASE_SECONDS = 120 # 분산 수집에서 작업자가 임대한 페이지를 다른 작업자가 다시 가져가기까지의 시간(초)
+MAX_ATTEMPTS = 5 # 분산 수집에서 페이지 하나를 시도할 최대 횟수
 
 # 헤더 설정
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36", # 봇 차단을 방지하기 위한 실제 브라우저 형태의 유저 에이전트 정보
-    "Referer": "https://www.yes24.com/product/category/display/001001003032", # 요청 시의 이전 페이지 정보를 포함하는 레퍼러 헤더
     "X-Requested-With": "XMLHttpRequest" # AJAX 요청임을 서버에 알리는 헤더
 }
 
 # 로깅 설정
 logger.add("yes24/logs/scraper.log", rotation="10 MB") # 로그 정보를 파일에 기록하며, 10MB 크기가 넘으면 새 로그 파일을 생성하도록 설정
 
-def get_page_data(page):
-    """지정된 페이지의 HTML 데이터를 가져오는 함수"""
-    params = {
-        "dispNo": DISP_NO, # 카테고리 번호 매개변수 설정
-        "order": "SINDEX_ONLY", # 정렬 기준 매개변수 설정
+# HTTP 클라이언트 (모든 요청이 하나의 연결 풀을 공유)
+client = HttpClient(HEADERS, pool_size=MAX_WORKERS, timeout=TIMEOUT, max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX)
+response_cache = ResponseCache(CACHE_DIR) if INCREMENTAL else None # 조건부 요청용 응답 캐시
+
+def build_params(page, disp_no=DISP_NO, order=ORDER):
+    """지정된 카테고리와 페이지의 요청 매개변수를 만드는 함수"""
+    return {
+        "dispNo": disp_no, # 카테고리 번호 매개변수 설정
+        "order": order, # 정렬 기준 매개변수 설정
         "addOptionTp": "0", # 추가 옵션 타입 매개변수 설정
         "page": page, # 요청할 페이지 번호 매개변수 설정
         "size": PAGE_SIZE, # 한 번에 가져올 상품 수 매개변수 설정
@@ -42,98 +94,262 @@ def get_page_data(page):
         "elemSeq": "0", # 요소 순번 매개변수 설정
         "seriesNumber": "0" # 시리즈 번호 매개변수 설정
     }
+
+def fetch_page(page, disp_no=DISP_NO, order=ORDER):
+    """지정된 카테고리와 페이지의 HTML을 조건부 요청으로 가져와 (HTML, 변경 여부)를 반환하는 함수"""
+    params = build_params(page, disp_no, order) # 요청 매개변수 생성
+    key = request_key(BASE_URL, params) # 응답 캐시 키 생성
+    headers = {"Referer": REFERER_URL.format(disp_no=disp_no)} # 요청 시의 이전 페이지 정보를 포함하는 레퍼러 헤더
+    if response_cache: # 증분 수집을 사용하는 경우
+        headers.update(response_cache.conditional_headers(key)) # 이전 응답의 ETag/Last-Modified로 조건부 요청 헤더 추가
     
     try:
-        response = requests.get(BASE_URL, params=params, headers=HEADERS) # 설정된 주소, 파라미터, 헤더를 사용하여 GET 방식 요청을 보냄
-        response.raise_for_status() # HTTP 응답 상태 코드가 정상이 아닐 경우 예외 발생
-        return response.text # 응답 받은 HTML 문서 텍스트를 반환
+        with span("fetch"): # 재시도 대기를 포함한 요청 시간
+            response = client.get(BASE_URL, params=params, headers=headers) # 공유 연결 풀로 GET 요청을 보내며, 일시적 오류는 백오프 후 재시도하고 최종 실패 시 예외 발생
     except requests.RequestException as e:
-        logger.error(f"페이지 {page} 요청 중 오류 발생: {e}") # 요청 중 오류 발생 시 로그에 에러 내용 기록
-        return None # 오류 발생 시 None 반환
-
-def parse_html(html):
-    """HTML 소스에서 도서 정보를 추출하는 함수"""
-    soup = BeautifulSoup(html, 'html.parser') # BeautifulSoup을 이용해 HTML 텍스트를 파싱 가능한 객체로 변환
-    items = soup.select('div.itemUnit') # 개별 도서 정보가 들어있는 div 요소들을 선택
-    data = [] # 추출된 데이터를 저장할 빈 리스트
-    
-    for item in items: # 각 도서 요소에 대해 반복 수행
-        try:
-            # 도서명
-            title_tag = item.select_one('a.gd_name') # 도서명이 포함된 태그 선택
-            title = title_tag.text.strip() if title_tag else "" # 도서명 텍스트 추출 및 앞뒤 공백 제거
-            link = "https://www.yes24.com" + title_tag['href'] if title_tag else "" # 도서 상세 페이지로 연결되는 전체 URL 생성
-            
-            # 저자
-            author_tag = item.select_one('span.authPub.info_auth') # 저자 정보가 포함된 태그 선택
-            author = author_tag.text.strip().replace(" 저", "") if author_tag else "" # 저자 텍스트 추출 및 불필요한 단어 제거
-            
-            # 출판사
-            pub_tag = item.select_one('span.authPub.info_pub') # 출판사 정보가 포함된 태그 선택
-            publisher = pub_tag.text.strip() if pub_tag else "" # 출판사 이름 텍스트 추출
-            
-            # 출판일
-            date_tag = item.select_one('span.authPub.info_date') # 출판일 정보가 포함된 태그 선택
-            pub_date = date_tag.text.strip() if date_tag else "" # 출판일 텍스트 추출
-            
-            # 가격
-            price_tag = item.select_one('strong.txt_num > em.yes_b') # 가격 정보가 포함된 태그 선택
-            price = price_tag.text.strip().replace(",", "") if price_tag else "0" # 쉼표를 제거한 숫자 형태의 가격 추출
-            
-            # 별점
-            rating_tag = item.select_one('span.rating_grade > em.yes_b') # 별점 정보가 포함된 태그 선택
-            rating = rating_tag.text.strip() if rating_tag else "0.0" # 별점 텍스트 추출
-            
-            # 리뷰 수
-            review_tag = item.select_one('span.rating_rvCount em.txC_blue') # 리뷰 개수 정보가 포함된 태그 선택
-            review_count = review_tag.text.strip() if review_tag else "0" # 리뷰 수 텍스트 추출
-            
-            data.append({ # 수집된 개별 도서 정보를 딕셔너리 형태로 리스트에 추가
-                "Title": title,
-                "Author": author,
-                "Publisher": publisher,
-                "Publish Date": pub_date,
-                "Price": price,
-                "Rating": rating,
-                "Review Count": review_count,
-                "Detail URL": link
-            })
-        except Exception as e:
-            logger.warning(f"항목 파싱 중 오류 발생: {e}") # 특정 도서 파싱 중 오류 발생 시 경고 로그 기록
-            continue # 오류가 발생한 도서는 건너뛰고 다음 도서 진행
-            
-    return data # 해당 페이지에서 수집 완료된 전체 도서 데이터 반환
-
-def main():
-    """스크래퍼를 실행하는 메인 함수"""
-    if not os.path.exists(OUTPUT_DIR): # 데이터를 저장할 폴더가 존재하는지 확인
-        os.makedirs(OUTPUT_DIR) # 폴더가 존재하지 않으면 새로 생성
-        
-    all_books = [] # 모든 페이지에서 수집한 도서 데이터를 통합 저장할 리스트
+        logger.error(f"[{disp_no}] 페이지 {page} 요청 중 오류 발생 (재시도 소진): {e}") # 재시도를 모두 소진한 경우 로그에 에러 내용 기록
+        inc("fetch_failures_total")
+        return None, False # 오류 발생 시 None 반환
     
-    logger.info("데이터 수집 시작") # 데이터 수집 작업 시작을 알리는 로그 기록
+    inc("http_responses_total", status=response.status_code)
+    inc("http_body_bytes_total", len(response.content)) # 압축 해제 후 본문 크기
+    inc("http_wire_bytes_total", response.raw.tell() if hasattr(response.raw, "tell") else len(response.content)) # 실제로 전송된(압축된) 크기
+    if response.status_code == 304: # 이전 수집 이후 변경되지 않은 페이지인 경우
+        return response_cache.load(key), False # 본문을 다시 받지 않고 캐시된 HTML 반환
+    if response_cache:
+        response_cache.store(key, response.text, response.headers) # 다음 실행의 조건부 요청을 위해 응답과 검증 헤더 저장
+    return response.text, True # 응답 받은 HTML 문서 텍스트를 반환
+
+def get_page_data(page, disp_no=DISP_NO, order=ORDER):
+    """지정된 카테고리와 페이지의 HTML 데이터를 가져오는 함수"""
+    return fetch_page(page, disp_no, order)[0] # 실패 시 None 반환
+
+def parse_html(html, backend=None, mode=None):
+    """HTML 소스에서 도서 정보를 추출하는 함수 (선택한 추출 방식과 파서 백엔드 사용)"""
+    return parse_listing(html, backend or PARSER_BACKEND, mode or PARSE_MODE) # 내장 JSON 방식은 JSON에 없는 필드와 JSON이 없는 항목만 HTML에서 추출
+
+def process_page(page, disp_no, order, html, changed, record_store, counts, books=None):
+    """가져온 페이지에서 도서 정보를 추출하는 함수 (변경 없는 페이지는 저장된 레코드 재사용, books가 있으면 파싱 파이프라인의 결과 사용)"""
+    if record_store: # 증분 수집을 사용하는 경우
+        key = request_key(BASE_URL, build_params(page, disp_no, order)) # 응답 캐시 키
+        goods_nos = None if changed else (response_cache.meta(key) or {}).get("goods_nos") # 304 응답이면 이전에 기록한 상품 번호 목록 조회
+        if goods_nos is not None:
+            books = record_store.get(goods_nos) # 변경 없는 페이지는 파싱하지 않고 저장된 레코드 재사용
+            counts[2] += len(books)
+            return books
     
-    for page in range(PAGE_START, PAGE_END + 1): # 시작 페이지부터 종료 페이지까지 반복
-        logger.info(f"페이지 {page}/{PAGE_END} 수집 중...") # 현재 처리 중인 페이지 정보 로그 기록
-        
-        html = get_page_data(page) # 해당 페이지의 HTML 데이터를 가져옴
-        if html: # HTML 데이터를 성공적으로 가져왔을 경우
+    if books is None: # 파싱 파이프라인을 쓰지 않는 경우
+        with span("parse"):
             books = parse_html(html) # 가져온 HTML에서 도서 정보 파싱
-            all_books.extend(books) # 수집된 리스트를 전체 도서 리스트에 추가
-            logger.info(f"페이지 {page}: {len(books)}개 도서 수집 완료") # 해당 페이지 수집 성공 로그 기록
+    observe("items_per_page", len(books), buckets=ITEM_BUCKETS)
+    if record_store:
+        new, updated, same = record_store.upsert(books) # 새로 추가되거나 바뀐 도서만 저장
+        response_cache.set_goods(key, [book["Goods No"] for book in books]) # 다음 실행에서 재사용할 상품 번호 목록 기록
+        counts[0] += new
+        counts[1] += updated
+        counts[2] += same
+    return books
+
+def count_pages(html, items):
+    """첫 페이지 HTML에서 전체 페이지 수를 확인하는 함수 (페이지 이동 영역이 없으면 도서 수로 판단)"""
+    page_count = parse_page_count(html) # 페이지 이동 영역의 마지막 페이지 번호
+    if page_count is None and items < PAGE_SIZE: # 페이지 이동 영역이 없고 한 페이지를 채우지 못한 경우
+        page_count = 1 # 첫 페이지가 마지막 페이지
+    return page_count
+
+def make_fetcher(max_workers=MAX_WORKERS):
+    """설정에 맞는 동시 수집 엔진을 만드는 함수 (HTTP 클라이언트의 재시도 요청도 같은 토큰 버킷을 사용하며, 자동 속도 조절을 사용하면 응답을 속도 조절기에 전달)"""
+    throttle = None
+    if ADAPTIVE_THROTTLE:
+        throttle = AdaptiveThrottle(TokenBucket(RATE_LIMIT, RATE_BURST), THROTTLE_MIN_RATE, THROTTLE_MAX_RATE, max_workers,
+                                    latency_target=THROTTLE_LATENCY_TARGET, error_rate=THROTTLE_ERROR_RATE, window=THROTTLE_WINDOW)
+        client.observer = throttle.record
+    fetcher = ConcurrentFetcher(max_workers, RATE_LIMIT, PER_HOST_CONCURRENCY, RATE_BURST, throttle=throttle)
+    client.acquire = fetcher.bucket.acquire # 재시도 요청이 전역 요청 속도 제한을 넘지 않도록 함
+    return fetcher
+
+def enrich_details(goods_nos, fetcher=None):
+    """수집한 도서의 상세 페이지를 목록 수집과 같은 속도 제한으로 가져와 상세 정보 캐시에 기록하는 함수 (fetcher: 토큰 버킷과 속도 조절기를 공유할 목록 수집 엔진)"""
+    if fetcher: # 목록 수집과 같은 토큰 버킷과 속도 조절기를 사용
+        detail_fetcher = ConcurrentFetcher(DETAIL_WORKERS, RATE_LIMIT, PER_HOST_CONCURRENCY, RATE_BURST, bucket=fetcher.bucket, throttle=fetcher.throttle)
+    else:
+        detail_fetcher = make_fetcher(DETAIL_WORKERS)
+    detail_cache = DetailCache(DETAIL_DB, DETAIL_TTL) # 유효 기간 내에 수집한 도서는 다시 요청하지 않음
+    counts = enrich(goods_nos, detail_fetcher, client, detail_cache, DETAIL_URL)
+    detail_cache.close()
+    logger.info(f"상세 페이지 {counts['fetched']}개 수집, {counts['cached']}개 캐시 재사용, 상세 페이지 없음 {counts['missing']}개, 실패 {counts['failed']}개: {DETAIL_DB}")
+
+def write_metrics(args):
+    """구간별 소요 시간을 로그로 요약하고 지표/추적 파일을 저장하는 함수"""
+    inc("http_retries_total", client.retries)
+    for name, count, seconds, mean_ms in METRICS.summary(): # 구간별 소요 시간 요약
+        logger.info(f"[지표] {name}: {count}회, 합계 {seconds:.2f}초, 평균 {mean_ms:.1f}ms")
+    METRICS.write(args.metrics, args.trace)
+
+def run_distributed(args, jobs, dataset_root):
+    """
+    공유 작업 대기열을 사용하는 분산 수집의 역할(coordinator, worker, merge, status)을 실행하는 함수.
+
+    - coordinator: 작업 명세의 작업과 첫 페이지를 대기열에 추가 (여러 번 실행해도 이미 있는 작업은 그대로 둠)
+    - worker: 대기열에서 페이지를 임대하여 수집하고 작업자별 출력 조각에 기록 (RATE_LIMIT를 동작 중인 작업자 수로 나누어 사용)
+    - merge: 완료된 페이지의 조각을 작업 순서대로 읽어 데이터셋과 체크포인트에 기록 (중복 도서 제외, 스냅샷 기록)
+    - status: 상태별 페이지 수 출력
+    """
+    queue = LeaseQueue(args.queue, LEASE_SECONDS, MAX_ATTEMPTS) # 모든 작업자가 공유하는 작업 대기열
+    if args.role == "coordinator":
+        added = queue.seed(jobs)
+        logger.info(f"작업 {added}개를 대기열에 추가 (전체 {len(jobs)}개): {args.queue}")
+    elif args.role == "worker":
+        worker_id = args.worker_id or default_worker_id() # 작업자 id (출력 조각 폴더 이름)
+        fetcher = make_fetcher() # 속도(자동 조절 시 상한)는 작업을 임대할 때마다 작업자 수에 맞게 조정
+        record_store = RecordStore(RECORD_DB) if INCREMENTAL else None # 상품 번호별 레코드 저장소 (작업자 노드별)
+        counts = [0, 0, 0] # 새 도서, 변경된 도서, 변경 없는 도서 수
+        shard = ShardWriter(SHARD_DIR, worker_id) # 이 작업자의 출력 조각
         
-        # 딜레이
-        time.sleep(random.uniform(1, 2)) # 서버 부하 방지를 위해 1초에서 2초 사이의 임의의 시간 동안 대기
+        def handle_page(task, html, changed):
+            """수집한 페이지를 파싱하여 작업자의 출력 조각에 기록하는 함수"""
+            disp_no, order, page = task
+            books = process_page(page, disp_no, order, html, changed, record_store, counts)
+            with span("write"):
+                shard.write(task, books)
+            return books
         
-    # 데이터프레임 변환 및 저장
-    if all_books: # 수집된 전체 데이터가 존재할 경우
-        df = pd.DataFrame(all_books) # 수집된 리스트를 pandas 데이터프레임 구조로 변환
-        save_path = os.path.join(OUTPUT_DIR, OUTPUT_FILE) # 저장할 파일의 전체 경로 생성
-        df.to_csv(save_path, index=False, encoding='utf-8-sig') # 데이터프레임을 CSV 파일로 저장 (한글 깨짐 방지를 위해 utf-8-sig 인코딩 사용)
-        logger.info(f"총 {len(df)}개 데이터 수집 완료. 저장 경로: {save_path}") # 최종 수집 완료 정보 로그 기록
-        print(df.head()) # 수집된 데이터 중 상위 5개를 화면에 출력하여 확인
+        logger.info(f"작업자 {worker_id} 시작: {args.queue}")
+        total_rate = THROTTLE_MAX_RATE if fetcher.throttle else RATE_LIMIT # 모든 작업자가 나누어 쓰는 초당 요청 수
+        stats = run_worker(queue, worker_id, fetcher, fetch_page, BASE_URL, handle_page, count_pages, total_rate)
+        if record_store:
+            record_store.close()
+        logger.info(f"작업자 {worker_id} 종료: {stats['pages']}페이지, {stats['items']}개 도서, 다른 작업자에게 넘어간 페이지 {stats['lost']}개, 실패한 요청 {stats['failed']}개")
+    elif args.role == "merge":
+        if queue.remaining():
+            logger.warning(f"아직 끝나지 않은 페이지가 {queue.remaining()}개 있습니다. 완료된 페이지만 병합합니다.")
+        checkpoint = Checkpoint(CHECKPOINT_FILE) # 병합한 페이지를 기록하는 체크포인트 (단일 프로세스 수집의 --resume과 호환)
+        checkpoint.output = {"format": args.format, "path": dataset_root}
+        checkpoint.page_counts.update(queue.page_counts())
+        writer = PartitionedWriter(dataset_root, args.format, checkpoint) # 데이터셋을 새로 기록
+        entity_index = EntityIndex(ENTITY_DB) if DEDUP else None
+        snapshot_store = SnapshotStore(SNAPSHOT_DIR) if SNAPSHOTS else None
+        stats = merge_shards(queue, SHARD_DIR, writer, entity_index, snapshot_store)
+        checkpoint.save(finished=not queue.remaining() and not queue.counts().get("failed"))
+        if entity_index:
+            entity_index.close()
+        if snapshot_store:
+            snapshot_store.close()
+        logger.info(f"{stats['pages']}페이지, {stats['items']}개 도서 병합 (중복 {stats['duplicates']}개 제외, 조각 없음 {stats['missing']}페이지): {dataset_root}")
+    logger.info(f"대기열 상태: {queue.counts()}")
+    queue.close()
+
+def main(argv=None):
+    """스크래퍼를 실행하는 메인 함수"""
+    parser = argparse.ArgumentParser(description="YES24 카테고리 도서 목록 수집기") # 명령행 인자 설정
+    parser.add_argument("--resume", action="store_true", help="체크포인트에 기록된 마지막 완료 페이지 이후부터 이어서 수집") # 이어서 수집 여부
+    parser.add_argument("--format", choices=sorted(SINKS), default=OUTPUT_FORMAT, help="출력 형식") # 출력 형식 선택
+    parser.add_argument("--manifest", default=MANIFEST_FILE, help="작업 명세 파일 경로") # 작업 명세 파일 선택
+    parser.add_argument("--parse-workers", type=int, default=PARSE_WORKERS, help="HTML 파싱 프로세스 수 (0이면 메인 스레드에서 파싱)") # 파싱 프로세스 수
+    parser.add_argument("--enrich", action="store_true", default=ENRICH, help="목록 수집 후 수집한 도서의 상세 페이지 정보(쪽수, ISBN, 카테고리, 리뷰 수)를 보강") # 상세 페이지 보강 여부
+    parser.add_argument("--enrich-only", action="store_true", help="목록을 수집하지 않고 저장된 데이터셋의 도서만 상세 페이지 정보를 보강") # 상세 페이지만 수집
+    parser.add_argument("--metrics", default=None, help="구간 시간/처리량 지표를 저장할 Prometheus 텍스트 파일 경로") # 지표 내보내기 경로
+    parser.add_argument("--trace", default=None, help="요청/파싱/기록 구간을 저장할 추적 JSON 파일 경로 (chrome://tracing, Perfetto)") # 추적 파일 경로
+    parser.add_argument("--role", choices=["coordinator", "worker", "merge", "status"], default=None, help="공유 작업 대기열을 사용하는 분산 수집 역할") # 분산 수집 역할
+    parser.add_argument("--queue", default=QUEUE_DB, help="분산 수집 작업 대기열 데이터베이스 경로") # 작업 대기열 경로
+    parser.add_argument("--worker-id", default=None, help="분산 수집 작업자 id (기본값: 호스트 이름-프로세스 id)") # 작업자 id
+    args = parser.parse_args(argv)
+    METRICS.tracing = bool(args.trace) # 추적 파일을 저장할 때만 구간별 이벤트 기록
+    
+    jobs = load_manifest(args.manifest, PAGE_START, PAGE_END) # 작업 명세에서 수집 작업 목록 로드
+    dataset_root = os.path.join(OUTPUT_DIR, DATASET_NAME) # 작업별 파티션을 저장할 데이터셋 폴더 경로
+    if args.enrich_only: # 저장된 데이터셋의 상품 번호로 상세 페이지만 수집
+        enrich_details(read_books(dataset_root, columns=["Goods No"])["Goods No"].astype(str))
+        write_metrics(args)
+        return
+    if args.role: # 공유 작업 대기열을 사용하는 분산 수집
+        run_distributed(args, jobs, dataset_root)
+        write_metrics(args)
+        return
+    
+    checkpoint = Checkpoint(CHECKPOINT_FILE) # 완료 페이지와 출력 위치를 기록하는 체크포인트
+    output = {"format": args.format, "path": dataset_root} # 이번 실행의 출력 정보
+    if args.resume and checkpoint.load(): # 이어서 수집하는 경우 이전 체크포인트 로드
+        if checkpoint.output != output: # 출력 형식이나 경로가 바뀌면 이어 쓸 수 없음
+            logger.error(f"체크포인트의 출력({checkpoint.output})과 현재 출력({output})이 달라 이어서 수집할 수 없습니다.")
+            return
+        logger.info(f"체크포인트에서 이어서 수집: 완료된 페이지 {len(checkpoint.completed)}개") # 이어서 수집 시작 로그 기록
+    else:
+        checkpoint = Checkpoint(CHECKPOINT_FILE) # 새로 수집하는 경우 빈 체크포인트에서 시작
+        checkpoint.output = output
+    
+    preview = [] # 화면 출력용 상위 5개 도서
+    logger.info(f"데이터 수집 시작: 작업 {len(jobs)}개") # 데이터 수집 작업 시작을 알리는 로그 기록
+    
+    # 딜레이는 요청 사이의 sleep 대신 모든 워커가 공유하는 토큰 버킷으로 전체 요청 속도를 제한
+    fetcher = make_fetcher() # 동시 수집 엔진 생성 (자동 속도 조절 시 RATE_LIMIT에서 시작하여 THROTTLE_MIN_RATE~THROTTLE_MAX_RATE 범위에서 조절)
+    record_store = RecordStore(RECORD_DB) if INCREMENTAL else None # 상품 번호별 레코드 저장소
+    counts = [0, 0, 0] # 새 도서, 변경된 도서, 변경 없는 도서 수
+    snapshot_store = SnapshotStore(SNAPSHOT_DIR) if SNAPSHOTS else None # 도서별 지표 변경 이력 저장소
+    snapshot_counts = [0, 0] # 기록한 스냅샷 수, 값이 같아 건너뛴 수
+    entity_index = EntityIndex(ENTITY_DB, checkpoint.completed) if DEDUP else None # 이어서 수집하면 확정된 페이지의 상품 번호만 중복 확인에 사용
+    duplicates = [0] # 중복으로 제외한 도서 수
+    enrich_goods = [] if args.enrich else None # 상세 페이지를 보강할 상품 번호 (기록한 도서만)
+    writer = PartitionedWriter(dataset_root, args.format, checkpoint) # 작업별 파티션에 페이지마다 결과를 바로 기록하는 출력기
+    
+    def handle_page(job, page, html, changed, parsed=None):
+        """수집한 페이지를 파싱하여 작업의 파티션에 기록하는 함수 (parsed: 파싱 파이프라인이 추출한 도서 목록)"""
+        books = process_page(page, job.disp_no, job.order, html, changed, record_store, counts, parsed) # 페이지에서 도서 정보 추출
+        if page == job.page_start and job.page_count is None: # 첫 페이지인 경우
+            checkpoint.page_counts[job.job_id] = count_pages(html, len(books)) # 이어서 수집 시 첫 페이지를 다시 요청하지 않도록 전체 페이지 수 기록
+        extracted = len(books) # 스케줄러에는 중복 제외 전 도서 수를 반환 (한 페이지를 채웠는지로 마지막 페이지를 판단)
+        if entity_index: # 이번 실행에서 이미 기록한 도서 제외 (등장 위치는 색인에 기록)
+            books = entity_index.add_page(job.disp_no, job.order, page, books)
+            duplicates[0] += extracted - len(books)
+        if snapshot_store and changed: # 304 응답으로 재사용한 레코드는 이미 기록된 값이므로 제외
+            added, skipped = snapshot_store.append(books)
+            snapshot_counts[0] += added
+            snapshot_counts[1] += skipped
+        with span("write"):
+            writer.write(job.partition, (job.disp_no, job.order, page), books) # 수집된 도서를 메모리에 쌓지 않고 바로 출력 파일에 기록
+        preview.extend(books[:5 - len(preview)])
+        if enrich_goods is not None:
+            enrich_goods.extend(book["Goods No"] for book in books)
+        return extracted
+    
+    pipeline = None
+    if args.parse_workers > 0: # 수집 스레드는 HTML만 가져오고 파싱은 별도 프로세스에서 진행 (변경 없는 페이지는 저장된 레코드를 쓰므로 파싱 안 함)
+        pipeline = ParsePipeline(args.parse_workers, PARSER_BACKEND, PARSE_MODE, PARSE_QUEUE, PARSE_COMPRESS, parse_unchanged=record_store is None)
+        logger.info(f"파싱 프로세스 {args.parse_workers}개 사용 (대기열 {pipeline.max_pending}페이지)")
+    scheduler = JobScheduler(jobs, fetcher, fetch_page, BASE_URL, handle_page, count_pages, os.path.join(dataset_root, "_jobs.json"), checkpoint.completed, pipeline) # 작업 스케줄러 생성
+    try:
+        scheduler.run(checkpoint.page_counts) # 첫 페이지로 전체 페이지 수 확인 후 나머지 페이지를 우선순위 순으로 수집
+    finally:
+        if pipeline:
+            pipeline.close() # 파싱 프로세스 종료
+    writer.close() # 출력 파일을 닫고 남은 페이지를 체크포인트에 기록
+    checkpoint.save(finished=all(job.status == "done" for job in jobs)) # 모든 작업이 완료되었는지 기록
+    
+    if record_store: # 증분 수집 결과 요약
+        record_store.close()
+        logger.info(f"새 도서 {counts[0]}개, 변경된 도서 {counts[1]}개, 변경 없는 도서 {counts[2]}개") # 이번 실행에서 실제로 갱신된 도서 수 기록
+    if entity_index:
+        entity_index.close()
+        logger.info(f"중복 도서 {duplicates[0]}개 제외, 저자 {len(entity_index.author_ids)}명, 출판사 {len(entity_index.publisher_ids)}곳 색인: {ENTITY_DB}")
+    if snapshot_store: # 남은 스냅샷을 파일로 기록
+        snapshot_store.close()
+        logger.info(f"스냅샷 {snapshot_counts[0]}개 기록, 값이 같은 도서 {snapshot_counts[1]}개 건너뜀: {SNAPSHOT_DIR}")
+    
+    if enrich_goods: # 목록 수집과 같은 토큰 버킷과 속도 조절기를 사용하여 전체 요청 속도 유지
+        enrich_details(enrich_goods, fetcher)
+    
+    for job in jobs: # 작업별 결과 요약
+        log = logger.info if job.status == "done" else logger.error
+        log(f"[{job.job_id}] {job.status}: {job.pages_done}페이지, {job.items}개 도서{f', 실패 페이지 {job.failed_pages} (--resume으로 다시 수집 가능)' if job.failed_pages else ''}")
+        
+    total = sum(job.items for job in jobs) - duplicates[0] # 이번 실행에서 기록한 도서 수
+    if total: # 이번 실행에서 수집된 데이터가 존재할 경우
+        logger.info(f"총 {total}개 데이터 수집 완료. 저장 경로: {dataset_root}") # 최종 수집 완료 정보 로그 기록
+        print(pd.DataFrame(preview)) # 수집된 데이터 중 상위 5개를 화면에 출력하여 확인
     else:
         logger.warning("수집된 데이터가 없습니다.") # 수집된 데이터가 하나도 없을 경우 경고 로그 기록
+    
+    write_metrics(args)
 
 if __name__ == "__main__": # 스크립트가 직접 실행되는 경우에만 아래 블록 실행
     main() # main 함수 호출하여 프로그램 실행
\ No newline at end of file
@@ -0,0 +1,352 @@
+import csv # CSV 형식 출력을 위한 csv 라이브러리 임포트
+import glob # Parquet 조각 파일 목록 조회를 위한 glob 라이브러리 임포트
+import json # JSONL 출력 및 체크포인트 저장을 위한 json 라이브러리 임포트
+import os # 파일 경로 조작 및 디스크 동기화를 위한 os 라이브러리 임포트
+import shutil # 파티션 폴더 정리를 위한 shutil 라이브러리 임포트
+
+
+class CsvSink:
+    """
+    페이지 단위로 레코드를 CSV 파일에 이어 쓰는 출력기.
+
+    처음 생성할 때만 BOM(utf-8-sig)과 헤더를 쓰며, commit() 시점마다 디스크에 동기화하므로
+    중간에 중단되어도 그 전까지 기록한 페이지는 보존된다.
+
+    Args:
+        path (str): 출력 파일 경로.
+        state (dict): 이어서 쓸 때 사용할 이전 commit() 상태 (None이면 새로 작성).
+    """
+
+    def __init__(self, path, state=None):
+        self.path = path
+        self.columns = None
+        if state and os.path.exists(path):
+            with open(path, "r+b") as f:
+                f.truncate(state["offset"]) # 마지막 commit 이후 기록된 불완전한 내용 제거
+            with open(path, encoding="utf-8-sig", newline="") as f:
+                self.columns = next(csv.reader(f), None) # 기존 파일의 열 순서 유지
+            self._file = open(path, "a", encoding="utf-8", newline="")
+        else:
+            self._file = open(path, "w", encoding="utf-8-sig", newline="")
+        self._writer = None
+
+    def write(self, records):
+        """레코드 리스트를 파일 끝에 추가하는 함수"""
+        if not records:
+            return
+        if self._writer is None:
+            write_header = self.columns is None
+            self.columns = self.columns or list(records[0])
+            self._writer = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction="ignore")
+            if write_header:
+                self._writer.writeheader()
+        self._writer.writerows(records)
+
+    def commit(self):
+        """기록한 내용을 디스크에 동기화하고 이어 쓰기에 필요한 상태를 반환하는 함수"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return {"offset": self._file.tell()}
+
+    def close(self):
+        state = self.commit()
+        self._file.close()
+        return state
+
+
+class JsonlSink:
+    """
+    페이지 단위로 레코드를 JSON Lines 파일에 이어 쓰는 출력기 (한 줄에 레코드 하나).
+
+    Args:
+        path (str): 출력 파일 경로.
+        state (dict): 이어서 쓸 때 사용할 이전 commit() 상태 (None이면 새로 작성).
+    """
+
+    def __init__(self, path, state=None):
+        self.path = path
+        if state and os.path.exists(path):
+            with open(path, "r+b") as f:
+                f.truncate(state["offset"])
+            self._file = open(path, "a", encoding="utf-8")
+        else:
+            self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, records):
+        """레코드 리스트를 파일 끝에 추가하는 함수"""
+        self._file.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+    def commit(self):
+        """기록한 내용을 디스크에 동기화하고 이어 쓰기에 필요한 상태를 반환하는 함수"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return {"offset": self._file.tell()}
+
+    def close(self):
+        state = self.commit()
+        self._file.close()
+        return state
+
+
+class ParquetSink:
+    """
+    페이지 단위로 레코드를 Parquet row group으로 기록하는 출력기.
+
+    레코드는 dataset.COLUMN_TYPES에 정의된 타입(정수 가격, 실수 별점, 사전 인코딩된 출판사/저자,
+    출판 연월 날짜 등)으로 변환되어 저장되므로, 분석 시 별도의 타입 변환이 필요 없다.
+
+    출력 경로는 조각 파일(part-00000.parquet, ...)을 담는 폴더이다. Parquet 파일은 닫기 전에는 읽을 수 없으므로,
+    조각 파일에 commit_rows개 이상의 행이 쌓이면 파일을 닫아 디스크에 확정하고 commit()이 상태를 반환한다.
+    따라서 중단되더라도 잃는 페이지는 마지막으로 닫은 조각 파일 이후의 페이지(기본 약 20페이지)로 제한된다.
+
+    페이지의 레코드는 열 기반 버퍼(dataset.BookBatch)에 모았다가 조각 파일을 닫을 때 기록하며, 파티션 출력기를 닫을 때(close())
+    작은 조각 파일들을 rows_per_file행 단위의 조각 파일로 병합하여 row_group_rows행 단위의 row group으로 다시 기록한다.
+    병합 전 조각 파일은 병합 결과가 체크포인트에 기록된 뒤 cleanup()으로 삭제하므로, 어느 시점에 중단되어도
+    체크포인트에 기록된 조각 파일 목록과 디스크 내용은 일치한다.
+
+    Args:
+        path (str): 조각 파일을 저장할 폴더 경로.
+        state (dict): 이어서 쓸 때 사용할 이전 commit() 상태 (None이면 새로 작성).
+        rows_per_file (int): 병합한 조각 파일 하나에 담을 행 수.
+        row_group_rows (int): 병합한 조각 파일의 row group 하나에 담을 행 수.
+        commit_rows (int): 조각 파일을 닫아 디스크에 확정할 행 수 (rows_per_file보다 작아야 함).
+    """
+
+    def __init__(self, path, state=None, rows_per_file=100_000, row_group_rows=20_000, commit_rows=2_400):
+        import pyarrow.parquet as pq # Parquet 출력은 pyarrow가 설치된 경우에만 사용
+        from dataset import BookBatch, book_schema
+
+        self._pq = pq
+        self.path = path
+        self.rows_per_file = rows_per_file
+        self.row_group_rows = row_group_rows
+        self.commit_rows = commit_rows
+        self._schema = book_schema()
+        self._batch = BookBatch() # 아직 기록하지 않은 행
+        os.makedirs(path, exist_ok=True)
+        self.parts = list(state["parts"]) if state else []
+        self.prune(path, self.parts) # 완료되지 않은 조각 파일 및 이전 실행 결과 정리
+        self._next = max((int(part[5:10]) for part in self.parts), default=-1) + 1 # 다음 조각 파일 번호 (병합 후에도 파일 이름 순서가 행 순서와 같도록 항상 증가)
+        self._obsolete = []
+
+    @staticmethod
+    def prune(path, parts):
+        """조각 파일 폴더에서 체크포인트에 기록되지 않은 조각 파일을 삭제하는 함수"""
+        for part in glob.glob(os.path.join(path, "part-*.parquet")):
+            if os.path.basename(part) not in parts:
+                os.remove(part)
+
+    def write(self, records):
+        """레코드 리스트를 현재 조각 파일의 버퍼에 추가하는 함수"""
+        self._batch.extend(records)
+
+    def _write_part(self, tables, row_group_rows):
+        """테이블 목록을 새 조각 파일 하나로 기록하고 파일 이름을 반환하는 함수"""
+        name = f"part-{self._next:05d}.parquet"
+        self._next += 1
+        with self._pq.ParquetWriter(os.path.join(self.path, name), self._schema) as writer:
+            for table in tables:
+                writer.write_table(table, row_group_size=row_group_rows)
+        self.parts.append(name)
+        return name
+
+    def commit(self):
+        """버퍼에 commit_rows개 이상의 행이 쌓였으면 조각 파일로 기록하여 닫고 상태를 반환하는 함수 (아직 확정하지 않았으면 None)"""
+        if len(self._batch) >= self.commit_rows:
+            return self._close_part()
+        return None if len(self._batch) else {"parts": list(self.parts)}
+
+    def _close_part(self):
+        if len(self._batch):
+            self._write_part([self._batch.to_table()], len(self._batch))
+            self._batch.clear()
+        return {"parts": list(self.parts)}
+
+    def _compact(self):
+        """
+        rows_per_file보다 작은 조각 파일들을 순서대로 모아 rows_per_file행 이상의 조각 파일로 다시 기록하는 함수.
+
+        이미 병합된 앞쪽 조각 파일은 그대로 두며, 병합 전 조각 파일은 cleanup()에서 삭제할 목록에 넣는다.
+        """
+        import pyarrow as pa # 조각 파일 병합용
+
+        sizes = [self._pq.ParquetFile(os.path.join(self.path, part)).metadata.num_rows for part in self.parts]
+        start = next((i for i, rows in enumerate(sizes) if rows < self.rows_per_file), len(sizes))
+        if len(self.parts) - start < 2: # 병합할 조각 파일이 없음
+            return
+        small, self.parts = self.parts[start:], self.parts[:start]
+        groups, group, rows = [], [], 0
+        for part, part_rows in zip(small, sizes[start:]):
+            group.append(part)
+            rows += part_rows
+            if rows >= self.rows_per_file:
+                groups.append(group)
+                group, rows = [], 0
+        if group:
+            groups.append(group)
+        for group in groups:
+            table = pa.concat_tables(self._pq.read_table(os.path.join(self.path, part), schema=self._schema) for part in group)
+            self._write_part([table], self.row_group_rows)
+        self._obsolete.extend(small)
+
+    def close(self):
+        """남은 행을 기록하고 작은 조각 파일들을 병합한 뒤 상태를 반환하는 함수"""
+        self._close_part()
+        self._compact()
+        return {"parts": list(self.parts)}
+
+    def cleanup(self):
+        """close() 상태가 체크포인트에 기록된 뒤 병합 전 조각 파일을 삭제하는 함수"""
+        for part in self._obsolete:
+            os.remove(os.path.join(self.path, part))
+        self._obsolete = []
+
+
+SINKS = {
+    "csv": CsvSink,
+    "jsonl": JsonlSink,
+    "parquet": ParquetSink,
+}
+
+
+def open_sink(fmt, path, state=None):
+    """
+    형식 이름에 해당하는 출력기를 생성하는 함수.
+
+    Args:
+        fmt (str): 'csv', 'jsonl', 'parquet' 중 하나.
+        path (str): 출력 경로.
+        state (dict): 이어서 쓸 때 사용할 이전 commit() 상태.
+
+    Returns:
+        write(records), commit(), close() 메서드를 가진 출력기 객체 (Parquet 출력기는 cleanup()도 제공).
+    """
+    return SINKS[fmt](path, state)
+
+
+class PartitionedWriter:
+    """
+    작업(파티션)별로 출력기를 열고 닫으며 결과를 Hive 형식의 파티션 폴더에 기록하는 출력기.
+
+    한 번에 하나의 파티션 출력기만 열어 두며, 다른 파티션의 페이지가 들어오면 이전 출력기를 닫는다.
+    디스크에 확정된 페이지와 파티션별 출력기 상태는 체크포인트에 기록된다.
+    새로 수집하는 파티션은 이전 실행 결과를 지우고 모든 페이지를 다시 기록하며, 상품 번호 단위로 갱신하지 않는다
+    (증분 수집에서 304 응답으로 재사용한 페이지의 레코드도 다시 기록됨).
+
+    Args:
+        root (str): 데이터셋 최상위 폴더 경로.
+        fmt (str): 'csv', 'jsonl', 'parquet' 중 하나.
+        checkpoint (Checkpoint): 완료 페이지와 출력기 상태를 기록할 체크포인트.
+    """
+
+    def __init__(self, root, fmt, checkpoint):
+        self.root = root
+        self.fmt = fmt
+        self.checkpoint = checkpoint
+        self._partition = None
+        self._sink = None
+        self._pending = []
+        if fmt == "parquet": # 병합 직후 중단되어 남은 병합 전 조각 파일 정리 (이어서 수집할 때 다시 열지 않는 파티션 포함)
+            for partition, state in checkpoint.sink_states.items():
+                if os.path.isdir(os.path.join(root, partition)):
+                    ParquetSink.prune(os.path.join(root, partition), state["parts"])
+
+    def _sink_path(self, partition):
+        directory = os.path.join(self.root, partition)
+        return directory if self.fmt == "parquet" else os.path.join(directory, f"part-00000.{self.fmt}")
+
+    def _open(self, partition):
+        state = self.checkpoint.sink_states.get(partition)
+        directory = os.path.join(self.root, partition)
+        if state is None and os.path.isdir(directory):
+            shutil.rmtree(directory) # 새로 수집하는 파티션은 이전 실행 결과를 지우고 시작
+        os.makedirs(directory, exist_ok=True)
+        self._sink = open_sink(self.fmt, self._sink_path(partition), state)
+        self._partition = partition
+
+    def write(self, partition, task, records):
+        """
+        한 페이지의 레코드를 해당 파티션에 기록하는 함수.
+
+        Args:
+            partition (str): 파티션 경로 (예: 'disp_no=001001003032/order=SINDEX_ONLY').
+            task (tuple): 완료 처리할 (카테고리 번호, 정렬 기준, 페이지).
+            records (list): 도서 정보 딕셔너리 리스트.
+        """
+        if partition != self._partition:
+            self.close()
+            self._open(partition)
+        self._sink.write(records)
+        self._pending.append(task)
+        state = self._sink.commit() # 디스크에 확정된 경우에만 이어 쓰기 상태가 반환됨
+        if state is not None:
+            self.checkpoint.save(self._pending, {partition: state})
+            self._pending = []
+
+    def close(self):
+        """열려 있는 파티션 출력기를 닫고 남은 페이지를 체크포인트에 기록하는 함수"""
+        if self._sink is not None:
+            self.checkpoint.save(self._pending, {self._partition: self._sink.close()})
+            if hasattr(self._sink, "cleanup"): # 병합 결과가 체크포인트에 기록된 뒤에만 병합 전 조각 파일 삭제
+                self._sink.cleanup()
+            self._sink = None
+            self._partition = None
+            self._pending = []
+
+
+class Checkpoint:
+    """
+    완료된 (카테고리, 정렬 기준, 페이지) 목록과 파티션별 출력기 상태를 저장하는 체크포인트 파일.
+
+    출력기가 디스크에 확정(commit)한 페이지만 완료로 기록하므로, --resume으로 다시 실행하면
+    확정되지 않은 페이지만 다시 수집하고 출력 파일은 마지막 확정 지점부터 이어서 쓴다.
+
+    Args:
+        path (str): 체크포인트 JSON 파일 경로.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.completed = set()
+        self.sink_states = {}
+        self.page_counts = {}
+        self.output = None
+        self.finished = False
+
+    def load(self):
+        """저장된 체크포인트를 읽어 오는 함수 (파일이 없으면 False 반환)"""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        self.completed = {tuple(task) for task in data["completed"]}
+        self.sink_states = data.get("sink_states", {})
+        self.page_counts = data.get("page_counts", {})
+        self.output = data.get("output")
+        self.finished = data.get("finished", False)
+        return True
+
+    def save(self, tasks=(), sink_states=None, page_counts=None, finished=False):
+        """
+        완료된 작업을 추가하고 체크포인트 파일을 원자적으로 교체 저장하는 함수.
+
+        Args:
+            tasks (iterable): 새로 완료된 (카테고리, 정렬 기준, 페이지) 작업.
+            sink_states (dict): 파티션별 출력기의 commit() 상태.
+            page_counts (dict): 작업별로 확인한 전체 페이지 수.
+            finished (bool): 전체 수집이 끝났는지 여부.
+        """
+        self.completed.update(tuple(task) for task in tasks)
+        self.sink_states.update(sink_states or {})
+        self.page_counts.update(page_counts or {})
+        self.finished = finished
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({
+                "output": self.output,
+                "completed": sorted(self.completed),
+                "sink_states": self.sink_states,
+                "page_counts": self.page_counts,
+                "finished": finished,
+            }, f, ensure_ascii=False)
+        os.replace(self.path + ".tmp", self.path)
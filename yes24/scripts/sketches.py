@@ -0,0 +1,326 @@
+import numpy as np # 스케치 상태 계산을 위한 numpy 라이브러리 임포트
+import pandas as pd # 값 해시 및 빈도 계산을 위한 pandas 라이브러리 임포트
+
+
+def _numbers(values):
+    """값 배열을 결측값이 제거된 float64 배열로 변환하는 함수"""
+    values = np.asarray(pd.to_numeric(pd.Series(values), errors="coerce"), dtype="float64")
+    return values[~np.isnan(values)]
+
+
+class Moments:
+    """
+    수치 열의 개수, 평균, 분산, 최솟값, 최댓값을 나누어 읽은 조각마다 갱신하는 요약 (병합 가능).
+
+    조각별 통계를 Chan의 병합 공식으로 합치므로 큰 값에서도 분산 계산의 수치 오차가 작다.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        values = _numbers(values)
+        if len(values):
+            other = Moments()
+            other.n, other.mean = len(values), float(values.mean())
+            other.m2 = float(((values - other.mean) ** 2).sum())
+            other.min, other.max = float(values.min()), float(values.max())
+            self.merge(other)
+        return self
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta ** 2 * self.n * other.n / n
+        self.n = n
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        return self
+
+    @property
+    def std(self):
+        """표본 표준편차 (pandas describe()와 같은 n-1 기준)"""
+        return float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else np.nan
+
+
+class CoMoments:
+    """
+    두 수치 열의 공분산과 상관계수를 조각마다 갱신하는 요약 (두 값이 모두 있는 행만 사용, 병합 가능).
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = self.mean_y = 0.0
+        self.m2_x = self.m2_y = self.c_xy = 0.0
+
+    def update(self, x, y):
+        x = np.asarray(x, dtype="float64")
+        y = np.asarray(y, dtype="float64")
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[valid], y[valid]
+        if len(x):
+            other = CoMoments()
+            other.n = len(x)
+            other.mean_x, other.mean_y = float(x.mean()), float(y.mean())
+            dx, dy = x - other.mean_x, y - other.mean_y
+            other.m2_x, other.m2_y, other.c_xy = float((dx * dx).sum()), float((dy * dy).sum()), float((dx * dy).sum())
+            self.merge(other)
+        return self
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        dx, dy = other.mean_x - self.mean_x, other.mean_y - self.mean_y
+        weight = self.n * other.n / n
+        self.c_xy += other.c_xy + dx * dy * weight
+        self.m2_x += other.m2_x + dx * dx * weight
+        self.m2_y += other.m2_y + dy * dy * weight
+        self.mean_x += dx * other.n / n
+        self.mean_y += dy * other.n / n
+        self.n = n
+        return self
+
+    @property
+    def corr(self):
+        """피어슨 상관계수"""
+        denom = np.sqrt(self.m2_x * self.m2_y)
+        return float(self.c_xy / denom) if self.n > 1 and denom > 0 else np.nan
+
+
+class TDigest:
+    """
+    분위수(중앙값, 사분위수 등)를 근사하는 t-digest (병합 가능).
+
+    값을 평균, 가중치, 최솟값, 최댓값을 가진 중심점(centroid)으로 압축하며, 분포의 양 끝일수록 중심점을 작게
+    유지하므로 극단 분위수도 정확하다. 중심점 수는 compression에 비례하여 데이터 크기와 무관하게 일정하다.
+    분위수는 중심점 안의 값이 최솟값과 최댓값 사이에 고르게 있다고 보고 pandas의 선형 보간과 같은 위치에서
+    계산하므로, 압축되지 않은 값(중심점 하나에 값 하나)과 같은 값만 모인 중심점에서는 정확한 값이 나온다.
+
+    Args:
+        compression (int): 압축 정도 (클수록 정확하지만 중심점이 많아짐).
+    """
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.lows = np.empty(0)
+        self.highs = np.empty(0)
+        self._buffer = []
+        self._buffered = 0
+
+    def update(self, values):
+        values = _numbers(values)
+        if len(values):
+            self._buffer.append((values, np.ones(len(values)), values, values))
+            self._buffered += len(values)
+            if self._buffered > 20 * self.compression:
+                self._compress()
+        return self
+
+    def merge(self, other):
+        other._compress()
+        if len(other.means):
+            self._buffer.append((other.means, other.weights, other.lows, other.highs))
+            self._compress()
+        return self
+
+    def _compress(self):
+        """버퍼의 값과 기존 중심점을 정렬한 뒤, 스케일 함수 k1 기준으로 인접한 값을 묶어 중심점을 다시 만드는 함수"""
+        if not self._buffer:
+            return
+        parts = [(self.means, self.weights, self.lows, self.highs)] + self._buffer
+        means, weights, lows, highs = (np.concatenate(arrays) for arrays in zip(*parts))
+        self._buffer, self._buffered = [], 0
+        order = np.argsort(means, kind="stable")
+        means, weights, lows, highs = means[order], weights[order], lows[order], highs[order]
+        q_left = (np.cumsum(weights) - weights) / weights.sum() # 각 값 앞까지의 누적 비율
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_left - 1) # 양 끝에서 촘촘한 스케일 함수
+        cluster = np.floor(k - k[0]).astype(np.intp) # 정렬 순서대로 증가하므로 같은 번호는 연속된 구간
+        starts = np.flatnonzero(np.diff(cluster, prepend=-1))
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+        self.lows = np.minimum.reduceat(lows, starts)
+        self.highs = np.maximum.reduceat(highs, starts)
+
+    @property
+    def count(self):
+        self._compress()
+        return float(self.weights.sum())
+
+    def quantile(self, q):
+        """q(0~1) 분위수의 근사값을 반환하는 함수 (n개 값의 (n-1)*q 위치, pandas 기본 보간과 같음)"""
+        self._compress()
+        if not len(self.means):
+            return np.nan
+        first = np.cumsum(self.weights) - self.weights # 각 중심점의 첫 값 위치
+        last = first + self.weights - 1
+        pure = self.lows == self.highs # 같은 값만 모인 중심점은 양 끝 위치에서 그 값을, 나머지는 가운데 위치에서 평균을 사용
+        positions = np.column_stack([np.where(pure, first, (first + last) / 2), np.where(pure, last, (first + last) / 2)]).ravel()
+        values = np.column_stack([np.where(pure, self.lows, self.means), np.where(pure, self.highs, self.means)]).ravel()
+        positions = np.concatenate([[0.0], positions, [last[-1]]])
+        values = np.concatenate([[self.lows.min()], values, [self.highs.max()]])
+        return float(np.interp(q * (self.weights.sum() - 1), positions, values))
+
+
+class Histogram:
+    """
+    고정된 구간 경계에 대한 도수를 조각마다 더해 나가는 히스토그램 (병합 가능).
+
+    Args:
+        edges (array-like): 오름차순 구간 경계 (마지막 구간은 오른쪽 경계 포함).
+    """
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype="float64")
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+
+    def update(self, values):
+        self.counts += np.histogram(_numbers(values), bins=self.edges)[0]
+        return self
+
+    def merge(self, other):
+        self.counts += other.counts
+        return self
+
+
+class HyperLogLog:
+    """
+    고유값 개수를 근사하는 HyperLogLog (병합 가능, 메모리 2^p 바이트).
+
+    고유 해시 수가 레지스터 수의 1/4 이하인 동안은 해시 자체를 모아 두고 정확히 센 뒤(HLL++의 sparse 표현과 같음),
+    그보다 많아지면 레지스터로 전환한다.
+
+    Args:
+        p (int): 레지스터 수 지수 (표준 오차 약 1.04 / sqrt(2^p), p=14이면 약 0.8%).
+    """
+
+    def __init__(self, p=14):
+        self.p = p
+        self.registers = None
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def update(self, values):
+        values = pd.Series(values).dropna()
+        if len(values):
+            self._add(pd.util.hash_pandas_object(values, index=False).to_numpy())
+        return self
+
+    def _add(self, hashes):
+        if self.registers is None:
+            self.hashes = np.union1d(self.hashes, hashes)
+            if len(self.hashes) > (1 << self.p) // 4:
+                self._to_registers()
+        else:
+            self._set(hashes)
+
+    def _to_registers(self):
+        """모아 둔 해시를 레지스터로 옮기는 함수"""
+        if self.registers is None:
+            hashes, self.hashes = self.hashes, np.empty(0, dtype=np.uint64)
+            self.registers = np.zeros(1 << self.p, dtype=np.uint8)
+            self._set(hashes)
+
+    def _set(self, hashes):
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - _bit_length(rest) + 1 # 나머지 비트에서 처음 1이 나오는 위치
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def merge(self, other):
+        if other.registers is None:
+            self._add(other.hashes)
+        else:
+            self._to_registers()
+            np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        """고유값 개수 추정치 (sparse 표현이면 정확한 값)"""
+        if self.registers is None:
+            return len(self.hashes)
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros: # 작은 범위 보정 (linear counting)
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+def _bit_length(values):
+    """uint64 배열 각 원소의 비트 길이를 계산하는 함수 (부동소수점 변환 없이 정확하게)"""
+    values = values.copy()
+    length = np.zeros(len(values), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        large = values >= np.uint64(1 << shift)
+        length += large * shift
+        values = np.where(large, values >> np.uint64(shift), values)
+    return length + (values > 0)
+
+
+class SpaceSaving:
+    """
+    가장 자주 등장하는 값 상위 k개와 그 빈도를 근사하는 space-saving 요약 (병합 가능).
+
+    최대 capacity개의 값만 유지하며, 추정 빈도는 실제 빈도 이상이고 오차는 유지 중인 최소 빈도 이하이다.
+    빈도가 같은 값은 먼저 등장한 값이 앞에 온다 (value_counts()와 같은 순서).
+
+    Args:
+        capacity (int): 유지할 최대 값 수.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype="int64")
+        self.first_seen = pd.Series(dtype="int64") # 값별 처음 등장 순번 (같은 빈도의 정렬 기준)
+        self._seen = 0
+        self._floor = None
+
+    @property
+    def floor(self):
+        """요약이 가득 찬 경우 유지 중인 최소 빈도 (요약에 없는 값의 빈도 상한)"""
+        if self._floor is not None:
+            return self._floor
+        return int(self.counts.min()) if len(self.counts) >= self.capacity else 0
+
+    def update(self, values):
+        values = pd.Series(values).dropna()
+        values = values.astype(object) if isinstance(values.dtype, pd.CategoricalDtype) else values # 조각마다 범주 목록이 달라도 값 기준으로 합침
+        counts = values.value_counts()
+        uniques = values.drop_duplicates()
+        other = SpaceSaving(self.capacity)
+        other.first_seen = pd.Series(np.arange(self._seen, self._seen + len(uniques)), index=pd.Index(uniques, dtype=object))
+        other.counts = counts.reindex(other.first_seen.index)
+        other._floor = 0
+        if len(other.counts) > self.capacity: # 조각 안의 값이 capacity보다 많으면 상위 값만 남기고 밀려난 최대 빈도를 floor로 사용
+            other._sort()
+            other._floor = int(other.counts.iloc[self.capacity])
+            other.counts, other.first_seen = other.counts.iloc[:self.capacity], other.first_seen.iloc[:self.capacity]
+        self._seen += len(uniques)
+        return self.merge(other)
+
+    def merge(self, other):
+        own_floor, other_floor = self.floor, other.floor
+        index = self.counts.index.append(other.counts.index.difference(self.counts.index, sort=False))
+        combined = self.counts.reindex(index).fillna(own_floor) + other.counts.reindex(index).fillna(other_floor)
+        self.first_seen = self.first_seen.reindex(index).fillna(other.first_seen.reindex(index)).astype("int64")
+        self.counts = combined.astype("int64")
+        self._sort()
+        self.counts, self.first_seen = self.counts.iloc[:self.capacity], self.first_seen.iloc[:self.capacity]
+        return self
+
+    def _sort(self):
+        order = np.lexsort((self.first_seen.to_numpy(), -self.counts.to_numpy()))
+        self.counts, self.first_seen = self.counts.iloc[order], self.first_seen.iloc[order]
+
+    def top(self, k=None):
+        """빈도 추정치가 높은 순서대로 (값, 빈도) Series를 반환하는 함수"""
+        return self.counts.iloc[:k] if k is not None else self.counts
@@ -0,0 +1,211 @@
+import datetime # 수집 시각 변환을 위한 datetime 라이브러리 임포트
+import hashlib # 지표 값 해시 계산을 위한 hashlib 라이브러리 임포트
+import json # 지표 값 직렬화를 위한 json 라이브러리 임포트
+import os # 파일 경로 조작을 위한 os 라이브러리 임포트
+import sqlite3 # 스냅샷 색인을 위한 sqlite3 라이브러리 임포트
+import time # 수집 시각 기록을 위한 time 라이브러리 임포트
+import pandas as pd # 조회 결과 반환을 위한 pandas 라이브러리 임포트
+from dataset import COLUMN_TYPES, parse_number # 열별 타입 및 숫자 변환 함수 임포트
+
+# 설정
+SNAPSHOT_DIR = "yes24/data/snapshots" # 스냅샷 저장 폴더 (crawl_date=YYYY-MM-DD 파티션과 색인 파일)
+TRACKED_COLUMNS = ["Price", "List Price", "Discount Rate", "Rating", "Review Count", "Sales Index"] # 시점별로 기록하는 지표
+ROWS_PER_FILE = 50_000 # 조각 파일 하나에 담을 최대 행 수
+ROW_GROUP_SIZE = 5_000 # 상품 번호로 정렬한 뒤 나누는 row group 크기 (상품 번호 조회 시 건너뛸 수 있는 단위)
+
+
+def snapshot_schema():
+    """스냅샷 조각 파일의 pyarrow 스키마 (상품 번호, 수집 시각(UTC), 지표 열)"""
+    import pyarrow as pa # Parquet/Arrow 기능은 pyarrow가 설치된 경우에만 사용
+
+    types = {"int32": pa.int32(), "int8": pa.int8(), "float32": pa.float32()}
+    return pa.schema(
+        [("Goods No", pa.int64()), ("Crawled At", pa.timestamp("ms"))]
+        + [(column, types[COLUMN_TYPES[column]]) for column in TRACKED_COLUMNS]
+    )
+
+
+def _to_epoch(value):
+    """datetime, 문자열, 숫자(epoch 초)를 epoch 초로 변환하는 함수 (시간대가 없는 값은 UTC로 간주)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    ts = pd.Timestamp(value)
+    return (ts.tz_convert("UTC") if ts.tzinfo else ts.tz_localize("UTC")).timestamp()
+
+
+class SnapshotStore:
+    """
+    도서별 가격, 별점, 리뷰 수, 판매지수의 시점별 값을 추가 전용(append-only)으로 보관하는 스냅샷 저장소.
+
+    값은 수집 날짜별 파티션(crawl_date=YYYY-MM-DD)의 Parquet 조각 파일에 기록하며, 한 번 기록한 파일은 수정하지 않는다.
+    도서의 지표가 직전 스냅샷과 같으면 기록하지 않으므로(중복 제거) 저장량은 실제로 바뀐 값의 수에 비례한다.
+
+    색인(index.sqlite)에는 다음을 저장한다.
+    - latest: 상품 번호별 마지막 지표 해시 (중복 제거 시 O(1) 조회)
+    - snapshots: (상품 번호, 수집 시각) -> 조각 파일 (상품 번호 색인과 수집 시각 색인)
+
+    따라서 '도서 X의 이력'과 'T 이후 모든 변경'은 전체 파일을 읽지 않고 해당 행이 있는 조각 파일만 읽는다.
+    조각 파일을 먼저 기록한 뒤 색인을 갱신하므로, 중간에 중단되어 색인에 없는 파일은 조회에서 무시된다.
+
+    Args:
+        root (str): 스냅샷 저장 폴더 경로.
+        rows_per_file (int): 조각 파일 하나에 담을 최대 행 수 (쌓인 행이 이 수를 넘으면 파일로 기록).
+    """
+
+    def __init__(self, root=SNAPSHOT_DIR, rows_per_file=ROWS_PER_FILE):
+        self.root = root
+        self.rows_per_file = rows_per_file
+        os.makedirs(root, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(root, "index.sqlite"))
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS latest (goods_no INTEGER PRIMARY KEY, value_hash TEXT NOT NULL, crawled_at REAL NOT NULL)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS snapshots (goods_no INTEGER NOT NULL, crawled_at REAL NOT NULL, file TEXT NOT NULL, PRIMARY KEY (goods_no, crawled_at))")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS snapshots_crawled_at ON snapshots (crawled_at)")
+        self._pending = {} # 아직 파일로 기록하지 않은 상품 번호 -> (수집 시각, 지표 값, 해시)
+        self._seq = 0
+
+    def append(self, records, crawled_at=None):
+        """
+        수집한 도서 레코드의 지표 값을 스냅샷으로 추가하는 함수 (직전 스냅샷과 같은 값은 건너뜀).
+
+        Args:
+            records (list): 'Goods No'와 TRACKED_COLUMNS 필드를 가진 도서 정보 딕셔너리 리스트.
+            crawled_at (float): 수집 시각 (epoch 초, None이면 현재 시각).
+
+        Returns:
+            tuple: (기록할 스냅샷 수, 값이 바뀌지 않아 건너뛴 수).
+        """
+        crawled_at = time.time() if crawled_at is None else crawled_at
+        rows = {}
+        for record in records:
+            goods_no = parse_number(record.get("Goods No"), "int64")
+            if goods_no is None:
+                continue
+            values = [parse_number(record.get(column), COLUMN_TYPES[column]) for column in TRACKED_COLUMNS]
+            rows[goods_no] = (values, hashlib.sha1(json.dumps(values).encode("utf-8")).hexdigest()[:16])
+        latest = self._latest_hashes(rows)
+        added = 0
+        for goods_no, (values, digest) in rows.items():
+            if latest.get(goods_no) == digest:
+                continue
+            self._pending[goods_no] = (crawled_at, values, digest) # 같은 실행에서 다시 바뀌면 마지막 값만 기록
+            added += 1
+        if len(self._pending) >= self.rows_per_file:
+            self.flush()
+        return added, len(rows) - added
+
+    def _latest_hashes(self, goods_nos):
+        """상품 번호별 마지막 지표 해시 (파일로 기록하기 전의 값 포함)"""
+        result = {}
+        goods_nos = list(goods_nos)
+        for i in range(0, len(goods_nos), 500): # SQLite 매개변수 개수 제한을 넘지 않도록 나누어 조회
+            chunk = goods_nos[i:i + 500]
+            result.update(self.conn.execute(f"SELECT goods_no, value_hash FROM latest WHERE goods_no IN ({','.join('?' * len(chunk))})", chunk))
+        result.update((g, self._pending[g][2]) for g in goods_nos if g in self._pending)
+        return result
+
+    def flush(self):
+        """쌓인 스냅샷을 수집 날짜별 조각 파일로 기록하고 색인을 갱신하는 함수"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._pending:
+            return
+        by_date = {}
+        for goods_no, (crawled_at, values, digest) in sorted(self._pending.items()): # 상품 번호 순으로 정렬하여 row group 통계로 건너뛸 수 있게 함
+            date = datetime.datetime.fromtimestamp(crawled_at, datetime.timezone.utc).strftime("%Y-%m-%d")
+            by_date.setdefault(date, []).append((goods_no, crawled_at, values, digest))
+        entries = []
+        for date, rows in by_date.items():
+            file = os.path.join(f"crawl_date={date}", f"part-{int(time.time() * 1000)}-{os.getpid()}-{self._seq:05d}.parquet")
+            self._seq += 1
+            columns = {"Goods No": [r[0] for r in rows], "Crawled At": [datetime.datetime.fromtimestamp(r[1], datetime.timezone.utc).replace(tzinfo=None) for r in rows]}
+            columns.update({column: [r[2][i] for r in rows] for i, column in enumerate(TRACKED_COLUMNS)})
+            path = os.path.join(self.root, file)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            pq.write_table(pa.Table.from_pydict(columns, schema=snapshot_schema()), path + ".tmp", row_group_size=ROW_GROUP_SIZE)
+            os.replace(path + ".tmp", path)
+            entries += [(r[0], r[1], file, r[3]) for r in rows]
+        with self.conn: # 파일을 모두 기록한 뒤 한 트랜잭션으로 색인 갱신
+            self.conn.executemany("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)", [(g, t, f) for g, t, f, _ in entries])
+            self.conn.executemany(
+                "INSERT INTO latest VALUES (?, ?, ?) ON CONFLICT(goods_no) DO UPDATE SET value_hash = excluded.value_hash, crawled_at = excluded.crawled_at",
+                [(g, d, t) for g, t, _, d in entries],
+            )
+        self._pending = {}
+
+    def _read(self, files, filters, columns=None):
+        """색인이 가리키는 조각 파일만 읽어 조건에 맞는 행을 반환하는 함수"""
+        import pyarrow.parquet as pq
+
+        frames = [
+            pq.read_table(os.path.join(self.root, file), columns=columns, filters=filters).to_pandas()
+            for file in sorted(files)
+        ]
+        if not frames:
+            return pd.DataFrame({name: pd.Series(dtype=object) for name in columns or snapshot_schema().names})
+        return pd.concat(frames, ignore_index=True).sort_values(["Goods No", "Crawled At"], kind="stable", ignore_index=True)
+
+    def history(self, goods_no, columns=None):
+        """
+        도서 한 권의 지표 변경 이력을 반환하는 함수.
+
+        Args:
+            goods_no (int | str): 상품 번호.
+            columns (list): 반환할 열 (None이면 전체, 'Goods No'와 'Crawled At'은 항상 포함).
+
+        Returns:
+            pd.DataFrame: 수집 시각 순으로 정렬된 스냅샷 (값이 바뀐 시점만 포함).
+        """
+        goods_no = int(goods_no)
+        files = {file for (file,) in self.conn.execute("SELECT DISTINCT file FROM snapshots WHERE goods_no = ?", (goods_no,))}
+        return self._read(files, [("Goods No", "=", goods_no)], _with_keys(columns))
+
+    def changes_since(self, since, columns=None):
+        """
+        지정한 시각 이후에 기록된 모든 지표 변경을 반환하는 함수.
+
+        Args:
+            since (datetime | str | float): 기준 시각 (시간대가 없으면 UTC, 숫자는 epoch 초).
+            columns (list): 반환할 열 (None이면 전체).
+
+        Returns:
+            pd.DataFrame: 상품 번호, 수집 시각 순으로 정렬된 스냅샷.
+        """
+        since = _to_epoch(since)
+        files = {file for (file,) in self.conn.execute("SELECT DISTINCT file FROM snapshots WHERE crawled_at >= ?", (since,))}
+        cutoff = datetime.datetime.fromtimestamp(since, datetime.timezone.utc).replace(tzinfo=None)
+        return self._read(files, [("Crawled At", ">=", cutoff)], _with_keys(columns))
+
+    def read(self, columns=None):
+        """색인에 기록된 전체 스냅샷을 반환하는 함수 (EDA 추이 분석용)"""
+        files = {file for (file,) in self.conn.execute("SELECT DISTINCT file FROM snapshots")}
+        return self._read(files, None, _with_keys(columns))
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+def _with_keys(columns):
+    """조회 열 목록에 키 열(상품 번호, 수집 시각)을 포함시키는 함수"""
+    return None if columns is None else ["Goods No", "Crawled At", *(c for c in columns if c not in ("Goods No", "Crawled At"))]
+
+
+def snapshot_changes(snapshots):
+    """
+    스냅샷을 도서별 직전 값과 비교하여 지표별 변화량 열을 추가하는 함수 (EDA 추이 분석용).
+
+    Args:
+        snapshots (pd.DataFrame): SnapshotStore.read() 등으로 읽은 스냅샷 (상품 번호, 수집 시각 순 정렬).
+
+    Returns:
+        pd.DataFrame: 'First Seen'(첫 스냅샷 여부)과 지표별 '<열> Change'(직전 스냅샷 대비 변화량, 첫 스냅샷은 NaN) 열이 추가된 새 DataFrame.
+    """
+    df = snapshots.copy()
+    previous = df.groupby("Goods No", sort=False).shift(1)
+    df["First Seen"] = previous["Crawled At"].isna()
+    for column in TRACKED_COLUMNS:
+        if column in df.columns:
+            df[f"{column} Change"] = df[column].astype("float64") - previous[column].astype("float64")
+    return df
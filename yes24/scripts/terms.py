@@ -0,0 +1,152 @@
+import glob # 이전 단어 빈도표 정리를 위한 glob 라이브러리 임포트
+import hashlib # 원본 경로별 빈도표 구분을 위한 hashlib 라이브러리 임포트
+import json # 단어 빈도표 저장을 위한 json 라이브러리 임포트
+import os # 파일 경로 조작을 위한 os 라이브러리 임포트
+import re # 제목 토큰화를 위한 re 라이브러리 임포트
+from collections import Counter # 단어 빈도 집계를 위한 Counter 임포트
+from loguru import logger # 로그 기록을 위한 loguru 라이브러리 임포트
+from dataset import iter_books # 조각 파일을 나누어 읽는 함수 임포트
+from preprocess import CACHE_DIR, file_digests # 원본 파일별 내용 해시 계산 함수 임포트
+
+# 설정
+TOKENIZER_VERSION = 1 # 토큰화 방식이 바뀌면 올려서 저장된 단어 빈도표를 무효화
+TERMS_DIR = os.path.join(CACHE_DIR, "terms") # 원본 파일별 단어 빈도표 저장 폴더
+TOKEN_RE = re.compile(r"\w[\w']+") # WordCloud 기본 규칙과 같은 토큰 (두 글자 이상)
+MAX_TERMS = 50_000 # 빈도표에 유지할 최대 단어 수 (초과 시 빈도가 낮은 단어부터 정리)
+CHUNK_ROWS = 100_000 # 한 번에 읽을 행 수
+
+_kiwi = None # 형태소 분석기 (처음 사용할 때 생성)
+
+
+def tokenize(text, morphemes=False):
+    """
+    제목 문자열을 단어 목록으로 나누는 함수.
+
+    Args:
+        text (str): 도서 제목.
+        morphemes (bool): True면 kiwipiepy 형태소 분석기로 명사와 외국어만 추출 (설치되지 않았으면 공백/기호 기준 분리).
+
+    Returns:
+        list: 단어 문자열 리스트.
+    """
+    global _kiwi
+    if morphemes:
+        if _kiwi is None:
+            try:
+                from kiwipiepy import Kiwi # 형태소 분석은 kiwipiepy가 설치된 경우에만 사용
+                _kiwi = Kiwi()
+            except ImportError:
+                logger.warning("kiwipiepy가 설치되지 않아 공백/기호 기준으로 토큰화합니다.")
+                _kiwi = False
+        if _kiwi:
+            return [token.form for token in _kiwi.tokenize(text) if token.tag.startswith("NN") or token.tag == "SL"]
+    return TOKEN_RE.findall(text)
+
+
+class TermCounts:
+    """
+    단어 빈도표. 여러 빈도표를 더해 합칠 수 있고(merge) JSON 파일로 저장/복원할 수 있다.
+
+    단어 수가 max_terms의 두 배를 넘으면 빈도가 높은 max_terms개만 남기므로,
+    제목이 수백만 건이어도 메모리 사용량은 일정하게 유지된다 (낮은 빈도 단어의 개수는 근사값이 될 수 있음).
+
+    Args:
+        counts (dict): 초기 단어별 빈도.
+        max_terms (int): 유지할 최대 단어 수.
+    """
+
+    def __init__(self, counts=None, max_terms=MAX_TERMS):
+        self.counts = Counter(counts or {})
+        self.max_terms = max_terms
+
+    def add(self, texts, morphemes=False):
+        """텍스트 목록을 토큰화하여 빈도에 더하는 함수"""
+        for text in texts:
+            if isinstance(text, str):
+                self.counts.update(tokenize(text, morphemes))
+        self._prune()
+        return self
+
+    def merge(self, other):
+        """다른 빈도표를 더하는 함수"""
+        self.counts.update(other.counts)
+        self._prune()
+        return self
+
+    def _prune(self):
+        if len(self.counts) > 2 * self.max_terms:
+            self.counts = Counter(dict(self.counts.most_common(self.max_terms)))
+
+    def most_common(self, n=None, stopwords=()):
+        """불용어를 제외한 상위 n개 단어와 빈도를 반환하는 함수"""
+        stopwords = set(stopwords)
+        terms = ((term, count) for term, count in self.counts.most_common() if term not in stopwords)
+        return [item for _, item in zip(range(n), terms)] if n is not None else list(terms)
+
+    def save(self, path):
+        """빈도표를 JSON 파일로 교체 저장하는 함수"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(dict(self.counts), f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path, max_terms=MAX_TERMS):
+        """JSON 파일에서 빈도표를 읽는 함수"""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), max_terms)
+
+
+def iter_titles(path, chunk_rows=CHUNK_ROWS):
+    """
+    원본 파일에서 제목 열만 chunk_rows행씩 나누어 읽는 제너레이터.
+
+    Args:
+        path (str): CSV, JSONL, Parquet 파일 경로.
+        chunk_rows (int): 한 번에 읽을 행 수.
+
+    Yields:
+        list: 제목 문자열 리스트.
+    """
+    for chunk in iter_books(path, columns=["Title"], chunk_rows=chunk_rows):
+        yield chunk["Title"].tolist()
+
+
+def title_term_counts(path, morphemes=False, terms_dir=TERMS_DIR):
+    """
+    원본 데이터의 도서 제목 단어 빈도표를 계산하는 함수 (원본 파일별로 저장하여 증분 갱신).
+
+    원본 파일(파티션 데이터셋의 조각 파일)마다 내용 해시를 키로 빈도표를 저장해 두고,
+    새로 추가되거나 바뀐 파일만 나누어 읽어 토큰화한 뒤 모든 파일의 빈도표를 합친다.
+    따라서 수집 후에는 새로 기록된 조각 파일의 제목만 다시 토큰화한다.
+
+    Args:
+        path (str): CSV 파일 또는 데이터셋 폴더 경로.
+        morphemes (bool): 형태소 분석 사용 여부 (tokenize() 참고).
+        terms_dir (str): 파일별 빈도표 저장 폴더 경로.
+
+    Returns:
+        TermCounts: 전체 제목의 단어 빈도표.
+    """
+    source = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:8] # 원본 경로별로 빈도표 파일을 구분
+    mode = f"v{TOKENIZER_VERSION}{'-m' if morphemes else ''}"
+    total = TermCounts()
+    used = set()
+    counted = 0
+    for file, digest in file_digests(path).items():
+        table_path = os.path.join(terms_dir, f"{source}-{digest[:16]}-{mode}.json")
+        used.add(table_path)
+        if os.path.exists(table_path):
+            total.merge(TermCounts.load(table_path))
+            continue
+        counts = TermCounts()
+        for titles in iter_titles(file):
+            counts.add(titles, morphemes)
+        counts.save(table_path)
+        total.merge(counts)
+        counted += 1
+    for stale in glob.glob(os.path.join(terms_dir, f"{source}-*-{mode}.json")): # 원본에서 사라지거나 바뀐 파일의 빈도표 정리
+        if stale not in used:
+            os.remove(stale)
+    logger.info(f"제목 단어 빈도표: 파일 {len(used)}개 중 {counted}개 새로 집계, 단어 {len(total.counts)}개")
+    return total